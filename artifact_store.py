@@ -0,0 +1,157 @@
+"""
+Content-Hashed Artifact Store
+Persists fitted vectorizers and models keyed by a hash of their input data and
+hyperparameters, so reruns over unchanged inputs load them instead of refitting.
+Numpy arrays inside artifacts are stored uncompressed and loaded memory-mapped.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def _digest(obj, h):
+    """Feed a stable byte representation of obj into hash h"""
+    if isinstance(obj, pd.DataFrame):
+        h.update(repr(list(obj.columns)).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(f'{obj.dtype}{obj.shape}'.encode('utf-8'))
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif sparse.issparse(obj):
+        obj = obj.tocsr()
+        h.update(f'{obj.dtype}{obj.shape}'.encode('utf-8'))
+        for part in (obj.data, obj.indices, obj.indptr):
+            h.update(np.ascontiguousarray(part).tobytes())
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=str):
+            h.update(str(key).encode('utf-8'))
+            _digest(obj[key], h)
+    elif isinstance(obj, (list, tuple)):
+        h.update(f'{type(obj).__name__}{len(obj)}'.encode('utf-8'))
+        for item in obj:
+            _digest(item, h)
+            h.update(b'\x1f')
+    elif isinstance(obj, str):
+        h.update(obj.encode('utf-8'))
+    else:
+        h.update(repr(obj).encode('utf-8'))
+
+
+class ArtifactStore:
+    """
+    Directory of joblib artifacts with a JSON manifest.
+    Eviction is least-recently-used: after every save the oldest artifacts are
+    removed until the store fits in max_bytes.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, root='.artifacts', max_bytes=512 * 1024 ** 2):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self._manifest_path = os.path.join(root, self.MANIFEST)
+        self.manifest = self._read_manifest()
+
+    @staticmethod
+    def key(name, *inputs):
+        """Content hash of an artifact's name, input data and hyperparameters"""
+        h = hashlib.sha256(name.encode('utf-8'))
+        for item in inputs:
+            _digest(item, h)
+        return f'{name}-{h.hexdigest()[:32]}'
+
+    def _path(self, key):
+        return os.path.join(self.root, f'{key}.joblib')
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_manifest(self):
+        tmp_path = self._manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self._manifest_path)
+
+    def load(self, key, mmap_mode='r'):
+        """Load an artifact (arrays memory-mapped), or None if it is not stored"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.manifest.pop(key, None)
+            return None
+        try:
+            obj = joblib.load(path, mmap_mode=mmap_mode)
+        except Exception:
+            # Corrupt or written by an incompatible library version: treat as a miss
+            self.remove(key)
+            return None
+        entry = self.manifest.setdefault(key, {'bytes': os.path.getsize(path), 'created': time.time()})
+        entry['last_used'] = time.time()
+        self._write_manifest()
+        return obj
+
+    def save(self, key, obj):
+        """Persist an artifact, then evict least-recently-used ones beyond the byte budget"""
+        path = self._path(key)
+        tmp_path = path + '.tmp'
+        joblib.dump(obj, tmp_path)
+        os.replace(tmp_path, path)
+        now = time.time()
+        self.manifest[key] = {'bytes': os.path.getsize(path), 'created': now, 'last_used': now}
+        self.evict(keep=key)
+        self._write_manifest()
+        return path
+
+    def get_or_fit(self, key, fit):
+        """Return (artifact, loaded_from_store), fitting and saving it on a miss"""
+        obj = self.load(key)
+        if obj is not None:
+            return obj, True
+        obj = fit()
+        self.save(key, obj)
+        return obj, False
+
+    def remove(self, key):
+        """Delete one artifact"""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        self.manifest.pop(key, None)
+
+    def total_bytes(self):
+        """Disk space used by stored artifacts"""
+        return sum(entry['bytes'] for entry in self.manifest.values())
+
+    def evict(self, keep=None):
+        """Remove least-recently-used artifacts until the store fits in max_bytes"""
+        evicted = []
+        by_age = sorted(self.manifest, key=lambda k: self.manifest[k].get('last_used', 0))
+        for key in by_age:
+            if self.total_bytes() <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self.remove(key)
+            evicted.append(key)
+        self._write_manifest()
+        return evicted
+
+    def clear(self):
+        """Delete every artifact"""
+        for key in list(self.manifest):
+            self.remove(key)
+        self._write_manifest()
@@ -0,0 +1,175 @@
+"""
+Cross-Question Association Engine
+Every demographic, Likert, single-choice and multi-select question is one-hot encoded
+into one sparse indicator matrix, so a single product X'X holds the contingency table
+of every pair of questions. Chi-square / Cramér's V for all pairs and Spearman rank
+correlations between Likert items are computed from it in batch, with Benjamini-Hochberg
+correction for the number of tests.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from survey_schema import (
+    DEMOGRAPHIC_COLUMNS, LIKERT_COLUMNS, CATEGORICAL_COLUMNS, MULTI_SELECT_COLUMNS, split_multi_select
+)
+
+
+def benjamini_hochberg(p_values):
+    """Benjamini-Hochberg adjusted p-values (q-values); NaN entries stay NaN"""
+    p = np.asarray(p_values, dtype=float)
+    q = np.full(p.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(p))
+    if valid.size == 0:
+        return q
+    order = valid[np.argsort(p[valid], kind='stable')]
+    scaled = p[order] * valid.size / np.arange(1, valid.size + 1)
+    q[order] = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+    return q
+
+
+def _label(value):
+    return f'{value:g}' if isinstance(value, (int, float, np.number)) else str(value)
+
+
+class IndicatorMatrix:
+    """
+    Sparse (respondents x answer levels) 0/1 matrix of every closed question.
+    Each variable owns a contiguous block of columns; respondents who skipped a
+    question have an all-zero row in its block. Every multi-select option chosen at
+    least min_option_count times is its own selected / not selected variable.
+    """
+
+    def __init__(self, df, min_option_count=5):
+        self.variables = []     # (name, source question label) per variable
+        self.level_var = []     # variable index of every column
+        self.level_labels = []  # answer label of every column
+        rows, cols = [], []
+
+        def add(name, source, codes, labels):
+            answered = np.flatnonzero(codes >= 0)
+            rows.append(answered)
+            cols.append(len(self.level_var) + codes[answered])
+            self.level_var.extend([len(self.variables)] * len(labels))
+            self.level_labels.extend(labels)
+            self.variables.append((name, source))
+
+        single_choice = {**DEMOGRAPHIC_COLUMNS, **LIKERT_COLUMNS, **CATEGORICAL_COLUMNS}
+        for col, name in single_choice.items():
+            if col in df.columns:
+                codes, uniques = pd.factorize(df[col], sort=True)
+                if len(uniques) > 1:
+                    add(name, name, codes, [_label(u) for u in uniques])
+
+        for col, name in MULTI_SELECT_COLUMNS.items():
+            if col not in df.columns:
+                continue
+            answered = np.where(df[col].notna().to_numpy(), 0, -1)
+            exploded = pd.Series(df[col].map(split_multi_select).to_numpy()).explode().dropna()
+            positions = exploded.index.to_numpy()
+            option_codes, options = pd.factorize(exploded)
+            counts = np.bincount(option_codes, minlength=len(options))
+            for k in np.argsort(-counts, kind='stable'):
+                if counts[k] < min_option_count:
+                    break
+                codes = answered.copy()
+                codes[positions[option_codes == k]] = 1
+                add(f'{name}: {options[k]}', name, codes, ['not selected', 'selected'])
+
+        self.level_var = np.asarray(self.level_var, dtype=np.intp)
+        rows = np.concatenate(rows) if rows else np.array([], dtype=np.intp)
+        cols = np.concatenate(cols) if cols else np.array([], dtype=np.intp)
+        self.X = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(df), len(self.level_var)))
+
+    def membership(self):
+        """(levels x variables) 0/1 matrix mapping every column to its variable"""
+        n_levels = len(self.level_var)
+        return sparse.csr_matrix((np.ones(n_levels), (np.arange(n_levels), self.level_var)),
+                                 shape=(n_levels, len(self.variables)))
+
+
+def chi_square_all_pairs(indicators):
+    """
+    Chi-square test of independence and Cramér's V for every pair of variables, from
+    the co-occurrence matrix X'X. Each pair uses the respondents who answered both
+    questions. Returns one dict per pair of variables from different questions,
+    with BH q-values, strongest association first.
+    """
+    from scipy import stats
+
+    if not indicators.variables:
+        return []
+    M = indicators.membership()
+    lv = indicators.level_var
+    observed = (indicators.X.T @ indicators.X).toarray()     # all contingency tables at once
+    margins = np.asarray(observed @ M)                        # [level, var]: answered level and var
+    both = np.asarray(M.T @ margins)                          # [var, var]: answered both
+
+    row_totals = margins[:, lv]                               # [i, j] -> level i among answerers of var(j)
+    totals = both[np.ix_(lv, lv)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = np.where(totals > 0, row_totals * row_totals.T / totals, 0.0)
+        contributions = np.where(expected > 0, (observed - expected) ** 2 / expected, 0.0)
+    chi2 = np.asarray((M.T @ contributions) @ M)              # summed over each pair's block
+    levels_seen = np.asarray(M.T @ (margins > 0))             # [p, q]: levels of p seen among answerers of q
+    dof = (levels_seen - 1) * (levels_seen.T - 1)
+    smaller = np.minimum(levels_seen, levels_seen.T) - 1
+
+    upper_p, upper_q = np.triu_indices(len(indicators.variables), k=1)
+    sources = [source for _, source in indicators.variables]
+    keep = [(p, q) for p, q in zip(upper_p, upper_q)
+            if sources[p] != sources[q] and dof[p, q] > 0 and both[p, q] > 0]
+    if not keep:
+        return []
+    p_idx, q_idx = np.array(keep).T
+    statistic = chi2[p_idx, q_idx]
+    n = both[p_idx, q_idx]
+    df = dof[p_idx, q_idx]
+    p_values = stats.chi2.sf(statistic, df)
+    cramers_v = np.sqrt(statistic / (n * smaller[p_idx, q_idx]))
+    q_values = benjamini_hochberg(p_values)
+
+    results = [{
+        'a': indicators.variables[p][0],
+        'b': indicators.variables[q][0],
+        'n': int(n[k]),
+        'chi2': float(statistic[k]),
+        'dof': int(df[k]),
+        'p_value': float(p_values[k]),
+        'q_value': float(q_values[k]),
+        'cramers_v': float(cramers_v[k])
+    } for k, (p, q) in enumerate(keep)]
+    return sorted(results, key=lambda r: (-r['cramers_v'], r['p_value']))
+
+
+def spearman_all_pairs(df, columns=LIKERT_COLUMNS):
+    """
+    Spearman rank correlation between every pair of the given ordinal columns (pairwise
+    complete responses), with t-approximation p-values and BH q-values, strongest first.
+    """
+    from scipy import stats
+
+    present = {col: name for col, name in columns.items() if col in df.columns}
+    if len(present) < 2:
+        return []
+    values = df[list(present)].apply(pd.to_numeric, errors='coerce')
+    rho = values.corr(method='spearman').to_numpy()
+    answered = values.notna().to_numpy(dtype=float)
+    n = answered.T @ answered
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = rho * np.sqrt((n - 2) / (1 - rho ** 2))
+        p_values = np.where(n > 2, 2 * stats.t.sf(np.abs(t), n - 2), np.nan)
+
+    names = list(present.values())
+    upper_p, upper_q = np.triu_indices(len(names), k=1)
+    q_values = benjamini_hochberg(p_values[upper_p, upper_q])
+    results = [{
+        'a': names[p],
+        'b': names[q],
+        'n': int(n[p, q]),
+        'rho': float(rho[p, q]),
+        'p_value': float(p_values[p, q]),
+        'q_value': float(q_values[k])
+    } for k, (p, q) in enumerate(zip(upper_p, upper_q)) if not np.isnan(rho[p, q])]
+    return sorted(results, key=lambda r: -abs(r['rho']))
@@ -0,0 +1,154 @@
+"""
+Memory-Bounded Fitting for the Text and Segmentation Stages
+Estimates the footprint of the document-term / feature matrices and, when a
+stage would exceed its memory budget, fits the same models chunk by chunk so
+only one block of rows is materialized at a time.
+"""
+
+import numpy as np
+
+
+def estimate_sparse_bytes(texts, itemsize=8):
+    """Approximate CSR size of a document-term matrix: one value + one index per token"""
+    n_tokens = sum(len(text.split()) for text in texts)
+    return n_tokens * (itemsize + 4) + (len(texts) + 1) * 8
+
+
+def chunk_rows_for_budget(total_bytes, n_rows, budget_bytes, fraction=0.25):
+    """Rows per chunk so that one chunk uses about `fraction` of the budget"""
+    bytes_per_row = max(total_bytes / max(n_rows, 1), 1.0)
+    return max(1, int(budget_bytes * fraction / bytes_per_row))
+
+
+def iter_chunks(n_rows, chunk_rows):
+    """(start, stop) row ranges covering n_rows"""
+    for start in range(0, n_rows, chunk_rows):
+        yield start, min(start + chunk_rows, n_rows)
+
+
+def fit_vocabulary(vectorizer, texts, chunk_rows):
+    """Fit a vectorizer's vocabulary (and idf) on an evenly spaced sample of at most chunk_rows documents"""
+    if len(texts) <= chunk_rows:
+        return vectorizer.fit(texts)
+    positions = np.linspace(0, len(texts) - 1, chunk_rows).astype(int)
+    return vectorizer.fit([texts[i] for i in positions])
+
+
+def chunked_lda(vectorizer, texts, lda_params, chunk_rows, passes=3):
+    """Online LDA over streamed chunks of the document-term matrix"""
+    from sklearn.decomposition import LatentDirichletAllocation
+
+    params = {key: value for key, value in lda_params.items() if key != 'max_iter'}
+    lda_model = LatentDirichletAllocation(
+        learning_method='online', batch_size=min(chunk_rows, 4096), total_samples=len(texts), **params
+    )
+    # Hashing vectorizers need no vocabulary; they only collect readable term names per chunk
+    stateless = hasattr(vectorizer, 'partial_fit')
+    if not stateless:
+        fit_vocabulary(vectorizer, texts, chunk_rows)
+    for pass_idx in range(passes):
+        for start, stop in iter_chunks(len(texts), chunk_rows):
+            if stateless and pass_idx == 0:
+                vectorizer.partial_fit(texts[start:stop])
+            lda_model.partial_fit(vectorizer.transform(texts[start:stop]))
+    return lda_model
+
+
+def _svd_model(components, singular_values, n_features, dtype, random_state):
+    """TruncatedSVD carrying precomputed components, signs fixed like scikit-learn's svd_flip"""
+    from sklearn.decomposition import TruncatedSVD
+
+    # Largest-magnitude loading of every component positive
+    signs = np.sign(components[np.arange(len(components)), np.abs(components).argmax(axis=1)])
+    components = components * signs[:, None]
+
+    svd = TruncatedSVD(n_components=len(components), random_state=random_state)
+    svd.components_ = components.astype(dtype)
+    svd.singular_values_ = singular_values
+    svd.n_features_in_ = n_features
+    return svd
+
+
+def chunked_svd(vectorizer, texts, n_components, chunk_rows, random_state=42):
+    """
+    Truncated SVD from the feature Gram matrix X^T X accumulated chunk by chunk.
+    The right singular vectors of X are the top eigenvectors of X^T X, so this is
+    exact for the (small, max_features-wide) vocabulary used by the LSA stage.
+    Hashing vectorizers (no vocabulary to fit) go through chunked_randomized_svd.
+    """
+    if hasattr(vectorizer, 'partial_fit'):
+        return chunked_randomized_svd(vectorizer, texts, n_components, chunk_rows, random_state)
+
+    fit_vocabulary(vectorizer, texts, chunk_rows)
+    n_features = len(vectorizer.vocabulary_)
+    gram = np.zeros((n_features, n_features), dtype=np.float64)
+    for start, stop in iter_chunks(len(texts), chunk_rows):
+        block = vectorizer.transform(texts[start:stop])
+        gram += (block.T @ block).toarray()
+
+    eigenvalues, eigenvectors = np.linalg.eigh(gram)
+    order = np.argsort(eigenvalues)[::-1][:n_components]
+    return _svd_model(eigenvectors[:, order].T, np.sqrt(np.clip(eigenvalues[order], 0, None)),
+                      n_features, vectorizer.dtype, random_state)
+
+
+def chunked_randomized_svd(vectorizer, texts, n_components, chunk_rows, random_state=42,
+                           n_oversamples=10, n_iter=4):
+    """
+    Truncated SVD of a hashed TF-IDF matrix streamed in row chunks. The hashed space is
+    too wide for a dense Gram matrix, so a randomized range finder (Halko et al.) with
+    n_iter power iterations approximates the top eigenvectors of X^T X over the columns
+    that occur, one pass over the chunks per product with X^T X. Memory is
+    O(occurring columns x (n_components + n_oversamples)) besides one chunk.
+    """
+    for start, stop in iter_chunks(len(texts), chunk_rows):
+        vectorizer.partial_fit(texts[start:stop])
+    columns = vectorizer.active_columns
+    width = min(n_components + n_oversamples, len(columns))
+
+    def gram_times(matrix):
+        product = np.zeros((len(columns), matrix.shape[1]))
+        for start, stop in iter_chunks(len(texts), chunk_rows):
+            block = vectorizer.transform(texts[start:stop])[:, columns]
+            product += block.T @ (block @ matrix)
+        return product
+
+    rng = np.random.default_rng(random_state)
+    basis = np.linalg.qr(gram_times(rng.standard_normal((len(columns), width))))[0]
+    for _ in range(n_iter):
+        basis = np.linalg.qr(gram_times(basis))[0]
+    # Rayleigh-Ritz: eigenpairs of X^T X restricted to the basis
+    eigenvalues, eigenvectors = np.linalg.eigh(basis.T @ gram_times(basis))
+    order = np.argsort(eigenvalues)[::-1][:n_components]
+
+    components = np.zeros((len(order), vectorizer.n_features))
+    components[:, columns] = (basis @ eigenvectors[:, order]).T
+    return _svd_model(components, np.sqrt(np.clip(eigenvalues[order], 0, None)),
+                      vectorizer.n_features, vectorizer.dtype, random_state)
+
+
+def chunked_kmeans(features, n_clusters, chunk_rows, random_state=42, passes=3):
+    """Scaler and MiniBatchKMeans fitted with partial_fit over row chunks of a feature matrix"""
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.cluster import MiniBatchKMeans
+
+    scaler = StandardScaler()
+    for start, stop in iter_chunks(len(features), chunk_rows):
+        scaler.partial_fit(features[start:stop])
+
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3,
+                             batch_size=min(chunk_rows, 4096))
+    for _ in range(passes):
+        for start, stop in iter_chunks(len(features), chunk_rows):
+            block = scaler.transform(features[start:stop])
+            if len(block) >= n_clusters:
+                kmeans.partial_fit(block)
+    return scaler, kmeans
+
+
+def chunked_predict(scaler, kmeans, features, chunk_rows):
+    """Cluster labels computed chunk by chunk"""
+    labels = np.empty(len(features), dtype=np.int32)
+    for start, stop in iter_chunks(len(features), chunk_rows):
+        labels[start:stop] = kmeans.predict(scaler.transform(features[start:stop]))
+    return labels
@@ -0,0 +1,180 @@
+"""
+Stateless Hashed Text Vectorization
+Document-term matrices built with the hashing trick, so there is no global vocabulary
+to fit: shards of the corpus are vectorized independently on worker processes and
+stacked, n-gram phrases such as "case law" are kept, and a small reverse map (the most
+frequent term seen in each hashed column, at most one entry per column) keeps topic
+keywords readable.
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+
+def _hasher(n_features, ngram_range, stop_words, dtype):
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(n_features=n_features, ngram_range=ngram_range, stop_words=stop_words,
+                             alternate_sign=False, norm=None, dtype=dtype)
+
+
+def hashed_column(term, n_features):
+    """Column a term is hashed to (the same murmurhash3 bucket HashingVectorizer uses)"""
+    from sklearn.utils import murmurhash3_32
+    return abs(murmurhash3_32(term, seed=0)) % n_features
+
+
+def _vectorize_shard(texts, n_features, ngram_range, stop_words, dtype, with_terms=True):
+    """
+    Count matrix of one shard and, with_terms, its most frequent term per hashed column
+    as {column: (term, count)} (runs on a worker process)
+    """
+    hasher = _hasher(n_features, ngram_range, stop_words, dtype)
+    if not with_terms:
+        return hasher.transform(texts), {}
+    analyzer = hasher.build_analyzer()
+    term_counts = Counter()
+    for text in texts:
+        term_counts.update(analyzer(text))
+    best = {}
+    for term, count in term_counts.items():
+        column = hashed_column(term, n_features)
+        if column not in best or count > best[column][1]:
+            best[column] = (term, count)
+    return hasher.transform(texts), best
+
+
+class HashedTextVectorizer:
+    """
+    Drop-in replacement for CountVectorizer / TfidfVectorizer in the topic stages.
+    With n_jobs > 1, corpora larger than shard_size are split into shards that are
+    vectorized in parallel on one process pool kept for the vectorizer's lifetime; the
+    shard matrices are stacked and each shard's top term per column is merged into the
+    reverse map. Terms are counted within a shard only, so across shards the map keeps a
+    column's leading term by its running count rather than an exact corpus-wide count.
+    """
+
+    def __init__(self, n_features=2 ** 18, ngram_range=(1, 2), stop_words='english', tfidf=False,
+                 n_jobs=1, shard_size=5000, dtype=np.float64):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = stop_words
+        self.tfidf = tfidf
+        self.n_jobs = n_jobs
+        self.shard_size = shard_size
+        self.dtype = dtype
+        self.term_map_ = {}          # hashed column -> most frequent term in it
+        self._term_scores = {}       # hashed column -> (term, count) backing term_map_
+        self._idf = None
+        self._doc_freq = None        # documents containing each column, and their number (TF-IDF mode)
+        self._n_docs = 0
+        self._pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_pool'] = None        # worker processes do not travel with a pickled model
+        return state
+
+    def close(self):
+        """Shut down the worker processes (a later call starts a new pool)"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _vectorize(self, texts, with_terms=True):
+        args = (self.n_features, self.ngram_range, self.stop_words, self.dtype, with_terms)
+        shards = [texts[start:start + self.shard_size] for start in range(0, len(texts), self.shard_size)]
+        if self.n_jobs == 1 or len(shards) <= 1:
+            results = [_vectorize_shard(shard, *args) for shard in shards]
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.n_jobs)
+            results = list(self._pool.map(_vectorize_shard, shards, *([arg] * len(shards) for arg in args)))
+        if not results:
+            return sparse.csr_matrix((0, self.n_features), dtype=self.dtype), []
+        return sparse.vstack([matrix for matrix, _ in results], format='csr'), [best for _, best in results]
+
+    def _update_term_map(self, shard_terms):
+        """Merge each shard's {column: (term, count)} into the per-column leading terms"""
+        for best in shard_terms:
+            for column, (term, count) in best.items():
+                current = self._term_scores.get(column)
+                if current is not None and current[0] == term:
+                    count += current[1]
+                elif current is not None and current[1] >= count:
+                    continue
+                self._term_scores[column] = (term, count)
+                self.term_map_[column] = term
+
+    def fit_transform(self, texts):
+        """Vectorize texts, record their terms and (in TF-IDF mode) fit the idf weights"""
+        counts, shard_terms = self._vectorize(list(texts))
+        self._update_term_map(shard_terms)
+        if self.tfidf:
+            self._doc_freq, self._n_docs = None, 0
+            self._update_idf(counts)
+            return self._idf.transform(counts).astype(self.dtype)
+        return counts
+
+    def _update_idf(self, counts):
+        """Add a count matrix's document frequencies and refit the (smoothed) idf weights from them"""
+        from sklearn.feature_extraction.text import TfidfTransformer
+
+        if self._doc_freq is None:
+            self._doc_freq = np.zeros(self.n_features, dtype=np.int32)
+        self._doc_freq += np.bincount(counts.indices, minlength=self.n_features).astype(np.int32)
+        self._n_docs += counts.shape[0]
+        # Same weights TfidfTransformer(smooth_idf=True).fit computes from all rows at once
+        self._idf = TfidfTransformer()
+        self._idf.idf_ = np.log((1 + self._n_docs) / (1 + self._doc_freq)) + 1
+        self._idf.n_features_in_ = self.n_features
+
+    def fit(self, texts):
+        self.fit_transform(texts)
+        return self
+
+    def partial_fit(self, texts):
+        """
+        Add texts' terms to the reverse map (hashing itself needs no fitting); in TF-IDF
+        mode also add their document frequencies to the idf weights
+        """
+        counts, shard_terms = self._vectorize(list(texts))
+        self._update_term_map(shard_terms)
+        if self.tfidf:
+            self._update_idf(counts)
+        return self
+
+    @property
+    def active_columns(self):
+        """Hashed columns that occurred in the fitted documents (TF-IDF mode), else None"""
+        return np.flatnonzero(self._doc_freq) if self._doc_freq is not None else None
+
+    def transform(self, texts):
+        counts, _ = self._vectorize(list(texts), with_terms=False)
+        if self.tfidf and self._idf is not None:
+            return self._idf.transform(counts).astype(self.dtype)
+        return counts
+
+    def build_analyzer(self):
+        """Callable that splits a text into the terms that are hashed"""
+        return _hasher(self.n_features, self.ngram_range, self.stop_words, self.dtype).build_analyzer()
+
+    @property
+    def idf_(self):
+        """Fitted idf weights per column (TF-IDF mode), else None"""
+        return self._idf.idf_ if self.tfidf and self._idf is not None else None
+
+    def get_feature_names_out(self):
+        """Readable name per column: its most frequent term, or hash_<column> if none was seen"""
+        names = np.array([f'hash_{i}' for i in range(self.n_features)], dtype=object)
+        for column, term in self.term_map_.items():
+            names[column] = term
+        return names
@@ -0,0 +1,124 @@
+"""
+Bounded-Memory Heavy-Hitter Counting
+Space-Saving top-k counter for multi-select and free-form "Other" tallies: memory is
+fixed at `capacity` tracked answers however many distinct strings arrive, every
+reported count carries a guaranteed error bound, and summaries from different
+shards can be merged.
+"""
+
+import heapq
+from collections.abc import Mapping
+
+
+class SpaceSaving(Mapping):
+    """
+    Space-Saving summary (Metwally et al.) of a stream of items.
+    For every tracked item: count - error <= true count <= count, and every item whose
+    true count exceeds total / capacity is guaranteed to be tracked. Reads like a
+    read-only dict of item -> (over-)estimated count, so it can stand in for a Counter.
+    """
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self._counts = {}     # item -> [count, error]
+        self._heap = []       # (count, item) entries, stale ones skipped lazily
+
+    # Mapping interface ------------------------------------------------
+
+    def __getitem__(self, item):
+        return self._counts[item][0]
+
+    def __iter__(self):
+        return iter(self._counts)
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __repr__(self):
+        return f"SpaceSaving(capacity={self.capacity}, total={self.total}, tracked={len(self)})"
+
+    # Updates ----------------------------------------------------------
+
+    def _push(self, item):
+        heapq.heappush(self._heap, (self._counts[item][0], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(entry[0], key) for key, entry in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        """Remove and return (item, count) of the smallest tracked counter"""
+        while True:
+            count, item = heapq.heappop(self._heap)
+            entry = self._counts.get(item)
+            if entry is not None and entry[0] == count:
+                del self._counts[item]
+                return item, count
+
+    def add(self, item, count=1):
+        """Count one occurrence (or `count` occurrences) of item"""
+        self.total += count
+        entry = self._counts.get(item)
+        if entry is not None:
+            entry[0] += count
+        elif len(self._counts) < self.capacity:
+            self._counts[item] = [count, 0]
+        else:
+            # Replace the minimum: the newcomer inherits its count as overestimation error
+            _, floor = self._pop_min()
+            self._counts[item] = [floor + count, floor]
+        self._push(item)
+
+    def update(self, items):
+        """Counter-style update from an iterable of items or a mapping of item -> count"""
+        pairs = items.items() if isinstance(items, Mapping) else ((item, 1) for item in items)
+        for item, count in pairs:
+            self.add(item, count)
+        return self
+
+    def merge(self, other):
+        """
+        Combine with another summary (e.g. from another shard) into a new one of this capacity.
+        Untracked items are assumed to have the other summary's minimum count, which keeps
+        the error guarantee of the merged summary (total / capacity over both streams).
+        """
+        floor_self = self.min_count() if len(self) >= self.capacity else 0
+        floor_other = other.min_count() if len(other) >= other.capacity else 0
+        combined = {}
+        for item in set(self._counts) | set(other._counts):
+            count_a, error_a = self._counts.get(item, (floor_self, floor_self))
+            count_b, error_b = other._counts.get(item, (floor_other, floor_other))
+            combined[item] = [count_a + count_b, error_a + error_b]
+
+        merged = SpaceSaving(self.capacity)
+        merged.total = self.total + other.total
+        kept = heapq.nlargest(self.capacity, combined.items(), key=lambda kv: kv[1][0])
+        merged._counts = {item: entry for item, entry in kept}
+        merged._heap = [(entry[0], item) for item, entry in merged._counts.items()]
+        heapq.heapify(merged._heap)
+        return merged
+
+    # Queries ----------------------------------------------------------
+
+    def min_count(self):
+        return min((entry[0] for entry in self._counts.values()), default=0)
+
+    def error(self, item):
+        """Maximum overestimation of item's count (0 means the count is exact)"""
+        return self._counts[item][1]
+
+    def error_bound(self):
+        """Worst-case overestimation of any reported count"""
+        return self.total // self.capacity if len(self) >= self.capacity else 0
+
+    def guaranteed(self, item):
+        """Lower bound on item's true count"""
+        entry = self._counts.get(item)
+        return 0 if entry is None else entry[0] - entry[1]
+
+    def most_common(self, n=None):
+        """(item, count) pairs, largest first, like Counter.most_common"""
+        ranked = sorted(self._counts.items(), key=lambda kv: kv[1][0], reverse=True)
+        return [(item, entry[0]) for item, entry in ranked[:n]]
@@ -0,0 +1,164 @@
+"""
+Insights History Store
+Every pipeline run's insights are appended to a local SQLite file: one row per run
+plus one indexed row per numeric metric (dotted insights path, demographic segment),
+so trend charts and regression checks query stored values instead of re-running
+the pipeline on old exports.
+"""
+
+import json
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from survey_waves import flatten_metrics
+
+ALL_RESPONDENTS = ''    # segment of metrics computed over every respondent
+
+
+def metric_rows(insights):
+    """
+    (path, segment, value) for every numeric leaf of an insights dict. Per-segment
+    breakdowns ('segments' -> dimension -> segment -> item) are stored under the path
+    'segments.<dimension>.<item>' with segment '<dimension>=<segment>'.
+    """
+    rows = [(path, ALL_RESPONDENTS, value)
+            for path, value in flatten_metrics({k: v for k, v in insights.items() if k != 'segments'}).items()]
+    for dimension, table in (insights.get('segments') or {}).items():
+        for segment, row in table.items():
+            for item, value in flatten_metrics(row).items():
+                rows.append((f'segments.{dimension}.{item}', f'{dimension}={segment}', value))
+    return [(path, segment, value) for path, segment, value in rows if not np.isnan(value)]
+
+
+class InsightsHistory:
+    """Runs and their metrics in a SQLite file, indexed for per-metric time series"""
+
+    def __init__(self, path='insights_history.sqlite'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recorded_at TEXT NOT NULL,
+                dataset TEXT,
+                n_responses INTEGER,
+                insights TEXT
+            );
+            CREATE TABLE IF NOT EXISTS metrics (
+                run_id INTEGER NOT NULL REFERENCES runs(run_id),
+                path TEXT NOT NULL,
+                segment TEXT NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (path, segment, run_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_metrics_run ON metrics (run_id);
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, insights, dataset=None, n_responses=None, recorded_at=None):
+        """Store one run's insights; returns its run id"""
+        recorded_at = recorded_at or pd.Timestamp.now().isoformat(timespec='seconds')
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (recorded_at, dataset, n_responses, insights) VALUES (?, ?, ?, ?)",
+                (str(recorded_at), dataset, n_responses, json.dumps(insights, default=str)))
+            run_id = cursor.lastrowid
+            self.conn.executemany("INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?)",
+                                  [(run_id, path, segment, value) for path, segment, value in metric_rows(insights)])
+        return run_id
+
+    def runs(self):
+        """One row per recorded run, oldest first"""
+        return pd.read_sql_query("SELECT run_id, recorded_at, dataset, n_responses FROM runs ORDER BY run_id",
+                                 self.conn, index_col='run_id')
+
+    def insights(self, run_id=None):
+        """Stored insights of a run (the latest if run_id is None), or None"""
+        if run_id is None:
+            row = self.conn.execute("SELECT insights FROM runs ORDER BY run_id DESC LIMIT 1").fetchone()
+        else:
+            row = self.conn.execute("SELECT insights FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def snapshot(self, run_id=None):
+        """Run metadata and insights of a run (the latest if run_id is None), or None"""
+        query = "SELECT run_id, recorded_at, dataset, n_responses, insights FROM runs"
+        if run_id is None:
+            row = self.conn.execute(query + " ORDER BY run_id DESC LIMIT 1").fetchone()
+        else:
+            row = self.conn.execute(query + " WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        return {'run_id': row[0], 'recorded_at': row[1], 'dataset': row[2], 'n_responses': row[3],
+                'insights': json.loads(row[4])}
+
+    def paths(self, prefix=''):
+        """Metric paths recorded so far, optionally only those under a prefix"""
+        rows = self.conn.execute("SELECT DISTINCT path FROM metrics WHERE path >= ? AND path < ? ORDER BY path",
+                                 (prefix, prefix + '\uffff')).fetchall()
+        return [row[0] for row in rows]
+
+    def segments(self, path):
+        """Segments a metric was recorded for"""
+        rows = self.conn.execute("SELECT DISTINCT segment FROM metrics WHERE path = ? ORDER BY segment",
+                                 (path,)).fetchall()
+        return [row[0] for row in rows]
+
+    def series(self, path, segment=ALL_RESPONDENTS, since=None):
+        """Time series of one metric (run_id, recorded_at, dataset, value), oldest first"""
+        query = ("SELECT m.run_id, r.recorded_at, r.dataset, m.value FROM metrics m JOIN runs r USING (run_id) "
+                 "WHERE m.path = ? AND m.segment = ?")
+        params = [path, segment]
+        if since is not None:
+            query += " AND r.recorded_at >= ?"
+            params.append(str(since))
+        return pd.read_sql_query(query + " ORDER BY m.run_id", self.conn, params=params, index_col='run_id')
+
+    def compare(self, run_id, baseline=None, tolerance=0.0):
+        """
+        Metrics of run_id next to a baseline run (default: the run before it), with the
+        change, keeping only those that moved by more than tolerance or appeared/disappeared.
+        """
+        if baseline is None:
+            row = self.conn.execute("SELECT MAX(run_id) FROM runs WHERE run_id < ?", (run_id,)).fetchone()
+            baseline = row[0]
+        frames = {}
+        for label, rid in (('baseline', baseline), ('current', run_id)):
+            frames[label] = pd.read_sql_query("SELECT path, segment, value FROM metrics WHERE run_id = ?",
+                                              self.conn, params=[rid], index_col=['path', 'segment'])['value']
+        table = pd.DataFrame(frames)
+        table['change'] = table['current'] - table['baseline']
+        moved = table['change'].abs() > tolerance
+        return table[moved | table['change'].isna()].sort_index()
+
+
+def main(argv=None):
+    """Print the recorded runs, the metric paths, or the time series of one metric"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the insights history store")
+    parser.add_argument('history_path', help="SQLite file written by the pipeline's --history option")
+    parser.add_argument('--metric', default=None,
+                        help="Dotted metric path, e.g. trust_concerns.blind_trust.mean_score")
+    parser.add_argument('--segment', default=ALL_RESPONDENTS, help="Segment such as role=Lawyer")
+    parser.add_argument('--paths', default=None, metavar='PREFIX', help="List the metric paths under a prefix")
+    args = parser.parse_args(argv)
+
+    history = InsightsHistory(args.history_path)
+    try:
+        if args.paths is not None:
+            print("\n".join(history.paths(args.paths)))
+        elif args.metric:
+            print(history.series(args.metric, args.segment).to_string())
+        else:
+            print(history.runs().to_string())
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Local Insights Service
+Optional asyncio HTTP service that keeps a LegalSurveyNLPPipeline warm in memory,
+serves its insights, segment and search queries from an in-memory cache, and
+re-runs only the affected stages in the background when the export changes.
+
+Usage:
+    python insights_service.py path/to/export.csv --port 8765
+
+Endpoints (GET, JSON):
+    /health                                 refresh status and timings
+    /insights                               all insights
+    /insights/<section>                     one insights section, e.g. /insights/payment
+    /segments?dimension=role                respondent counts and Likert means per segment
+    /segments/mean?item=blind_trust&role=Lawyer
+    /segments/share?question=willingness_to_pay&option=Yes&location=Nairobi
+    /search?q=citation+wrong&limit=20       respondents whose free-text answers contain every term
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+import pandas as pd
+
+from legal_survey_nlp_pipeline import LegalSurveyNLPPipeline
+from survey_schema import TEXT_RESPONSE_COLUMNS
+
+# Distinct GET responses kept between refreshes, least recently used dropped first
+MAX_CACHED_RESPONSES = 512
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 503: 'Service Unavailable'}
+
+
+def jsonable(obj):
+    """Convert insights (numpy scalars, non-string keys, NaN) into plain JSON types"""
+    if isinstance(obj, dict):
+        return {str(k): jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [jsonable(v) for v in obj]
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, (float, np.floating)):
+        return None if np.isnan(obj) else float(obj)
+    if isinstance(obj, (str, int, bool)) or obj is None:
+        return obj
+    return str(obj)
+
+
+def build_search_index(df):
+    """Inverted index: token -> set of row labels whose free-text answers contain it"""
+    index = {}
+    for col in TEXT_RESPONSE_COLUMNS:
+        if col not in df.columns:
+            continue
+        for row, text in df[col].dropna().items():
+            for token in set(re.findall(r'\w+', str(text).lower())):
+                index.setdefault(token, set()).add(row)
+    return index
+
+
+class InsightsService:
+    """In-memory cache of pipeline results behind a small asyncio HTTP server"""
+
+    def __init__(self, csv_path, host='127.0.0.1', port=8765, poll_interval=5.0, verbose=False, **pipeline_kwargs):
+        self.csv_path = csv_path
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        self.verbose = verbose
+        self.pipeline = LegalSurveyNLPPipeline(csv_path, **pipeline_kwargs)
+
+        self._responses = OrderedDict()   # (path, params) -> encoded JSON body, least recent first
+        self._insights = {}
+        self._search_index = {}
+        self._segment_cube = None
+        self._df = None
+        self._file_state = None
+        self._refresh_lock = asyncio.Lock()
+        self.status = {'state': 'starting', 'last_refresh': None, 'last_duration_s': None, 'last_stages': []}
+
+    def _quietly(self, func, *args):
+        """Run a pipeline call with its console report suppressed unless verbose"""
+        if self.verbose:
+            return func(*args)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args)
+
+    def _stat(self):
+        stat = os.stat(self.csv_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _publish(self, stages):
+        """Swap in a new snapshot of the pipeline results and drop cached responses"""
+        self._df = self.pipeline.df.copy()
+        self._insights = jsonable(self.pipeline.insights)
+        self._search_index = build_search_index(self._df)
+        # refresh() replaces the pipeline's cube; requests keep reading this one until the next publish
+        self._segment_cube = self.pipeline.segment_cube
+        self._responses.clear()
+        self.status.update({
+            'state': 'ready',
+            'last_refresh': pd.Timestamp.now().isoformat(timespec='seconds'),
+            'last_stages': stages,
+            'n_responses': len(self._df)
+        })
+
+    async def _run_in_background(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._quietly, func, *args)
+
+    async def warm_up(self):
+        """Load the data and fit every stage once"""
+        async with self._refresh_lock:
+            started = time.perf_counter()
+            self._file_state = self._stat()
+            await self._run_in_background(self.pipeline.run_full_pipeline)
+            self._publish(['all'])
+            self.status['last_duration_s'] = round(time.perf_counter() - started, 3)
+
+    async def refresh_if_changed(self):
+        """Re-run the affected stages if the export changed since the last refresh"""
+        try:
+            file_state = self._stat()
+        except FileNotFoundError:
+            return
+        if file_state == self._file_state or self._refresh_lock.locked():
+            return
+        async with self._refresh_lock:
+            self.status['state'] = 'refreshing'
+            started = time.perf_counter()
+            try:
+                stages = await self._run_in_background(self.pipeline.refresh)
+            except Exception as exc:
+                self.status.update({'state': 'ready', 'last_error': str(exc)})
+                return
+            self._file_state = file_state
+            self._publish(stages)
+            self.status['last_duration_s'] = round(time.perf_counter() - started, 3)
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self.refresh_if_changed()
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def _route(self, path, query):
+        """Return (status, payload) for one GET request"""
+        params = {key: values[-1] for key, values in query.items()}
+        parts = [p for p in path.split('/') if p]
+
+        if parts == ['health']:
+            return 200, self.status
+        if not parts or parts[0] == 'insights':
+            if len(parts) <= 1:
+                return 200, self._insights
+            section = parts[1]
+            if section not in self._insights:
+                return 404, {'error': f"Unknown insights section: {section}", 'sections': sorted(self._insights)}
+            return 200, self._insights[section]
+        if parts[0] == 'segments':
+            return self._segments(parts[1:], params)
+        if parts == ['search']:
+            return self._search(params)
+        return 404, {'error': f"Unknown endpoint: {path}"}
+
+    def _segments(self, parts, params):
+        cube = self._segment_cube
+        if cube is None:
+            return 503, {'error': 'Segment cube not built yet'}
+        try:
+            if not parts:
+                dimension = params.get('dimension')
+                if dimension is None:
+                    return 200, {dim: cube.breakdown(dim) for dim in cube.dimensions}
+                return 200, cube.breakdown(dimension)
+            filters = {k: v for k, v in params.items() if k in cube.dimensions}
+            if parts == ['mean']:
+                item = params['item']
+                return 200, {'item': item, 'segment': filters, 'n': cube.n(item, **filters),
+                             'mean': cube.mean(item, **filters), 'variance': cube.variance(item, **filters)}
+            if parts == ['share']:
+                question, option = params['question'], params['option']
+                return 200, {'question': question, 'option': option, 'segment': filters,
+                             'count': cube.option_count(question, option, **filters),
+                             'share': cube.share(question, option, **filters)}
+            if parts == ['options']:
+                question = params['question']
+                return 200, {'question': question, 'segment': filters,
+                             'counts': cube.option_counts(question, **filters)}
+        except KeyError as exc:
+            return 400, {'error': f"Missing or unknown parameter: {exc}"}
+        return 404, {'error': f"Unknown segment query: {'/'.join(parts)}"}
+
+    def _search(self, params):
+        terms = re.findall(r'\w+', params.get('q', '').lower())
+        if not terms:
+            return 400, {'error': "Query parameter 'q' is required"}
+        try:
+            limit = int(params.get('limit', 20))
+        except ValueError:
+            limit = -1
+        if limit < 0:
+            return 400, {'error': "Query parameter 'limit' must be a non-negative integer"}
+        matches = set.intersection(*(self._search_index.get(term, set()) for term in terms))
+        text_cols = [col for col in TEXT_RESPONSE_COLUMNS if col in self._df.columns]
+        results = [
+            {'respondent': row, **{TEXT_RESPONSE_COLUMNS[col]: self._df.at[row, col] for col in text_cols}}
+            for row in sorted(matches)[:limit]
+        ]
+        return 200, {'query': params['q'], 'total': len(matches), 'results': results}
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass  # headers are not needed
+            try:
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            except ValueError:
+                status, body = 400, json.dumps({'error': 'Malformed request'}).encode()
+            else:
+                if method != 'GET':
+                    status, body = 405, json.dumps({'error': 'Only GET is supported'}).encode()
+                else:
+                    url = urlsplit(target)
+                    query = parse_qs(url.query)
+                    # '/insights/?b=1&a=2' and '/insights?a=2&b=1' share one entry
+                    key = ('/'.join(p for p in url.path.split('/') if p),
+                           tuple(sorted((name, values[-1]) for name, values in query.items())))
+                    if key in self._responses:
+                        self._responses.move_to_end(key)
+                        status, body = 200, self._responses[key]
+                    else:
+                        status, payload = self._route(url.path, query)
+                        body = json.dumps(jsonable(payload), indent=2).encode('utf-8')
+                        # Health changes with every refresh; everything else is cached until the next one
+                        if status == 200 and key[0] != 'health':
+                            self._responses[key] = body
+                            if len(self._responses) > MAX_CACHED_RESPONSES:
+                                self._responses.popitem(last=False)
+
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode('latin-1') + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """Warm up, then serve requests and watch the export until cancelled"""
+        await self.warm_up()
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        watcher = asyncio.create_task(self._watch())
+        print(f"Insights service ready on http://{self.host}:{self.port} "
+              f"({self.status['n_responses']} responses, warm-up {self.status['last_duration_s']}s)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve legal AI survey insights over HTTP")
+    parser.add_argument('csv_path', help="Survey export to analyze and watch")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--poll-interval', type=float, default=5.0,
+                        help="Seconds between checks of the export for changes")
+    parser.add_argument('--verbose', action='store_true', help="Print the pipeline's console report")
+    args = parser.parse_args()
+
+    service = InsightsService(args.csv_path, host=args.host, port=args.port,
+                              poll_interval=args.poll_interval, verbose=args.verbose)
+    try:
+        asyncio.run(service.serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,104 @@
+"""
+Multi-Label Issue Classifier
+A sparse linear (one-vs-rest logistic regression) classifier over TF-IDF n-gram
+features for the issue categories. Training labels are bootstrapped from the keyword
+taxonomy and overridden by hand corrections; prediction for any number of responses
+is one sparse matrix product. The classifier fits its own TF-IDF vectorizer: the topic
+stages' vectorizer keeps only 100 unigrams across all free-text questions, too few to
+separate the issue categories of question 14.
+"""
+
+import json
+
+import numpy as np
+
+from survey_schema import ISSUE_CATEGORIES
+
+# Fewer non-empty responses than this fall back to the keyword rules
+MIN_TRAINING_RESPONSES = 10
+
+
+def keyword_categories(text, categories=ISSUE_CATEGORIES):
+    """Categories whose keyword stems occur in an already-cleaned response"""
+    return [category for category, keywords in categories.items() if any(keyword in text for keyword in keywords)]
+
+
+def load_corrections(path, categories=ISSUE_CATEGORIES):
+    """
+    Hand-labelled responses from a JSON file: a list of {"text": ..., "categories": [...]}
+    or a {text: [categories]} object. Returns {text: [categories]}; texts are cleaned by
+    the caller before matching.
+    """
+    with open(path, encoding='utf-8') as f:
+        raw = json.load(f)
+    if isinstance(raw, dict):
+        raw = [{'text': text, 'categories': labels} for text, labels in raw.items()]
+    corrections = {}
+    for entry in raw:
+        unknown = set(entry['categories']) - set(categories)
+        if unknown:
+            raise ValueError(f"Unknown issue categories in {path}: {', '.join(sorted(unknown))}")
+        corrections[entry['text']] = list(entry['categories'])
+    return corrections
+
+
+def bootstrap_labels(texts, corrections=None, categories=ISSUE_CATEGORIES):
+    """
+    Training set from cleaned responses: keyword-rule labels, replaced by the hand
+    correction where one exists; corrected texts not among the responses are added.
+    Returns (texts, labels) with labels an (n x n_categories) 0/1 matrix.
+    """
+    corrections = corrections or {}
+    names = list(categories)
+    seen = set(texts)
+    train_texts = list(texts) + [text for text in corrections if text not in seen]
+    labels = np.zeros((len(train_texts), len(names)), dtype=np.int8)
+    for row, text in enumerate(train_texts):
+        assigned = corrections[text] if text in corrections else keyword_categories(text, categories)
+        for category in assigned:
+            labels[row, names.index(category)] = 1
+    return train_texts, labels
+
+
+class IssueClassifier:
+    """One-vs-rest logistic regression per category, stored as one (features x categories) weight matrix"""
+
+    def __init__(self, categories, threshold=0.5, C=4.0, ngram_range=(1, 2), max_features=50000):
+        self.categories = list(categories)
+        self.threshold = threshold
+        self.C = C
+        self.ngram_range = ngram_range
+        self.max_features = max_features
+        self.vectorizer = None
+        self.coef_ = None
+        self.intercept_ = None
+
+    def fit(self, texts, labels):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        self.vectorizer = TfidfVectorizer(ngram_range=self.ngram_range, sublinear_tf=True,
+                                          max_features=self.max_features)
+        X = self.vectorizer.fit_transform(texts)
+        self.coef_ = np.zeros((X.shape[1], len(self.categories)))
+        self.intercept_ = np.zeros(len(self.categories))
+        for j in range(len(self.categories)):
+            y = labels[:, j]
+            if y.min() == y.max():
+                # Every training response agrees: predict that label for everything
+                self.intercept_[j] = 10.0 if y[0] else -10.0
+                continue
+            model = LogisticRegression(C=self.C, class_weight='balanced', max_iter=1000)
+            model.fit(X, y)
+            self.coef_[:, j] = model.coef_[0]
+            self.intercept_[j] = model.intercept_[0]
+        return self
+
+    def decision_function(self, texts):
+        """Log-odds of every category for every text, in one sparse matrix product"""
+        X = self.vectorizer.transform(texts)
+        return np.asarray(X @ self.coef_) + self.intercept_
+
+    def predict(self, texts):
+        """(n x n_categories) boolean matrix of predicted categories"""
+        return self.decision_function(texts) > np.log(self.threshold / (1 - self.threshold))
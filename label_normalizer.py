@@ -0,0 +1,176 @@
+"""
+Fuzzy Normalization of Multi-Select Options and Tool Names
+Maps raw answer tokens ("Chat GPT", "chatgpt ", "ChapGPT") to canonical labels. Candidates
+come from a character-trigram inverted index and are confirmed with a similarity ratio,
+every decision is memoized in an alias cache that can be persisted (and hand-edited) as
+JSON, and known labels that contain commas are kept whole when answers are split.
+"""
+
+import difflib
+import json
+import os
+import re
+from collections import Counter
+
+
+def normalize_key(label):
+    """Case-, space- and punctuation-insensitive lookup key of a label"""
+    return re.sub(r'[^0-9a-z]+', '', str(label).casefold())
+
+
+def trigrams(key):
+    """Character trigrams of a key, padded so short keys still have some"""
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AliasCache:
+    """JSON file of {question label: {alias key: canonical label}}"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.sections = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                raw = json.load(f)
+            # Hand-written entries may use raw spellings as keys
+            self.sections = {section: {normalize_key(alias): canonical for alias, canonical in aliases.items()}
+                             for section, aliases in raw.items()}
+
+    def section(self, name):
+        return self.sections.setdefault(name, {})
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.sections, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+class LabelNormalizer:
+    """
+    Canonical labels for the tokens of one question. Unknown tokens that match no
+    known label closely enough become new canonical labels themselves, so later
+    variants of them are merged too. Each distinct key is resolved only once.
+    """
+
+    def __init__(self, known_labels=(), aliases=None, threshold=0.8, candidates=5, max_words=4,
+                 on_new_alias=None):
+        self.threshold = threshold
+        self.candidates = candidates
+        self.max_words = max_words
+        self.aliases = {} if aliases is None else aliases
+        self.on_new_alias = on_new_alias
+        self.labels = []            # canonical labels, by id
+        self._keys = []             # their lookup keys
+        self._n_grams = []          # and trigram counts
+        self._by_key = {}           # key -> canonical id
+        self._index = {}            # trigram -> [canonical ids]
+        self._comma_labels = None
+        self._mentions = {}
+        for label in known_labels:
+            self._add_label(label)
+        for canonical in set(self.aliases.values()):
+            if normalize_key(canonical) not in self._by_key:
+                self._add_label(canonical)
+
+    def _add_label(self, label):
+        key = normalize_key(label)
+        if not key or key in self._by_key:
+            return
+        label_id = len(self.labels)
+        self.labels.append(label)
+        self._keys.append(key)
+        self._by_key[key] = label_id
+        grams = trigrams(key)
+        self._n_grams.append(len(grams))
+        for gram in grams:
+            self._index.setdefault(gram, []).append(label_id)
+        if ',' in label:
+            self._comma_labels = None
+
+    def _remember(self, key, canonical):
+        self.aliases[key] = canonical
+        if self.on_new_alias is not None:
+            self.on_new_alias()
+
+    def match(self, token):
+        """Closest known canonical label of a token, or None (nothing is learned)"""
+        key = normalize_key(token)
+        if not key:
+            return None
+        if key in self.aliases:
+            return self.aliases[key]
+        if key in self._by_key:
+            return self.labels[self._by_key[key]]
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._index.get(gram, ()))
+        best, best_ratio = None, self.threshold
+        # Confirm only the few labels sharing the most trigrams with the token
+        ranked = sorted(shared.items(), key=lambda kv: 2 * kv[1] / (len(grams) + self._n_grams[kv[0]]), reverse=True)
+        for label_id, _ in ranked[:self.candidates]:
+            ratio = difflib.SequenceMatcher(None, key, self._keys[label_id]).ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = self.labels[label_id], ratio
+        return best
+
+    def canonical(self, token):
+        """Canonical label of a token, learning it as a new label if nothing matches"""
+        key = normalize_key(token)
+        if not key:
+            return None
+        if key in self.aliases:
+            return self.aliases[key]
+        label = self.match(token)
+        if label is None:
+            label = ' '.join(str(token).split())
+            self._add_label(label)
+        self._remember(key, label)
+        return label
+
+    def mentions(self, text):
+        """Known labels mentioned anywhere in a free-text token (word n-grams up to max_words)"""
+        cached = self._mentions.get(text)
+        if cached is not None:
+            return cached
+        words = re.findall(r'\w+', str(text))
+        found = []
+        for size in range(min(self.max_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                label = self.match(' '.join(words[start:start + size]))
+                if label is not None and label not in found:
+                    found.append(label)
+        self._mentions[text] = found
+        return found
+
+    def split(self, answer):
+        """Split a comma-separated answer, keeping known labels that contain commas whole"""
+        if self._comma_labels is None:
+            comma_labels = sorted((label for label in self.labels if ',' in label), key=len, reverse=True)
+            alternatives = [r'\s*'.join(map(re.escape, label.split())) for label in comma_labels]
+            pattern = rf'\s*(?:{"|".join(alternatives)})\s*(?=,|$)|[^,]+' if alternatives else r'[^,]+'
+            self._comma_labels = re.compile(pattern, re.IGNORECASE)
+        return [token.strip() for token in self._comma_labels.findall(str(answer)) if token.strip()]
+
+    def normalize(self, answer):
+        """Distinct canonical labels of one multi-select answer"""
+        labels = []
+        for token in self.split(answer):
+            resolved = self._mentions.get(token)
+            if resolved is None:
+                if len(token.split()) > self.max_words and self.match(token) is None:
+                    # A sentence rather than an option: keep the known labels it mentions
+                    resolved = self.mentions(token) or [self.canonical(token)]
+                else:
+                    resolved = [self.canonical(token)]
+            labels.extend(label for label in resolved if label is not None and label not in labels)
+        return labels
@@ -6,46 +6,157 @@ Purpose: Automated analysis to support research on domain-adapted LLMs with RAG
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
+import hashlib
+import operator
+import re
 import warnings
 warnings.filterwarnings('ignore')
 
-# NLP Libraries
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.sentiment import SentimentIntensityAnalyzer
-import re
-
-# Topic Modeling
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
-from sklearn.decomposition import LatentDirichletAllocation, TruncatedSVD
-from sklearn.cluster import KMeans, DBSCAN
-from sklearn.preprocessing import StandardScaler
-from sklearn.manifold import TSNE
-
-# Visualization
-import plotly.express as px
-import plotly.graph_objects as go
-from wordcloud import WordCloud
-
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('sentiment/vader_lexicon.zip')
-except LookupError:
-    nltk.download('vader_lexicon')
+# Heavy libraries (NLTK, scikit-learn, SciPy) are imported inside the stages that
+# use them, so a narrow --stages run only pays for what it needs.
+
+from survey_io import read_survey_csv, export_stem
+from issue_classifier import keyword_categories
+from survey_schema import (
+    TEXT_RESPONSE_COLUMNS, LIKERT_COLUMNS, DEMOGRAPHIC_COLUMNS, CATEGORICAL_COLUMNS, MULTI_SELECT_COLUMNS,
+    ISSUE_CATEGORIES, KNOWN_OPTIONS, TIMESTAMP_COL, ROLE_COL, EXPERIENCE_COL, LOCATION_COL, FIRM_COL, ISSUES_COL,
+    Q5_TIME_COL, Q6_ACCESS_COL, Q7_ANALYTICS_COL, Q8_USES_AI_COL, Q9_TOOLS_COL, Q10_FREQUENCY_COL,
+    Q11_TASKS_COL, Q12_TIME_SAVED_COL, Q13_COUNSEL_AI_COL, Q15_TRUST_COL, Q16_CITATION_COL,
+    Q17_WTP_COL, Q18_FEATURES_COL, WTP_CODES
+)
+
+
+def ensure_nltk_data(resource, package):
+    """Download an NLTK resource on first use if it is not installed"""
+    import nltk
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(package)
+
+
+# Survey columns read by each analysis stage, in pipeline order
+STAGE_INPUTS = {
+    'analyze_demographics': [ROLE_COL, EXPERIENCE_COL, LOCATION_COL, FIRM_COL],
+    'analyze_pain_points': [Q5_TIME_COL, Q6_ACCESS_COL, Q7_ANALYTICS_COL] + list(DEMOGRAPHIC_COLUMNS),
+    'analyze_ai_adoption': [Q8_USES_AI_COL, Q9_TOOLS_COL, Q10_FREQUENCY_COL, Q11_TASKS_COL,
+                            Q12_TIME_SAVED_COL, Q13_COUNSEL_AI_COL] + list(DEMOGRAPHIC_COLUMNS),
+    'analyze_trust_and_concerns': [Q15_TRUST_COL, Q16_CITATION_COL] + list(DEMOGRAPHIC_COLUMNS),
+    'analyze_willingness_to_pay': [Q17_WTP_COL],
+    'analyze_feature_priorities': [Q18_FEATURES_COL],
+    'build_segment_cube': list(DEMOGRAPHIC_COLUMNS) + list(LIKERT_COLUMNS) + list(CATEGORICAL_COLUMNS)
+                          + list(MULTI_SELECT_COLUMNS),
+    'analyze_associations': list(DEMOGRAPHIC_COLUMNS) + list(LIKERT_COLUMNS) + list(CATEGORICAL_COLUMNS)
+                            + list(MULTI_SELECT_COLUMNS),
+    'analyze_time_windows': [TIMESTAMP_COL] + list(LIKERT_COLUMNS) + [Q17_WTP_COL, Q18_FEATURES_COL],
+    'sentiment_analysis_text_responses': list(TEXT_RESPONSE_COLUMNS),
+    'topic_modeling_lda': list(TEXT_RESPONSE_COLUMNS),
+    'topic_modeling_lsa': list(TEXT_RESPONSE_COLUMNS),
+    'user_segmentation': [Q5_TIME_COL, Q6_ACCESS_COL, Q12_TIME_SAVED_COL, Q15_TRUST_COL, Q16_CITATION_COL,
+                          Q8_USES_AI_COL, Q17_WTP_COL, ROLE_COL],
+    'extract_key_issues': [ISSUES_COL],
+    'generate_research_arguments': [Q6_ACCESS_COL, Q15_TRUST_COL],
+}
+
+# Stages that only count and average columns: with the SQLite backend they run as SQL
+# aggregations, so their columns are never loaded into the DataFrame
+SQL_PUSHDOWN_STAGES = {
+    'analyze_demographics', 'analyze_pain_points', 'analyze_ai_adoption', 'analyze_trust_and_concerns',
+    'analyze_willingness_to_pay', 'analyze_feature_priorities', 'generate_research_arguments',
+}
+
+_COMPARISONS = {'>=': operator.ge, '<=': operator.le, '>': operator.gt, '<': operator.lt,
+                '==': operator.eq, '!=': operator.ne}
+
+# Stages whose output is built from other stages' insights
+STAGE_DEPENDENCIES = {
+    'generate_research_arguments': ['analyze_trust_and_concerns', 'analyze_feature_priorities', 'extract_key_issues',
+                                    'analyze_pain_points', 'analyze_willingness_to_pay', 'analyze_ai_adoption'],
+}
+
+# Short stage names accepted by --stages (the insights key each stage writes)
+STAGE_ALIASES = {
+    'demographics': 'analyze_demographics',
+    'pain_points': 'analyze_pain_points',
+    'ai_adoption': 'analyze_ai_adoption',
+    'trust': 'analyze_trust_and_concerns',
+    'trust_concerns': 'analyze_trust_and_concerns',
+    'payment': 'analyze_willingness_to_pay',
+    'features': 'analyze_feature_priorities',
+    'segments': 'build_segment_cube',
+    'associations': 'analyze_associations',
+    'windows': 'analyze_time_windows',
+    'time_windows': 'analyze_time_windows',
+    'sentiment': 'sentiment_analysis_text_responses',
+    'lda': 'topic_modeling_lda',
+    'lda_topics': 'topic_modeling_lda',
+    'lsa': 'topic_modeling_lsa',
+    'lsa_topics': 'topic_modeling_lsa',
+    'segmentation': 'user_segmentation',
+    'user_segments': 'user_segmentation',
+    'key_issues': 'extract_key_issues',
+    'research_arguments': 'generate_research_arguments',
+}
+
+
+def resolve_stages(requested):
+    """
+    Expand requested stages (method names or short aliases) with everything they
+    depend on, in pipeline order. Raises ValueError for unknown stage names.
+    """
+    if isinstance(requested, str):
+        requested = [name.strip() for name in requested.split(',') if name.strip()]
+    needed = set()
+    pending = []
+    for name in requested:
+        stage = STAGE_ALIASES.get(name, name)
+        if stage not in STAGE_INPUTS:
+            known = ', '.join(sorted(STAGE_ALIASES))
+            raise ValueError(f"Unknown stage '{name}'. Known stages: {known}")
+        pending.append(stage)
+    while pending:
+        stage = pending.pop()
+        if stage not in needed:
+            needed.add(stage)
+            pending.extend(STAGE_DEPENDENCIES.get(stage, []))
+    return [stage for stage in STAGE_INPUTS if stage in needed]
+
+
+def stage_columns(stages):
+    """Survey columns the given stages read"""
+    columns = set()
+    for stage in stages:
+        columns.update(STAGE_INPUTS[stage])
+    return columns
+
+
+def clean_text(text):
+    """Lower-case a free-text answer, strip special characters and collapse whitespace"""
+    if pd.isna(text) or text == '':
+        return ''
+
+    text = str(text).lower()
+    # Remove special characters but keep meaningful punctuation
+    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    # Remove extra whitespace
+    text = ' '.join(text.split())
+
+    return text
+
+
+def likert_level(score):
+    """HIGH / MEDIUM / LOW label for a 1-5 Likert mean"""
+    if pd.isna(score):
+        return 'N/A'
+    return 'HIGH' if score >= 4 else 'MEDIUM' if score >= 3 else 'LOW'
+
+
+def citation_priority(score):
+    """CRITICAL / HIGH / MEDIUM label for the citation-importance mean"""
+    if pd.isna(score):
+        return 'N/A'
+    return 'CRITICAL' if score >= 4.5 else 'HIGH' if score >= 4 else 'MEDIUM'
 
 
 class LegalSurveyNLPPipeline:
@@ -54,22 +165,101 @@ class LegalSurveyNLPPipeline:
     Updates automatically when new data is loaded.
     """
 
-    def __init__(self, csv_path):
+    def __init__(self, csv_path, exclude_duplicates=False, confidence=0.95, n_bootstrap=2000,
+                 artifact_dir=None, artifact_max_mb=512, low_memory=False, memory_budget_mb=None,
+                 backend='pandas', db_path=None, vectorizer='vocabulary', ngram_range=(1, 2),
+                 hash_features=2 ** 18, n_jobs=1, topic_counts=None, doc_topic_priors=(None,),
+                 topic_word_priors=(None,), top_k=None, preview_size=None, issue_method='keywords',
+                 issue_corrections=None, history_path=None, sentiment_level='response', normalize_labels=False,
+                 alias_path=None, time_windows=(7, 30, 90), snapshot_path=None):
         """Initialize the pipeline with survey data path"""
+        if sentiment_level not in ('response', 'sentence'):
+            raise ValueError(f"Unknown sentiment level '{sentiment_level}' (expected 'response' or 'sentence')")
+        if issue_method not in ('keywords', 'model'):
+            raise ValueError(f"Unknown issue method '{issue_method}' (expected 'keywords' or 'model')")
+        if backend not in ('pandas', 'sqlite'):
+            raise ValueError(f"Unknown backend '{backend}' (expected 'pandas' or 'sqlite')")
+        if vectorizer not in ('vocabulary', 'hashing'):
+            raise ValueError(f"Unknown vectorizer '{vectorizer}' (expected 'vocabulary' or 'hashing')")
+        self.vectorizer = vectorizer
+        self.ngram_range = tuple(ngram_range)
+        self.hash_features = hash_features
+        self.n_jobs = n_jobs
+        self.topic_counts = list(topic_counts) if topic_counts else None
+        self.doc_topic_priors = tuple(doc_topic_priors)
+        self.topic_word_priors = tuple(topic_word_priors)
+        self.top_k = top_k
+        self.preview_size = preview_size
+        self.issue_method = issue_method
+        self.issue_corrections = issue_corrections
+        self.history_path = history_path
+        self.snapshot_path = snapshot_path
+        self.sentiment_level = sentiment_level
+        self._sentence_cache = {}
+        self.normalize_labels = normalize_labels or alias_path is not None
+        self.alias_path = alias_path
+        self.time_windows = tuple(time_windows)
+        self.daily_buckets = None
+        self._alias_cache = None
+        self._normalizers = {}
+        self._preview_strata = None
+        self._preview_population = {}
         self.csv_path = csv_path
+        self.backend = backend
+        self.db_path = db_path
+        self.db = None
+        self.accumulator = None
+        self.low_memory = low_memory
+        self.memory_budget_mb = memory_budget_mb
+        self.artifacts = None
+        if artifact_dir is not None:
+            from artifact_store import ArtifactStore
+            self.artifacts = ArtifactStore(artifact_dir, max_bytes=artifact_max_mb * 1024 ** 2)
+        self.models = {}
+        self.exclude_duplicates = exclude_duplicates
+        self.confidence = confidence
+        self.n_bootstrap = n_bootstrap
+        self._likert_ci = None
+        self._sia = None
+        self._fingerprints = {}
+        self._excluded_rows = None      # index of the near-duplicates dropped by exclude_duplicates
+        self.last_changed_columns = []
         self.df = None
         self.text_columns = []
         self.numeric_columns = []
         self.insights = {}
-        self.sia = SentimentIntensityAnalyzer()
-
-    def load_data(self):
-        """Load and perform initial data exploration"""
+        self.segment_cube = None
+        self.association_tests = []
+        self.respondent_index = None
+        self._scorer = None
+
+    @property
+    def sia(self):
+        """VADER sentiment analyzer, created (and its lexicon fetched) on first use"""
+        if self._sia is None:
+            from nltk.sentiment import SentimentIntensityAnalyzer
+            ensure_nltk_data('sentiment/vader_lexicon.zip', 'vader_lexicon')
+            self._sia = SentimentIntensityAnalyzer()
+        return self._sia
+
+    def load_data(self, columns=None):
+        """Load and perform initial data exploration (optionally only the given columns)"""
         print("=" * 80)
         print("STEP 1: LOADING & EXPLORING DATA")
         print("=" * 80)
 
-        self.df = pd.read_csv(self.csv_path)
+        if self.preview_size:
+            self.df = self._load_preview_sample(columns)
+        elif self.backend == 'sqlite':
+            self.df = self._load_from_database(columns)
+        elif columns is None:
+            self.df = read_survey_csv(self.csv_path)
+        else:
+            columns = set(columns)
+            self.df = read_survey_csv(self.csv_path, usecols=lambda col: col in columns)
+        self.text_columns = []
+        self.numeric_columns = []
+        self._fingerprints = self.column_fingerprints()
 
         print(f"\nDataset Shape: {self.df.shape[0]} responses x {self.df.shape[1]} questions")
         print(f"\nColumn Names:")
@@ -91,18 +281,327 @@ class LegalSurveyNLPPipeline:
 
         return self.df
 
+    def _load_preview_sample(self, columns=None):
+        """Stream the export through per-stratum reservoirs and keep a proportional stratified sample"""
+        from sampling import StratifiedReservoir
+
+        strata = list(DEMOGRAPHIC_COLUMNS)
+        wanted = None if columns is None else set(columns) | set(strata)
+        reservoir = StratifiedReservoir(strata, capacity=self.preview_size)
+        chunks = read_survey_csv(self.csv_path, chunksize=50000,
+                                 usecols=None if wanted is None else (lambda col: col in wanted))
+        for chunk in chunks:
+            reservoir.add(chunk)
+        sample = reservoir.sample(self.preview_size)
+        self._preview_strata = sample.pop('_stratum') if '_stratum' in sample.columns else None
+        self._preview_population = dict(reservoir.population)
+
+        print(f"\n PREVIEW: stratified sample of {len(sample)} of {reservoir.n_seen} responses "
+              f"across {len(reservoir.population)} strata (role x location x firm type)")
+        return sample
+
+    def _load_from_database(self, columns=None):
+        """Load the export into SQLite (if it changed) and fetch only the columns Python-side stages read"""
+        from survey_sql import SurveyDatabase
+
+        if self.db is None:
+            default_path = Path(self.csv_path).with_name(export_stem(self.csv_path) + '.sqlite')
+            self.db = SurveyDatabase(self.db_path or str(default_path))
+        rebuilt = self.db.load_csv(self.csv_path)
+        self.db.set_excluded([])
+        if columns is None:
+            columns = stage_columns(s for s in STAGE_INPUTS if s not in SQL_PUSHDOWN_STAGES) | set(TEXT_RESPONSE_COLUMNS)
+        print(f"\n{'Loaded export into' if rebuilt else 'Reusing'} SQLite table {self.db.path} "
+              f"({self.db.row_count()} rows x {len(self.db.columns())} questions)")
+        return self.db.fetch(columns)
+
+    def _has_column(self, col):
+        if self.accumulator is not None:
+            return col in self.accumulator.columns
+        return col in (self.db.columns() if self.db is not None else self.df.columns)
+
+    def _value_counts(self, col):
+        """Answer counts for one column, most common first"""
+        return self.db.value_counts(col) if self.db is not None else self.df[col].value_counts()
+
+    def _mean(self, col):
+        return self.db.mean(col) if self.db is not None else self.df[col].mean()
+
+    @property
+    def n_responses(self):
+        """Number of analyzed responses (also when only shard accumulators were loaded)"""
+        return self.accumulator.n_rows if self.accumulator is not None else len(self.df)
+
+    def _count_where(self, col, op, value):
+        """Respondents whose answer compares true against value, e.g. _count_where(q5, '>=', 4)"""
+        if self.accumulator is not None:
+            return self.accumulator.count_where(col, op, value)
+        if self.db is not None:
+            return self.db.count_where(col, op, value)
+        return int(_COMPARISONS[op](self.df[col], value).sum())
+
+    def _values(self, col):
+        """Non-missing answers of one column"""
+        return self.db.values(col) if self.db is not None else self.df[col].dropna()
+
+    def _tally(self, answers, col=None):
+        """
+        Counts of the comma-separated options in multi-select answers: an exact Counter,
+        or a fixed-size Space-Saving sketch of the top_k options when top_k is set.
+        With normalize_labels, spelling variants of an option are counted under one label.
+        """
+        if self.top_k is None:
+            from collections import Counter
+            counts = Counter()
+        else:
+            from heavy_hitters import SpaceSaving
+            counts = SpaceSaving(self.top_k)
+        if self.normalize_labels:
+            normalizer = self._label_normalizer(col)
+            for answer in answers:
+                counts.update(normalizer.normalize(answer))
+            self._alias_cache.save()
+            return counts
+        for answer in answers:
+            # Split by commas and extract option names
+            counts.update(t.strip() for t in str(answer).split(','))
+        return counts
+
+    def _label_normalizer(self, col):
+        """Fuzzy label normalizer of one multi-select question, backed by the alias cache"""
+        from label_normalizer import AliasCache, LabelNormalizer
+
+        if self._alias_cache is None:
+            self._alias_cache = AliasCache(self.alias_path)
+        if col not in self._normalizers:
+            section = MULTI_SELECT_COLUMNS.get(col, str(col))
+            self._normalizers[col] = LabelNormalizer(KNOWN_OPTIONS.get(col, ()),
+                                                     aliases=self._alias_cache.section(section),
+                                                     on_new_alias=self._alias_cache.mark_dirty)
+        return self._normalizers[col]
+
+    def _note_tally_error(self, insights, key, counts):
+        """Record (and print) the worst-case overcount of a Space-Saving tally"""
+        if hasattr(counts, 'error_bound'):
+            insights[f'{key}_max_error'] = counts.error_bound()
+            print(f"  (top-{counts.capacity} sketch of {counts.total} mentions: "
+                  f"counts overestimate by at most {counts.error_bound()})")
+
+    def _frame(self, columns):
+        """The given columns as a DataFrame, fetched from SQLite if they were not loaded"""
+        if self.db is None:
+            return self.df
+        return self.db.fetch(columns).reindex(self.df.index)
+
+    def column_fingerprints(self):
+        """Content hash of every loaded column, used to detect which inputs changed"""
+        if self.db is not None:
+            # Every stored column, one at a time, so SQL-side stages are refreshed too
+            return {
+                col: hashlib.sha1(pd.util.hash_pandas_object(self.db.fetch([col])[col], index=False)
+                                  .values.tobytes()).hexdigest()
+                for col in self.db.columns()
+            }
+        return {
+            col: hashlib.sha1(pd.util.hash_pandas_object(self.df[col], index=False).values.tobytes()).hexdigest()
+            for col in self.df.columns
+        }
+
+    def affected_stages(self, changed_columns):
+        """Stages (in pipeline order) that read a changed column or depend on a stage that does"""
+        changed_columns = set(changed_columns)
+        affected = []
+        for stage, inputs in STAGE_INPUTS.items():
+            if changed_columns & set(inputs) or set(STAGE_DEPENDENCIES.get(stage, [])) & set(affected):
+                affected.append(stage)
+        return affected
+
+    def refresh(self, output_path=None):
+        """
+        Reload the export and re-run only the stages whose input columns changed.
+        Returns the list of stages that were re-run.
+        """
+        previous_df, previous = self.df, self._fingerprints
+        self.load_data()
+        current = self._fingerprints
+        changed = [col for col in set(previous) | set(current) if previous.get(col) != current.get(col)]
+        self.last_changed_columns = changed
+        if not changed:
+            self.df = previous_df
+            return []
+
+        previous_excluded = self._excluded_rows
+        self._likert_ci = None
+        self.detect_near_duplicates()
+        if self.exclude_duplicates and not self._excluded_rows.equals(previous_excluded):
+            # A different set of excluded submissions changes the rows every stage reads
+            stages = list(STAGE_INPUTS)
+            print(f"\n Changed columns: {len(changed)}, excluded near-duplicates changed -> "
+                  f"re-running all {len(stages)} stages")
+        else:
+            stages = self.affected_stages(changed)
+            print(f"\n Changed columns: {len(changed)} -> re-running {len(stages)} stage(s): {', '.join(stages)}")
+
+        if ('user_segmentation' not in stages and previous_df is not None and 'cluster' in previous_df.columns
+                and previous_df.index.equals(self.df.index)):
+            self.df['cluster'] = previous_df['cluster']
+
+        for stage in stages:
+            getattr(self, stage)()
+
+        if output_path:
+            self.save_insights_report(output_path)
+        return stages
+
+    def _fit_or_load(self, name, data, params, fit):
+        """
+        Fit a model via fit(), or load the artifact persisted for identical input
+        data and hyperparameters. The fitted object is kept in self.models[name].
+        """
+        if self.artifacts is None:
+            fitted = fit()
+        else:
+            import sklearn
+            key = self.artifacts.key(name, data, params, sklearn.__version__)
+            fitted, loaded = self.artifacts.get_or_fit(key, fit)
+            print(f"  ({'Loaded cached' if loaded else 'Fitted and stored'} {name} artifact {key})")
+        self.models[name] = fitted
+        self._scorer = None     # recompiled from the new models on the next score_response
+        return fitted
+
+    @property
+    def numeric_dtype(self):
+        """Float type of the text matrices and clustering features (float32 in low-memory mode)"""
+        return np.float32 if self.low_memory else np.float64
+
+    def _chunk_rows(self, estimated_bytes, n_rows):
+        """Rows per chunk if a matrix of estimated_bytes would exceed the memory budget, else None"""
+        if self.memory_budget_mb is None:
+            return None
+        budget = self.memory_budget_mb * 1024 ** 2
+        if estimated_bytes <= budget:
+            return None
+        from chunked_models import chunk_rows_for_budget
+        chunk_rows = chunk_rows_for_budget(estimated_bytes, n_rows, budget)
+        print(f"  Estimated {estimated_bytes / 1024 ** 2:.1f} MB exceeds the {self.memory_budget_mb} MB budget: "
+              f"fitting in chunks of {chunk_rows} rows")
+        return chunk_rows
+
+    def _hashing_params(self, **extra):
+        """Parameters of the stateless hashing vectorizer used when vectorizer='hashing'"""
+        return dict(n_features=self.hash_features, ngram_range=self.ngram_range, stop_words='english',
+                    n_jobs=self.n_jobs, dtype=self.numeric_dtype, **extra)
+
+    @staticmethod
+    def _close_workers(vectorizer):
+        """Shut down the worker pool a hashing vectorizer keeps between calls (no-op otherwise)"""
+        close = getattr(vectorizer, 'close', None)
+        if close is not None:
+            close()
+
+    def _select_topic_count(self, method, texts, vectorizer_cls, vectorizer_params):
+        """Sweep self.topic_counts (and LDA priors) on one shared matrix and return the best candidate"""
+        from topic_selection import sweep_topics, select_best
+
+        vectorizer = vectorizer_cls(**vectorizer_params)
+        try:
+            doc_term = vectorizer.fit_transform(texts)
+        finally:
+            self._close_workers(vectorizer)
+        results = sweep_topics(doc_term, self.topic_counts, method=method, doc_topic_priors=self.doc_topic_priors,
+                               topic_word_priors=self.topic_word_priors, n_jobs=self.n_jobs)
+        best = select_best(results)
+
+        print(f"\n Topic-count sweep ({len(results)} candidates, scored by UMass coherence):")
+        for result in results:
+            marker = '*' if result is best else ' '
+            priors = ''
+            if method == 'lda' and (result['doc_topic_prior'] is not None or result['topic_word_prior'] is not None):
+                priors = f" (alpha={result['doc_topic_prior']}, eta={result['topic_word_prior']})"
+            extra = (f", held-out perplexity {result['perplexity']:.1f}" if method == 'lda'
+                     else f", explained variance {result['explained_variance']:.1%}")
+            print(f"  {marker} {result['n_topics']} topics{priors}: coherence {result['coherence']:.3f}{extra}")
+
+        self.insights.setdefault('topic_selection', {})[method] = {'best': best, 'candidates': results}
+        return best
+
     def preprocess_text(self, text):
         """Clean and preprocess text data"""
-        if pd.isna(text) or text == '':
-            return ''
+        return clean_text(text)
 
-        text = str(text).lower()
-        # Remove special characters but keep meaningful punctuation
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
-        # Remove extra whitespace
-        text = ' '.join(text.split())
+    def detect_near_duplicates(self, threshold=0.8, num_perm=128, bands=16, min_chars=20):
+        """Flag repeated or templated submissions via MinHash-LSH over free-text answers"""
+        print("\n" + "=" * 80)
+        print("STEP 1B: NEAR-DUPLICATE SUBMISSION DETECTION")
+        print("=" * 80)
 
-        return text
+        # One document per respondent: all of their free-text answers joined
+        text_cols = [col for col in TEXT_RESPONSE_COLUMNS if col in self.df.columns]
+        combined = self.df[text_cols].fillna('').astype(str).agg(' '.join, axis=1) if text_cols \
+            else pd.Series('', index=self.df.index)
+        combined = combined.apply(self.preprocess_text)
+
+        # Respondents with too little text cannot be told apart from each other
+        eligible = combined[combined.str.len() >= min_chars]
+
+        from near_duplicates import MinHashLSH
+        lsh = MinHashLSH(num_perm=num_perm, bands=bands)
+        groups = lsh.duplicate_groups(eligible.tolist(), threshold=threshold)
+        groups = [[eligible.index[pos] for pos in members] for members in groups]
+
+        self.df['duplicate_group'] = -1
+        self.df['is_near_duplicate'] = False
+        self.df['dedup_weight'] = 1.0
+        for group_id, members in enumerate(groups):
+            self.df.loc[members, 'duplicate_group'] = group_id
+            self.df.loc[members[1:], 'is_near_duplicate'] = True
+            self.df.loc[members, 'dedup_weight'] = 1.0 / len(members)
+
+        n_flagged = int(self.df['is_near_duplicate'].sum())
+        print(f"\n Respondents checked: {len(eligible)} (of {len(self.df)})")
+        print(f" Near-duplicate groups: {len(groups)}")
+        print(f" Flagged submissions: {n_flagged}")
+
+        self.insights['duplicates'] = {
+            'threshold': threshold,
+            'n_checked': len(eligible),
+            'n_groups': len(groups),
+            'n_flagged': n_flagged,
+            'groups': [[int(i) if isinstance(i, (int, np.integer)) else str(i) for i in members] for members in groups]
+        }
+
+        self._excluded_rows = self.df.index[self.df['is_near_duplicate']] if self.exclude_duplicates \
+            else self.df.index[:0]
+        if self.exclude_duplicates and n_flagged:
+            if self.db is not None:
+                self.db.set_excluded(self.df.index[self.df['is_near_duplicate']])
+            self.df = self.df[~self.df['is_near_duplicate']].copy()
+            print(f" Excluded flagged submissions: {len(self.df)} responses remain")
+
+        return groups
+
+    def likert_confidence_intervals(self):
+        """Bootstrap and exact confidence intervals for every Likert item, overall and per segment"""
+        if self._likert_ci is None:
+            from uncertainty import likert_intervals
+
+            self._likert_ci = likert_intervals(
+                self._frame(list(LIKERT_COLUMNS) + list(DEMOGRAPHIC_COLUMNS)), LIKERT_COLUMNS, DEMOGRAPHIC_COLUMNS,
+                n_boot=self.n_bootstrap, confidence=self.confidence
+            )
+            self.insights['confidence_intervals'] = self._likert_ci
+        return self._likert_ci
+
+    def _attach_interval(self, entry, col, label_key, level):
+        """Add a Likert item's bootstrap interval to its insight entry, with the label range it spans"""
+        ci = self.likert_confidence_intervals()[LIKERT_COLUMNS[col]]['overall']
+        entry['ci_low'] = ci['ci_low']
+        entry['ci_high'] = ci['ci_high']
+        low_label, high_label = level(ci['ci_low']), level(ci['ci_high'])
+        entry[f'{label_key}_range'] = low_label if low_label == high_label else f"{low_label} to {high_label}"
+        print(f"  - {self.confidence:.0%} CI: {ci['ci_low']:.2f} - {ci['ci_high']:.2f} "
+              f"({label_key.title()} range: {entry[f'{label_key}_range']}, n={ci['n']})")
+        return entry
 
     def analyze_demographics(self):
         """Analyze respondent demographics and characteristics"""
@@ -113,9 +612,9 @@ class LegalSurveyNLPPipeline:
         insights = {}
 
         # Role distribution
-        if '1. What is your current role?' in self.df.columns:
+        if self._has_column('1. What is your current role?'):
             role_col = '1. What is your current role?'
-            role_dist = self.df[role_col].value_counts()
+            role_dist = self._value_counts(role_col)
             insights['role_distribution'] = role_dist.to_dict()
 
             print(f"\nRespondent Roles:")
@@ -124,9 +623,9 @@ class LegalSurveyNLPPipeline:
                 print(f"  - {role}: {count} ({pct:.1f}%)")
 
         # Experience levels
-        if '2. Years of experience in the legal field (if applicable): ' in self.df.columns:
+        if self._has_column('2. Years of experience in the legal field (if applicable): '):
             exp_col = '2. Years of experience in the legal field (if applicable): '
-            exp_data = self.df[exp_col].dropna()
+            exp_data = self._values(exp_col)
             insights['experience_levels'] = exp_data.value_counts().to_dict()
 
             print(f"\n Experience Distribution:")
@@ -134,9 +633,9 @@ class LegalSurveyNLPPipeline:
             print(f"  - Range: {exp_data.astype(str).str.extract(r'(\d+)')[0].astype(float).min():.0f} - {exp_data.astype(str).str.extract(r'(\d+)')[0].astype(float).max():.0f} years")
 
         # Location distribution
-        if '3. Your location (County):  ' in self.df.columns:
+        if self._has_column('3. Your location (County):  '):
             loc_col = '3. Your location (County):  '
-            loc_dist = self.df[loc_col].value_counts()
+            loc_dist = self._value_counts(loc_col)
             insights['location_distribution'] = loc_dist.to_dict()
 
             print(f"\n Geographic Distribution:")
@@ -144,9 +643,9 @@ class LegalSurveyNLPPipeline:
                 print(f"  - {loc}: {count}")
 
         # Firm/Institution type
-        if '3.  Firm / Institution type:' in self.df.columns:
+        if self._has_column('3.  Firm / Institution type:'):
             firm_col = '3.  Firm / Institution type:'
-            firm_dist = self.df[firm_col].value_counts()
+            firm_dist = self._value_counts(firm_col)
             insights['institution_types'] = firm_dist.to_dict()
 
             print(f"\n Institution Types:")
@@ -166,34 +665,36 @@ class LegalSurveyNLPPipeline:
 
         # Time spent on research and drafting
         q5 = '5. I spend excessive time on legal research and drafting.  '
-        if q5 in self.df.columns:
-            avg_score = self.df[q5].mean()
+        if self._has_column(q5):
+            avg_score = self._mean(q5)
             pain_points['excessive_time_research'] = {
                 'mean_score': avg_score,
-                'severity': 'HIGH' if avg_score >= 4 else 'MEDIUM' if avg_score >= 3 else 'LOW'
+                'severity': likert_level(avg_score)
             }
             print(f"\n Time Burden on Research & Drafting:")
             print(f"  - Average Score: {avg_score:.2f}/5")
+            self._attach_interval(pain_points['excessive_time_research'], q5, 'severity', likert_level)
             print(f"  - Severity: {pain_points['excessive_time_research']['severity']}")
-            print(f"  - {(self.df[q5] >= 4).sum()} respondents ({(self.df[q5] >= 4).sum()/len(self.df)*100:.1f}%) strongly agree")
+            print(f"  - {self._count_where(q5, '>=', 4)} respondents ({self._count_where(q5, '>=', 4)/len(self.df)*100:.1f}%) strongly agree")
 
         # Access to legal resources
         q6 = '6. Access to up-to-date case law, statutes, document templates and other relevant research material is a major challenge in my work.  '
-        if q6 in self.df.columns:
-            avg_score = self.df[q6].mean()
+        if self._has_column(q6):
+            avg_score = self._mean(q6)
             pain_points['resource_access_challenge'] = {
                 'mean_score': avg_score,
-                'severity': 'HIGH' if avg_score >= 4 else 'MEDIUM' if avg_score >= 3 else 'LOW'
+                'severity': likert_level(avg_score)
             }
             print(f"\n Access to Legal Resources Challenge:")
             print(f"  - Average Score: {avg_score:.2f}/5")
+            self._attach_interval(pain_points['resource_access_challenge'], q6, 'severity', likert_level)
             print(f"  - Severity: {pain_points['resource_access_challenge']['severity']}")
-            print(f"  - {(self.df[q6] >= 4).sum()} respondents ({(self.df[q6] >= 4).sum()/len(self.df)*100:.1f}%) report major challenges")
+            print(f"  - {self._count_where(q6, '>=', 4)} respondents ({self._count_where(q6, '>=', 4)/len(self.df)*100:.1f}%) report major challenges")
 
         # Analytics usage
         q7 = '7. My organization uses analytics (time tracking, case management, reporting) to measure productivity.  '
-        if q7 in self.df.columns:
-            usage = self.df[q7].value_counts()
+        if self._has_column(q7):
+            usage = self._value_counts(q7)
             pain_points['analytics_adoption'] = usage.to_dict()
             print(f"\n Analytics Adoption:")
             print(f"  - Using analytics: {usage.get('Yes', 0)}")
@@ -212,8 +713,8 @@ class LegalSurveyNLPPipeline:
 
         # Current AI tool usage
         q8 = '8. Do you currently use any AI tools (e.g., ChatGPT, Copilot, Claude, Gemini, Counsel AI, or others) to support legal tasks or decision-making? '
-        if q8 in self.df.columns:
-            usage = self.df[q8].value_counts()
+        if self._has_column(q8):
+            usage = self._value_counts(q8)
             ai_insights['current_usage'] = usage.to_dict()
 
             print(f"\n Current AI Tool Usage:")
@@ -223,17 +724,11 @@ class LegalSurveyNLPPipeline:
 
         # Specific tools used
         q9 = '9. If yes, please specify the tool(s) you use:'
-        if q9 in self.df.columns:
-            tools_used = self.df[q9].dropna()
-            all_tools = []
-            for tools in tools_used:
-                # Split by commas and extract tool names
-                tool_list = [t.strip() for t in str(tools).split(',')]
-                all_tools.extend(tool_list)
-
-            from collections import Counter
-            tool_counts = Counter(all_tools)
+        if self._has_column(q9):
+            tools_used = self._values(q9)
+            tool_counts = self._tally(tools_used, q9)
             ai_insights['specific_tools'] = dict(tool_counts)
+            self._note_tally_error(ai_insights, 'specific_tools', tool_counts)
 
             print(f"\n Specific AI Tools Used:")
             for tool, count in tool_counts.most_common():
@@ -241,8 +736,8 @@ class LegalSurveyNLPPipeline:
 
         # Frequency of use
         q10 = '10. How often do you use AI tools to support legal tasks or decision-making?'
-        if q10 in self.df.columns:
-            freq = self.df[q10].value_counts()
+        if self._has_column(q10):
+            freq = self._value_counts(q10)
             ai_insights['usage_frequency'] = freq.to_dict()
 
             print(f"\n Usage Frequency:")
@@ -251,16 +746,11 @@ class LegalSurveyNLPPipeline:
 
         # Types of legal tasks
         q11 = '11. What types of legal tasks do you use AI tools for?'
-        if q11 in self.df.columns:
-            tasks = self.df[q11].dropna()
-            all_tasks = []
-            for task_list in tasks:
-                task_items = [t.strip() for t in str(task_list).split(',')]
-                all_tasks.extend(task_items)
-
-            from collections import Counter
-            task_counts = Counter(all_tasks)
+        if self._has_column(q11):
+            tasks = self._values(q11)
+            task_counts = self._tally(tasks, q11)
             ai_insights['task_types'] = dict(task_counts)
+            self._note_tally_error(ai_insights, 'task_types', task_counts)
 
             print(f"\n Legal Tasks Supported by AI:")
             for task, count in task_counts.most_common():
@@ -268,20 +758,21 @@ class LegalSurveyNLPPipeline:
 
         # Time savings
         q12 = '12. AI tools have saved me significant time on routine tasks (e.g., research, drafting, summarization).  '
-        if q12 in self.df.columns:
-            avg_score = self.df[q12].mean()
+        if self._has_column(q12):
+            avg_score = self._mean(q12)
             ai_insights['time_savings'] = {
                 'mean_score': avg_score,
-                'impact': 'HIGH' if avg_score >= 4 else 'MEDIUM' if avg_score >= 3 else 'LOW'
+                'impact': likert_level(avg_score)
             }
             print(f"\n Time Savings Impact:")
             print(f"  - Average Score: {avg_score:.2f}/5")
+            self._attach_interval(ai_insights['time_savings'], q12, 'impact', likert_level)
             print(f"  - Impact Level: {ai_insights['time_savings']['impact']}")
 
         # Counsel AI rating
         q13 = '13. If you tried Counsel AI (LegalizeMe), how would you rate your experience? [LegalizeMe - Your Legal Assistant]'
-        if q13 in self.df.columns:
-            ratings = self.df[q13].dropna()
+        if self._has_column(q13):
+            ratings = self._values(q13)
             if len(ratings) > 0:
                 avg_rating = ratings.mean()
                 ai_insights['counsel_ai_rating'] = {
@@ -306,29 +797,31 @@ class LegalSurveyNLPPipeline:
 
         # Trust without verification
         q15 = '15. I trust AI outputs without manual verification.  '
-        if q15 in self.df.columns:
-            avg_score = self.df[q15].mean()
+        if self._has_column(q15):
+            avg_score = self._mean(q15)
             trust_insights['blind_trust'] = {
                 'mean_score': avg_score,
-                'level': 'HIGH' if avg_score >= 4 else 'MEDIUM' if avg_score >= 3 else 'LOW'
+                'level': likert_level(avg_score)
             }
             print(f"\n Trust Without Verification:")
             print(f"  - Average Score: {avg_score:.2f}/5")
+            self._attach_interval(trust_insights['blind_trust'], q15, 'level', likert_level)
             print(f"  - Trust Level: {trust_insights['blind_trust']['level']}")
-            print(f"  - {(self.df[q15] <= 2).sum()} respondents ({(self.df[q15] <= 2).sum()/len(self.df)*100:.1f}%) DO NOT trust without verification")
+            print(f"  - {self._count_where(q15, '<=', 2)} respondents ({self._count_where(q15, '<=', 2)/len(self.df)*100:.1f}%) DO NOT trust without verification")
 
         # Importance of citations
         q16 = '16. Accurate citation and provenance (knowing where the information came from) are essential for any legal AI tool.  '
-        if q16 in self.df.columns:
-            avg_score = self.df[q16].mean()
+        if self._has_column(q16):
+            avg_score = self._mean(q16)
             trust_insights['citation_importance'] = {
                 'mean_score': avg_score,
-                'priority': 'CRITICAL' if avg_score >= 4.5 else 'HIGH' if avg_score >= 4 else 'MEDIUM'
+                'priority': citation_priority(avg_score)
             }
             print(f"\n Importance of Accurate Citations:")
             print(f"  - Average Score: {avg_score:.2f}/5")
+            self._attach_interval(trust_insights['citation_importance'], q16, 'priority', citation_priority)
             print(f"  - Priority Level: {trust_insights['citation_importance']['priority']}")
-            print(f"  - {(self.df[q16] == 5).sum()} respondents ({(self.df[q16] == 5).sum()/len(self.df)*100:.1f}%) consider it ABSOLUTELY ESSENTIAL")
+            print(f"  - {self._count_where(q16, '==', 5)} respondents ({self._count_where(q16, '==', 5)/len(self.df)*100:.1f}%) consider it ABSOLUTELY ESSENTIAL")
 
         self.insights['trust_concerns'] = trust_insights
         return trust_insights
@@ -342,8 +835,8 @@ class LegalSurveyNLPPipeline:
         payment_insights = {}
 
         q17 = '17. If a legal AI tool saved you at least 5–10 hours per week, would you be willing to pay for it?'
-        if q17 in self.df.columns:
-            wtp = self.df[q17].value_counts()
+        if self._has_column(q17):
+            wtp = self._value_counts(q17)
             payment_insights['willingness_to_pay'] = wtp.to_dict()
 
             print(f"\n Willingness to Pay (for 5-10 hrs/week savings):")
@@ -373,16 +866,11 @@ class LegalSurveyNLPPipeline:
         feature_insights = {}
 
         q18 = '18. Key features I would prioritize in a legal AI tool (choose up to 3):  '
-        if q18 in self.df.columns:
-            features = self.df[q18].dropna()
-            all_features = []
-            for feature_list in features:
-                feature_items = [f.strip() for f in str(feature_list).split(',')]
-                all_features.extend(feature_items)
-
-            from collections import Counter
-            feature_counts = Counter(all_features)
+        if self._has_column(q18):
+            features = self._values(q18)
+            feature_counts = self._tally(features, q18)
             feature_insights['top_features'] = dict(feature_counts)
+            self._note_tally_error(feature_insights, 'top_features', feature_counts)
 
             print(f"\n Top Prioritized Features:")
             for i, (feature, count) in enumerate(feature_counts.most_common(), 1):
@@ -392,6 +880,106 @@ class LegalSurveyNLPPipeline:
         self.insights['features'] = feature_insights
         return feature_insights
 
+    def build_segment_cube(self):
+        """Precompute per-segment Likert and option aggregates for every demographic breakdown"""
+        print("\n" + "=" * 80)
+        print("STEP 7B: SEGMENT CUBE (ROLE / LOCATION / FIRM BREAKDOWNS)")
+        print("=" * 80)
+
+        from segment_cube import SegmentCube
+        self.segment_cube = SegmentCube.from_frame(self.df)
+        cube = self.segment_cube
+
+        segment_insights = {}
+        for dimension in cube.dimensions:
+            segment_insights[dimension] = cube.breakdown(dimension)
+
+            print(f"\n By {dimension.replace('_', ' ').title()}:")
+            for segment, row in segment_insights[dimension].items():
+                scores = ', '.join(f"{item}={row[item]:.2f}" for item in cube.likert_items() if not np.isnan(row[item]))
+                print(f"  - {segment} (n={row['n']}): {scores}")
+
+        print(f"\n Precomputed segment combinations: {sum(len(v) for v in cube.cells.values())}")
+
+        self.insights['segments'] = segment_insights
+        return cube
+
+    def analyze_associations(self, top_n=10, fdr=0.05):
+        """Test every pair of closed questions for association in one batched pass"""
+        print("\n" + "=" * 80)
+        print("STEP 7C: CROSS-QUESTION ASSOCIATIONS")
+        print("=" * 80)
+
+        from associations import IndicatorMatrix, chi_square_all_pairs, spearman_all_pairs
+        indicators = IndicatorMatrix(self.df)
+        tests = chi_square_all_pairs(indicators)
+        correlations = spearman_all_pairs(self.df)
+        self.association_tests = tests
+
+        significant = [t for t in tests if t['q_value'] < fdr]
+        print(f"\n Tested {len(tests)} question pairs ({len(indicators.level_var)} answer levels); "
+              f"{len(significant)} significant at {fdr:.0%} false discovery rate")
+        for test in significant[:top_n]:
+            print(f"  - {test['a']} x {test['b']}: Cramér's V = {test['cramers_v']:.2f} "
+                  f"(chi2 = {test['chi2']:.1f}, dof = {test['dof']}, q = {test['q_value']:.3g}, n = {test['n']})")
+
+        print(f"\n Rank Correlations Between Likert Items (Spearman):")
+        for corr in correlations[:top_n]:
+            marker = '*' if corr['q_value'] < fdr else ' '
+            print(f"  {marker} {corr['a']} ~ {corr['b']}: rho = {corr['rho']:+.2f} "
+                  f"(q = {corr['q_value']:.3g}, n = {corr['n']})")
+
+        self.insights['associations'] = {
+            'n_tests': len(tests),
+            'fdr': fdr,
+            'n_significant': len(significant),
+            'strongest': significant[:top_n],
+            'rank_correlations': correlations
+        }
+        return tests
+
+    def analyze_time_windows(self):
+        """Rolling 7/30/90-day views of the Likert, willingness-to-pay and feature metrics"""
+        print("\n" + "=" * 80)
+        print("STEP 7D: ROLLING TIME WINDOWS")
+        print("=" * 80)
+
+        if TIMESTAMP_COL not in self.df.columns:
+            print("  Timestamp column not found")
+            return None
+
+        from rolling_windows import DailyBuckets
+
+        # Day buckets survive refreshes, so only days whose responses changed are re-accumulated
+        if self.daily_buckets is None:
+            self.daily_buckets = DailyBuckets(self.top_k)
+        rebuilt = self.daily_buckets.sync(self.df)
+        buckets = self.daily_buckets
+        if not buckets.buckets:
+            print("  No parseable submission timestamps")
+            return None
+
+        windows = buckets.rolling(self.time_windows)
+        print(f"\n {len(buckets.buckets)} submission days up to {buckets.last_day:%Y-%m-%d} "
+              f"({len(rebuilt)} day buckets rebuilt, {buckets.undated} undated responses)")
+        for name, summary in windows.items():
+            means = ', '.join(f"{label}={mean:.2f}" for label, mean in summary['likert_means'].items())
+            print(f"\n  Last {name} ({summary['n_responses']} responses):")
+            if 'wtp_yes_share' in summary:
+                print(f"    - Willing to pay: {summary['wtp_yes_share']:.1%}")
+            if means:
+                print(f"    - Likert means: {means}")
+            if summary.get('top_features'):
+                print(f"    - Top feature: {next(iter(summary['top_features']))}")
+
+        self.insights['time_windows'] = {
+            'as_of': f"{buckets.last_day:%Y-%m-%d}",
+            'days': len(buckets.buckets),
+            'undated': buckets.undated,
+            'windows': windows
+        }
+        return windows
+
     def sentiment_analysis_text_responses(self):
         """Perform sentiment analysis on open-ended text responses"""
         print("\n" + "=" * 80)
@@ -415,17 +1003,19 @@ class LegalSurveyNLPPipeline:
                 print(f"\n Analyzing: {label.replace('_', ' ').title()}")
                 print(f"   Responses: {len(responses)}")
 
-                for response in responses:
-                    text = self.preprocess_text(response)
-                    if text:
-                        sentiment_score = self.sia.polarity_scores(text)
-                        sentiments.append(sentiment_score)
+                if self.sentiment_level == 'sentence':
+                    index, scores = self._sentence_scores(col, responses)
+                    sentiments = index.mean(scores)
+                    sentiments = sentiments[~np.isnan(sentiments[:, 0])]
+                else:
+                    for response in responses:
+                        text = self.preprocess_text(response)
+                        if text:
+                            sentiment_score = self.sia.polarity_scores(text)
+                            sentiments.append([sentiment_score[field] for field in ('compound', 'pos', 'neg', 'neu')])
 
-                if sentiments:
-                    avg_compound = np.mean([s['compound'] for s in sentiments])
-                    avg_pos = np.mean([s['pos'] for s in sentiments])
-                    avg_neg = np.mean([s['neg'] for s in sentiments])
-                    avg_neu = np.mean([s['neu'] for s in sentiments])
+                if len(sentiments):
+                    avg_compound, avg_pos, avg_neg, avg_neu = np.asarray(sentiments).T.copy().mean(axis=1)
 
                     sentiment_results[label] = {
                         'avg_compound': avg_compound,
@@ -439,9 +1029,41 @@ class LegalSurveyNLPPipeline:
                     print(f"   - Compound Score: {avg_compound:.3f}")
                     print(f"   - Positive: {avg_pos:.2%}, Negative: {avg_neg:.2%}, Neutral: {avg_neu:.2%}")
 
+                    if self.sentiment_level == 'sentence':
+                        # Responses with both a clearly positive and a clearly negative sentence
+                        mixed = ((index.reduce(scores[:, 0], np.maximum) > 0.05)
+                                 & (index.reduce(scores[:, 0], np.minimum) < -0.05))
+                        sentiment_results[label].update(sentences=int(len(index.sentence_ids)),
+                                                        mixed_share=float(mixed.sum() / len(sentiments)))
+                        print(f"   - Sentences: {len(index.sentence_ids)} ({len(index.sentences)} distinct), "
+                              f"mixed responses: {sentiment_results[label]['mixed_share']:.1%}")
+
         self.insights['sentiment'] = sentiment_results
+
+        if self.sentiment_level == 'sentence' and ISSUES_COL in self._sentence_cache:
+            from sentence_sentiment import category_sentiment
+            _, index, scores = self._sentence_cache[ISSUES_COL]
+            by_issue = category_sentiment(index, scores)
+            print(f"\n Sentence Sentiment by Issue Category:")
+            for category, entry in sorted(by_issue.items(), key=lambda kv: kv[1]['avg_compound']):
+                print(f"  - {category}: {entry['avg_compound']:+.3f} ({entry['sentences']} sentences)")
+            self.insights['sentiment_by_issue'] = by_issue
         return sentiment_results
 
+    def _sentence_scores(self, col, responses):
+        """
+        Sentence segmentation and per-sentence VADER scores of one text column, cached
+        until the column's content changes (each distinct sentence is scored once)
+        """
+        from sentence_sentiment import SentenceIndex, score_sentences
+
+        key = (len(responses), int(pd.util.hash_pandas_object(responses).sum()))
+        cached = self._sentence_cache.get(col)
+        if cached is None or cached[0] != key:
+            index = SentenceIndex([self.preprocess_text(response) for response in responses])
+            cached = self._sentence_cache[col] = (key, index, score_sentences(index.sentences, self.sia))
+        return cached[1], cached[2]
+
     def topic_modeling_lda(self, n_topics=3):
         """Apply Latent Dirichlet Allocation for topic modeling"""
         print("\n" + "=" * 80)
@@ -467,24 +1089,47 @@ class LegalSurveyNLPPipeline:
 
         print(f"\n Analyzing {len(all_texts)} text responses")
 
-        # Create document-term matrix
-        vectorizer = CountVectorizer(
-            max_features=100,
-            stop_words='english',
-            min_df=1,
-            max_df=0.8
-        )
-
-        doc_term_matrix = vectorizer.fit_transform(all_texts)
-
-        # Apply LDA
-        lda_model = LatentDirichletAllocation(
-            n_components=n_topics,
-            random_state=42,
-            max_iter=20
-        )
-
-        lda_output = lda_model.fit_transform(doc_term_matrix)
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.decomposition import LatentDirichletAllocation
+
+        from chunked_models import estimate_sparse_bytes, chunked_lda
+
+        if self.vectorizer == 'hashing':
+            from hashed_text import HashedTextVectorizer
+            vectorizer_cls, vectorizer_params = HashedTextVectorizer, self._hashing_params()
+        else:
+            vectorizer_cls = CountVectorizer
+            vectorizer_params = dict(max_features=100, stop_words='english', min_df=1, max_df=0.8)
+            if self.low_memory:
+                vectorizer_params['dtype'] = self.numeric_dtype
+        lda_params = dict(n_components=n_topics, random_state=42, max_iter=20)
+        if self.topic_counts:
+            best = self._select_topic_count('lda', all_texts, vectorizer_cls, vectorizer_params)
+            if best is not None:
+                lda_params.update(n_components=best['n_topics'], doc_topic_prior=best['doc_topic_prior'],
+                                  topic_word_prior=best['topic_word_prior'])
+        chunk_rows = self._chunk_rows(
+            estimate_sparse_bytes(all_texts, np.dtype(self.numeric_dtype).itemsize), len(all_texts))
+
+        def fit():
+            vectorizer = vectorizer_cls(**vectorizer_params)
+            try:
+                if chunk_rows:
+                    return {'vectorizer': vectorizer,
+                            'model': chunked_lda(vectorizer, all_texts, lda_params, chunk_rows)}
+
+                # Create document-term matrix
+                doc_term_matrix = vectorizer.fit_transform(all_texts)
+
+                # Apply LDA
+                lda_model = LatentDirichletAllocation(**lda_params)
+                lda_model.fit(doc_term_matrix)
+                return {'vectorizer': vectorizer, 'model': lda_model}
+            finally:
+                self._close_workers(vectorizer)
+
+        fitted = self._fit_or_load('lda', all_texts, {**vectorizer_params, **lda_params, 'chunk_rows': chunk_rows}, fit)
+        vectorizer, lda_model = fitted['vectorizer'], fitted['model']
 
         # Get top words for each topic
         feature_names = vectorizer.get_feature_names_out()
@@ -525,19 +1170,45 @@ class LegalSurveyNLPPipeline:
             print(f"  Insufficient text data for LSA ({len(all_texts)} documents)")
             return None
 
-        # Create TF-IDF matrix
-        vectorizer = TfidfVectorizer(
-            max_features=100,
-            stop_words='english',
-            min_df=1,
-            max_df=0.8
-        )
-
-        tfidf_matrix = vectorizer.fit_transform(all_texts)
-
-        # Apply LSA (TruncatedSVD)
-        lsa_model = TruncatedSVD(n_components=n_topics, random_state=42)
-        lsa_output = lsa_model.fit_transform(tfidf_matrix)
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.decomposition import TruncatedSVD
+
+        from chunked_models import estimate_sparse_bytes, chunked_svd
+
+        if self.vectorizer == 'hashing':
+            from hashed_text import HashedTextVectorizer
+            vectorizer_cls, vectorizer_params = HashedTextVectorizer, self._hashing_params(tfidf=True)
+        else:
+            vectorizer_cls = TfidfVectorizer
+            vectorizer_params = dict(max_features=100, stop_words='english', min_df=1, max_df=0.8,
+                                     dtype=self.numeric_dtype)
+        lsa_params = dict(n_components=n_topics, random_state=42)
+        if self.topic_counts:
+            best = self._select_topic_count('lsa', all_texts, vectorizer_cls, vectorizer_params)
+            if best is not None:
+                n_topics = lsa_params['n_components'] = best['n_topics']
+        chunk_rows = self._chunk_rows(
+            estimate_sparse_bytes(all_texts, np.dtype(self.numeric_dtype).itemsize), len(all_texts))
+
+        def fit():
+            vectorizer = vectorizer_cls(**vectorizer_params)
+            try:
+                if chunk_rows:
+                    return {'vectorizer': vectorizer,
+                            'model': chunked_svd(vectorizer, all_texts, n_topics, chunk_rows)}
+
+                # Create TF-IDF matrix
+                tfidf_matrix = vectorizer.fit_transform(all_texts)
+
+                # Apply LSA (TruncatedSVD)
+                lsa_model = TruncatedSVD(**lsa_params)
+                lsa_model.fit(tfidf_matrix)
+                return {'vectorizer': vectorizer, 'model': lsa_model}
+            finally:
+                self._close_workers(vectorizer)
+
+        fitted = self._fit_or_load('lsa', all_texts, {**vectorizer_params, **lsa_params, 'chunk_rows': chunk_rows}, fit)
+        vectorizer, lsa_model = fitted['vectorizer'], fitted['model']
 
         # Get top words for each topic
         feature_names = vectorizer.get_feature_names_out()
@@ -555,15 +1226,13 @@ class LegalSurveyNLPPipeline:
         self.insights['lsa_topics'] = topics
         return topics
 
-    def user_segmentation(self):
-        """Segment users based on their characteristics and responses"""
-        print("\n" + "=" * 80)
-        print("STEP 11: USER SEGMENTATION & CLUSTERING")
-        print("=" * 80)
-
-        # Create feature matrix for clustering
-        feature_cols = []
-        feature_data = pd.DataFrame()
+    def _segmentation_features(self, df, fill_values=None):
+        """
+        Feature matrix the segmentation clusters on: Likert answers (missing ones filled with
+        fill_values, by default the column medians), AI usage and willingness to pay.
+        Returns (features, fill_values).
+        """
+        feature_data = pd.DataFrame(index=df.index)
 
         # Numeric Likert scale responses
         likert_cols = [
@@ -574,32 +1243,72 @@ class LegalSurveyNLPPipeline:
             '16. Accurate citation and provenance (knowing where the information came from) are essential for any legal AI tool.  '
         ]
 
+        if fill_values is None:
+            fill_values = {col: df[col].median() for col in likert_cols if col in df.columns}
         for col in likert_cols:
-            if col in self.df.columns:
-                feature_data[col] = self.df[col].fillna(self.df[col].median())
+            if col in fill_values:
+                feature_data[col] = pd.to_numeric(df[col], errors='coerce').fillna(fill_values[col])
 
         # Encode categorical variables
         # AI usage
-        if '8. Do you currently use any AI tools (e.g., ChatGPT, Copilot, Claude, Gemini, Counsel AI, or others) to support legal tasks or decision-making? ' in self.df.columns:
-            feature_data['uses_ai'] = (self.df['8. Do you currently use any AI tools (e.g., ChatGPT, Copilot, Claude, Gemini, Counsel AI, or others) to support legal tasks or decision-making? '] == 'Yes').astype(int)
+        if Q8_USES_AI_COL in df.columns:
+            feature_data['uses_ai'] = (df[Q8_USES_AI_COL] == 'Yes').astype(int)
 
         # Willingness to pay
-        if '17. If a legal AI tool saved you at least 5–10 hours per week, would you be willing to pay for it?' in self.df.columns:
-            wtp_map = {'Yes': 2, 'Maybe, depending on price': 1, 'No': 0}
-            feature_data['wtp'] = self.df['17. If a legal AI tool saved you at least 5–10 hours per week, would you be willing to pay for it?'].map(wtp_map).fillna(1)
+        if Q17_WTP_COL in df.columns:
+            feature_data['wtp'] = df[Q17_WTP_COL].map(WTP_CODES).fillna(1)
+
+        return feature_data, fill_values
+
+    def user_segmentation(self):
+        """Segment users based on their characteristics and responses"""
+        print("\n" + "=" * 80)
+        print("STEP 11: USER SEGMENTATION & CLUSTERING")
+        print("=" * 80)
+
+        feature_data, fill_values = self._segmentation_features(self.df)
 
         if feature_data.empty:
             print("  Insufficient numeric data for clustering")
             return None
 
-        # Standardize features
-        scaler = StandardScaler()
-        scaled_features = scaler.fit_transform(feature_data)
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.cluster import KMeans
 
-        # K-Means clustering
+        from chunked_models import chunked_kmeans, chunked_predict
+        from respondent_index import RespondentIndex
+
+        feature_data = feature_data.astype(self.numeric_dtype)
         n_clusters = min(3, len(self.df))  # Adjust based on sample size
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        clusters = kmeans.fit_predict(scaled_features)
+        kmeans_params = dict(n_clusters=n_clusters, random_state=42, n_init=10)
+        # Feature matrix plus its scaled copy and the point-to-centroid distances
+        chunk_rows = self._chunk_rows(feature_data.memory_usage(index=False).sum() * 2
+                                      + len(feature_data) * n_clusters * np.dtype(self.numeric_dtype).itemsize,
+                                      len(feature_data))
+        kmeans_params_key = {**kmeans_params, 'chunk_rows': chunk_rows}
+
+        def fit():
+            if chunk_rows:
+                scaler, kmeans = chunked_kmeans(feature_data.to_numpy(), n_clusters, chunk_rows)
+                return {'scaler': scaler, 'model': kmeans}
+
+            # Standardize features
+            scaler = StandardScaler()
+            scaled_features = scaler.fit_transform(feature_data)
+
+            # K-Means clustering
+            kmeans = KMeans(**kmeans_params)
+            kmeans.fit(scaled_features)
+            return {'scaler': scaler, 'model': kmeans}
+
+        fitted = self._fit_or_load('segmentation', feature_data, kmeans_params_key, fit)
+        scaler, kmeans = fitted['scaler'], fitted['model']
+        clusters = chunked_predict(scaler, kmeans, feature_data.to_numpy(), chunk_rows or len(feature_data))
+
+        # Look-alike index over the standardized features (see similar_respondents)
+        self.respondent_index = self._fit_or_load(
+            'respondent_index', feature_data, kmeans_params_key,
+            lambda: RespondentIndex.from_features(feature_data, scaler, fill_values, chunk_rows))
 
         self.df['cluster'] = clusters
 
@@ -630,6 +1339,69 @@ class LegalSurveyNLPPipeline:
 
         return clusters
 
+    def similar_respondents(self, respondent_id, k=5):
+        """
+        The k respondents closest to respondent_id (a row label of the export) in the
+        standardized segmentation space, nearest first, with their segment, demographics
+        and free-text answers
+        """
+        if self.respondent_index is None:
+            if self.df is None:
+                self.load_data()
+            self.user_segmentation()
+        distances, ids = self.respondent_index.neighbours(respondent_id, k)
+
+        columns = [col for col in list(DEMOGRAPHIC_COLUMNS) + list(TEXT_RESPONSE_COLUMNS) if self._has_column(col)]
+        if self.db is not None:
+            details = self.db.fetch(columns, rows=ids)
+        else:
+            details = self.df[columns]
+        details = details.reindex(ids).rename(columns={**DEMOGRAPHIC_COLUMNS, **TEXT_RESPONSE_COLUMNS})
+        details.insert(0, 'distance', distances)
+        if 'cluster' in self.df.columns:
+            details.insert(1, 'segment', self.df['cluster'].reindex(ids).to_numpy() + 1)
+        return details
+
+    def prepare_scoring(self):
+        """
+        Compile the fitted segmentation, topic and issue models into the single-response
+        fast path used by score_response. Stages whose models are missing are run first
+        (with an artifact store they are loaded instead of refitted).
+        """
+        from response_scoring import ResponseScorer
+
+        needed = [('segmentation', 'user_segmentation'), ('lda', 'topic_modeling_lda'),
+                  ('lsa', 'topic_modeling_lsa')]
+        if self.issue_method == 'model':
+            needed.append(('issue_classifier', 'extract_key_issues'))
+        for name, stage in needed:
+            if name not in self.models:
+                if self.df is None:
+                    self.load_data()
+                getattr(self, stage)()
+        models = {name: model for name, model in self.models.items()
+                  if name != 'issue_classifier' or self.issue_method == 'model'}
+        self._scorer = ResponseScorer(models, self.respondent_index, self.sia, self.preprocess_text)
+        return self._scorer
+
+    def score_response(self, row, update=True):
+        """
+        Score one new respondent (a dict or Series keyed by survey column) without a batch
+        rerun: segment, LDA / LSA topic mix, issue categories and per-answer sentiment.
+        With update, the segment sizes and issue counts in the insights are incremented and
+        insights['live_scoring'] keeps running aggregates of everything scored so far.
+        """
+        from response_scoring import update_running_aggregates
+
+        if self._scorer is None:
+            self.prepare_scoring()
+        result = self._scorer.score(row)
+        if 'cluster' in result:
+            result['segment'] = result['cluster'] + 1
+        if update:
+            update_running_aggregates(self.insights, result)
+        return result
+
     def extract_key_issues(self):
         """Extract and categorize key issues mentioned"""
         print("\n" + "=" * 80)
@@ -644,26 +1416,23 @@ class LegalSurveyNLPPipeline:
 
         issues = self.df[issues_col].dropna()
 
-        # Define issue categories
-        issue_categories = {
-            'Accuracy/Hallucinations': ['inaccurac', 'hallucination', 'wrong', 'incorrect', 'error', 'mistake', 'false', 'unreliable'],
-            'Citation/References': ['citation', 'reference', 'source', 'provenance', 'cite', 'attribute'],
-            'Speed/Performance': ['speed', 'slow', 'performance', 'latency', 'fast'],
-            'Relevance': ['relevan', 'context', 'specific', 'jurisdiction', 'kenya', 'local'],
-            'Comprehensiveness': ['comprehensive', 'depth', 'detail', 'complete', 'thorough'],
-            'Trust/Reliability': ['trust', 'reliable', 'confidence', 'verify', 'fact check']
-        }
+        # Issue categories (shared with the sharded accumulators)
+        issue_categories = ISSUE_CATEGORIES
+
+        texts = [self.preprocess_text(str(response)) for response in issues]
+        if self.issue_method == 'model':
+            matches = self._classify_issues(texts)
+        else:
+            matches = [keyword_categories(text, issue_categories) for text in texts]
 
         issue_counts = {category: 0 for category in issue_categories}
         issue_examples = {category: [] for category in issue_categories}
 
-        for response in issues:
-            text = self.preprocess_text(str(response))
-            for category, keywords in issue_categories.items():
-                if any(keyword in text for keyword in keywords):
-                    issue_counts[category] += 1
-                    if len(issue_examples[category]) < 2:  # Store max 2 examples
-                        issue_examples[category].append(str(response)[:100] + '...')
+        for response, categories in zip(issues, matches):
+            for category in categories:
+                issue_counts[category] += 1
+                if len(issue_examples[category]) < 2:  # Store max 2 examples
+                    issue_examples[category].append(str(response)[:100] + '...')
 
         print(f"\n Issue Categories (from {len(issues)} responses):")
         for category, count in sorted(issue_counts.items(), key=lambda x: x[1], reverse=True):
@@ -677,9 +1446,51 @@ class LegalSurveyNLPPipeline:
             'counts': issue_counts,
             'examples': issue_examples
         }
+        if self.issue_method == 'model':
+            self.insights['key_issues']['method'] = 'model'
 
         return issue_counts
 
+    def _classify_issues(self, texts):
+        """
+        Issue categories of cleaned responses from the trained classifier. It is trained on
+        keyword-rule labels overridden by the hand corrections, and persisted like the other models.
+        Too few non-empty responses to train on fall back to the keyword rules.
+        """
+        from issue_classifier import MIN_TRAINING_RESPONSES, IssueClassifier, bootstrap_labels, load_corrections
+
+        corrections = {}
+        if self.issue_corrections:
+            corrections = {self.preprocess_text(text): labels
+                           for text, labels in load_corrections(self.issue_corrections).items()}
+        train_texts, labels = bootstrap_labels(texts, corrections)
+        n_usable = sum(1 for text in train_texts if text.strip())
+        if n_usable < MIN_TRAINING_RESPONSES:
+            print(f"  Only {n_usable} non-empty responses to train the issue classifier on: using the keyword rules")
+            return [keyword_categories(text) for text in texts]
+
+        # Keyed on what defines the labels (taxonomy and corrections) and on the training
+        # set's size band, not on every response: a stored model keeps scoring new
+        # responses until the corrections change or the responses double
+        params = {'categories': list(ISSUE_CATEGORIES), 'size_band': int(np.log2(n_usable))}
+        try:
+            fitted = self._fit_or_load('issue_classifier', [ISSUE_CATEGORIES, corrections], params,
+                                       lambda: {'model': IssueClassifier(ISSUE_CATEGORIES).fit(train_texts, labels),
+                                                'n_train': len(train_texts)})
+        except ValueError as exc:
+            if 'empty vocabulary' not in str(exc):
+                raise
+            print("  No usable terms to train the issue classifier on: using the keyword rules")
+            return [keyword_categories(text) for text in texts]
+        classifier = fitted['model']
+
+        predicted = classifier.predict(texts)
+        matches = [[classifier.categories[j] for j in np.flatnonzero(row)] for row in predicted]
+        changed = sum(set(found) != set(keyword_categories(text)) for text, found in zip(texts, matches))
+        print(f"  Issue classifier trained on {fitted['n_train']} responses ({len(corrections)} corrections); "
+              f"{changed} responses categorized differently from the keyword rules")
+        return matches
+
     def generate_research_arguments(self):
         """Generate compelling arguments for domain-adapted LLMs with RAG"""
         print("\n" + "=" * 80)
@@ -696,8 +1507,8 @@ class LegalSurveyNLPPipeline:
             arg1 = f"""
 ARGUMENT 1: CRITICAL NEED FOR CITATIONS & PROVENANCE (RAG)
 =====================================================
-- Citation Importance Score: {citation_score:.2f}/5 ({self.insights['trust_concerns']['citation_importance']['priority']} priority)
-- Trust Without Verification: {trust_score:.2f}/5 ({(self.df['15. I trust AI outputs without manual verification.  '] <= 2).sum()}/{len(self.df)} users DO NOT blindly trust AI)
+- Citation Importance Score: {citation_score:.2f}/5 ({self.insights['trust_concerns']['citation_importance']['priority']} priority, {self.confidence:.0%} CI {self.insights['trust_concerns']['citation_importance']['ci_low']:.2f}-{self.insights['trust_concerns']['citation_importance']['ci_high']:.2f})
+- Trust Without Verification: {trust_score:.2f}/5 ({self._count_where(Q15_TRUST_COL, '<=', 2)}/{self.n_responses} users DO NOT blindly trust AI)
 
 INSIGHT: Legal professionals DEMAND verifiable sources. RAG (Retrieval-Augmented Generation)
 directly addresses this by grounding AI responses in actual legal documents, cases, and statutes,
@@ -717,7 +1528,7 @@ which is unacceptable in legal practice where citations are not optional—they'
             arg2 = f"""
 ARGUMENT 2: DOMAIN ADAPTATION FOR KENYAN LEGAL CONTEXT
 =====================================================
-- Users demanding Kenya-specific coverage: {local_law_mentions}/{len(self.df)} ({local_law_mentions/len(self.df)*100:.1f}%)
+- Users demanding Kenya-specific coverage: {local_law_mentions}/{self.n_responses} ({local_law_mentions/self.n_responses*100:.1f}%)
 - Top priority feature: Local law coverage ranks among TOP 3 most requested features
 
 INSIGHT: Generic LLMs are trained predominantly on Western legal systems (US, UK, EU).
@@ -766,7 +1577,7 @@ SOLUTION: Domain-adapted LLMs with RAG provide:
 ARGUMENT 4: PROVEN VALUE PROPOSITION & MARKET DEMAND
 =====================================================
 - Time Burden Score: {time_burden:.2f}/5 (users spend EXCESSIVE time on research/drafting)
-- Willingness to Pay: {willing}/{len(self.df)} ({willing/len(self.df)*100:.1f}%) would pay for 5-10 hrs/week savings
+- Willingness to Pay: {willing}/{self.n_responses} ({willing/self.n_responses*100:.1f}%) would pay for 5-10 hrs/week savings
 - AI Time Savings Score: {self.insights['ai_adoption']['time_savings']['mean_score']:.2f}/5
 
 ECONOMIC IMPACT:
@@ -789,8 +1600,8 @@ delivering both time savings AND the accuracy/citations that legal work demands.
             arg5 = f"""
 ARGUMENT 5: DEMOCRATIZING ACCESS TO LEGAL KNOWLEDGE
 =====================================================
-- Resource Access Challenge Score: {resource_challenge:.2f}/5 ({self.insights['pain_points']['resource_access_challenge']['severity']} severity)
-- {(self.df['6. Access to up-to-date case law, statutes, document templates and other relevant research material is a major challenge in my work.  '] >= 4).sum()}/{len(self.df)} report MAJOR challenges accessing legal resources
+- Resource Access Challenge Score: {resource_challenge:.2f}/5 ({self.insights['pain_points']['resource_access_challenge']['severity']} severity, {self.confidence:.0%} CI {self.insights['pain_points']['resource_access_challenge']['ci_low']:.2f}-{self.insights['pain_points']['resource_access_challenge']['ci_high']:.2f})
+- {self._count_where(Q6_ACCESS_COL, '>=', 4)}/{self.n_responses} report MAJOR challenges accessing legal resources
 
 STRUCTURAL PROBLEM:
   - Legal databases (LexisNexis, Westlaw) are expensive and often lack African content
@@ -812,8 +1623,80 @@ by removing friction in accessing legal knowledge—a fundamental barrier to jus
             print(arg5)
 
         self.insights['research_arguments'] = arguments
+        # Row-level counts quoted by the arguments, so reports can be re-rendered from a snapshot
+        research_metrics = {'n_responses': self.n_responses, 'confidence': self.confidence}
+        if self._has_column(Q15_TRUST_COL):
+            research_metrics['distrust_count'] = int(self._count_where(Q15_TRUST_COL, '<=', 2))
+        if self._has_column(Q6_ACCESS_COL):
+            research_metrics['access_challenge_count'] = int(self._count_where(Q6_ACCESS_COL, '>=', 4))
+        self.insights['research_metrics'] = research_metrics
         return arguments
 
+    def preview_error_bounds(self):
+        """Stratified-sampling error bounds for every Likert mean, answer share and sentiment score"""
+        print("\n" + "=" * 80)
+        print("PREVIEW ERROR BOUNDS (STRATIFIED SAMPLE)")
+        print("=" * 80)
+
+        from sampling import stratified_estimate
+
+        strata = self._preview_strata.reindex(self.df.index)
+
+        def estimate(values):
+            return stratified_estimate(values, strata, self._preview_population, self.confidence)
+
+        bounds = {'means': {}, 'shares': {}, 'sentiment': {}}
+        for col, label in LIKERT_COLUMNS.items():
+            if col in self.df.columns:
+                bounds['means'][label] = estimate(self.df[col])
+
+        for col, label in {**DEMOGRAPHIC_COLUMNS, **CATEGORICAL_COLUMNS}.items():
+            if col in self.df.columns:
+                answers = self.df[col]
+                bounds['shares'][label] = {
+                    str(option): estimate((answers == option).astype(float).where(answers.notna()))
+                    for option in answers.dropna().unique()
+                }
+        for col, label in MULTI_SELECT_COLUMNS.items():
+            if col in self.df.columns:
+                # Share of all respondents picking each option, as the stages report it
+                picked = self.df[col].apply(lambda answer: {t.strip() for t in str(answer).split(',')}
+                                            if pd.notna(answer) else set())
+                options = set().union(*picked) if len(picked) else set()
+                bounds['shares'][label] = {
+                    option: estimate(picked.apply(lambda chosen: float(option in chosen)))
+                    for option in sorted(options)
+                }
+
+        for col, label in TEXT_RESPONSE_COLUMNS.items():
+            if col in self.df.columns:
+                if self.sentiment_level == 'sentence':
+                    responses = self.df[col].dropna()
+                    index, scores = self._sentence_scores(col, responses)
+                    compound = pd.Series(index.mean(scores[:, 0]), index=responses.index).dropna()
+                else:
+                    texts = self.df[col].dropna().apply(self.preprocess_text)
+                    texts = texts[texts != '']
+                    compound = texts.apply(lambda text: self.sia.polarity_scores(text)['compound'])
+                bounds['sentiment'][label] = estimate(compound.reindex(self.df.index))
+
+        print(f"\n Sample: {len(self.df)} of {sum(self._preview_population.values())} responses "
+              f"({self.confidence:.0%} error bounds)")
+        for group in ('means', 'sentiment'):
+            for label, bound in bounds[group].items():
+                print(f"  - {label}: {bound['estimate']:.2f} +/- {bound['margin']:.2f} (n={bound['n']})")
+        n_shares = sum(len(options) for options in bounds['shares'].values())
+        print(f"  - {n_shares} answer shares with bounds stored under insights['preview']")
+
+        self.insights['preview'] = {
+            'sample_size': len(self.df),
+            'population_size': sum(self._preview_population.values()),
+            'n_strata': len(self._preview_population),
+            'confidence': self.confidence,
+            'error_bounds': bounds
+        }
+        return bounds
+
     def save_insights_report(self, output_path='legal_ai_insights_report.txt'):
         """Save comprehensive insights report"""
         print("\n" + "=" * 80)
@@ -826,8 +1709,15 @@ by removing friction in accessing legal knowledge—a fundamental barrier to jus
             f.write("Legal AI Survey - Domain-Adapted LLMs for African Legal Practice\n")
             f.write("=" * 80 + "\n\n")
 
+            if 'preview' in self.insights:
+                preview = self.insights['preview']
+                f.write("*** PREVIEW - NOT FINAL RESULTS ***\n")
+                f.write(f"Stratified sample of {preview['sample_size']} of {preview['population_size']} responses; "
+                        f"see 'preview' for {preview['confidence']:.0%} error bounds on every mean, share and "
+                        f"sentiment score.\n\n")
+
             f.write(f"Dataset: {self.csv_path}\n")
-            f.write(f"Total Responses: {len(self.df)}\n")
+            f.write(f"Total Responses: {self.n_responses}\n")
             f.write(f"Analysis Date: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
 
             # Write all insights
@@ -837,6 +1727,30 @@ by removing friction in accessing legal knowledge—a fundamental barrier to jus
             f.write("=" * 80 + "\n")
             f.write(json.dumps(self.insights, indent=2, default=str))
 
+            # Strongest associations between questions
+            if self.insights.get('associations', {}).get('strongest'):
+                associations = self.insights['associations']
+                f.write("\n\n" + "=" * 80 + "\n")
+                f.write("STRONGEST ASSOCIATIONS BETWEEN QUESTIONS\n")
+                f.write("=" * 80 + "\n")
+                f.write(f"{associations['n_significant']} of {associations['n_tests']} question pairs are associated "
+                        f"at a {associations['fdr']:.0%} false discovery rate (Benjamini-Hochberg).\n\n")
+                for test in associations['strongest']:
+                    f.write(f"  - {test['a']} x {test['b']}: Cramér's V = {test['cramers_v']:.2f} "
+                            f"(q = {test['q_value']:.3g}, n = {test['n']})\n")
+
+            if self.insights.get('time_windows'):
+                time_windows = self.insights['time_windows']
+                f.write("\n\n" + "=" * 80 + "\n")
+                f.write(f"ROLLING WINDOWS (AS OF {time_windows['as_of']})\n")
+                f.write("=" * 80 + "\n")
+                for name, summary in time_windows['windows'].items():
+                    f.write(f"\nLast {name}: {summary['n_responses']} responses\n")
+                    if 'wtp_yes_share' in summary:
+                        f.write(f"  - Willing to pay: {summary['wtp_yes_share']:.1%}\n")
+                    for label, mean in summary['likert_means'].items():
+                        f.write(f"  - {label.replace('_', ' ').title()}: {mean:.2f}/5\n")
+
             # Research arguments
             if 'research_arguments' in self.insights:
                 f.write("\n\n" + "=" * 80 + "\n")
@@ -846,33 +1760,62 @@ by removing friction in accessing legal knowledge—a fundamental barrier to jus
                     f.write(arg + "\n\n")
 
         print(f"\n Report saved to: {output_path}")
+
+        if self.history_path:
+            from insights_history import InsightsHistory
+            history = InsightsHistory(self.history_path)
+            try:
+                run_id = history.record(self.insights, dataset=str(self.csv_path), n_responses=self.n_responses)
+            finally:
+                history.close()
+            print(f" Run {run_id} recorded in history: {self.history_path}")
+        if self.snapshot_path:
+            from report_renderer import save_snapshot
+            save_snapshot(self.snapshot_path, self.insights, dataset=str(self.csv_path), n_responses=self.n_responses)
+            print(f" Insights snapshot saved to: {self.snapshot_path} (render it with report_renderer.py)")
         return output_path
 
-    def run_full_pipeline(self):
-        """Execute the complete NLP analysis pipeline"""
+    def run_full_pipeline(self, output_path='legal_ai_insights_report.txt', stages=None):
+        """
+        Execute the complete NLP analysis pipeline, or only the requested stages
+        (plus their dependencies), loading only the columns those stages read
+        """
         print("\n" + "=" * 80)
         print("AUTOMATED NLP PIPELINE FOR LEGAL AI SURVEY ANALYSIS")
         print("=" * 80 + "\n")
 
-        # Step 1: Load data
-        self.load_data()
+        selected = list(STAGE_INPUTS) if stages is None else resolve_stages(stages)
+        if stages is not None:
+            print(f"Selected stages: {', '.join(selected)}\n")
 
-        # Step 2-13: Run all analyses
-        self.analyze_demographics()
-        self.analyze_pain_points()
-        self.analyze_ai_adoption()
-        self.analyze_trust_and_concerns()
-        self.analyze_willingness_to_pay()
-        self.analyze_feature_priorities()
-        self.sentiment_analysis_text_responses()
-        self.topic_modeling_lda()
-        self.topic_modeling_lsa()
-        self.user_segmentation()
-        self.extract_key_issues()
-        self.generate_research_arguments()
+        # Step 1: Load data
+        if self.backend == 'sqlite':
+            # Counting/averaging stages run in SQL; only the other stages' columns are fetched
+            columns = stage_columns(s for s in selected if s not in SQL_PUSHDOWN_STAGES)
+            if stages is None or self.exclude_duplicates:
+                columns |= set(TEXT_RESPONSE_COLUMNS)
+            self.load_data(columns)
+        elif stages is None:
+            self.load_data()
+        else:
+            columns = stage_columns(selected)
+            if self.exclude_duplicates:
+                columns |= set(TEXT_RESPONSE_COLUMNS)
+            self.load_data(columns)
+
+        # Duplicate detection shingles the free text, so narrow runs skip it unless exclusion was asked for
+        if stages is None or self.exclude_duplicates:
+            self.detect_near_duplicates()
+
+        # Step 2-13: Run the analyses
+        for stage in selected:
+            getattr(self, stage)()
+
+        if self.preview_size:
+            self.preview_error_bounds()
 
         # Step 14: Save report
-        self.save_insights_report()
+        self.save_insights_report(output_path)
 
         print("\n" + "=" * 80)
         print("PIPELINE COMPLETE - ALL INSIGHTS GENERATED")
@@ -880,16 +1823,150 @@ by removing friction in accessing legal knowledge—a fundamental barrier to jus
 
         return self.insights
 
+    def run_sharded(self, output_path='legal_ai_insights_report.txt', shard_rows=50000, max_workers=None,
+                    sentiment=True):
+        """
+        Run the aggregation stages as a map-reduce over row shards of csv_path (or over the
+        shard files of a directory / glob) on a process pool, merging the partial states exactly
+        """
+        print("\n" + "=" * 80)
+        print("SHARD-PARALLEL AGGREGATION (MAP-REDUCE)")
+        print("=" * 80)
+
+        from survey_shards import aggregate_shards
+
+        self.accumulator = aggregate_shards(self.csv_path, shard_rows=shard_rows, max_workers=max_workers,
+                                            top_k=self.top_k, sentiment=sentiment)
+        self.insights.update(self.accumulator.finalize(self.confidence))
+
+        print(f"\n Responses aggregated: {self.accumulator.n_rows}")
+        for section in ('demographics', 'pain_points', 'ai_adoption', 'trust_concerns', 'payment',
+                        'features', 'sentiment', 'key_issues'):
+            if self.insights.get(section):
+                print(f"  - {section}: {', '.join(map(str, self.insights[section]))}")
+        # Confidence intervals are Student-t intervals from the merged Likert histograms;
+        # topic models, segmentation and duplicate detection need all rows and are not sharded
+        print(" Likert intervals: exact t-intervals from merged value histograms")
+
+        self.generate_research_arguments()
+        self.save_insights_report(output_path)
+        return self.insights
+
 
-def main():
+def main(argv=None):
     """Main execution function - UPDATE THIS PATH WHEN NEW DATA ARRIVES"""
+    import argparse
 
     #  CONFIGURATION - Update this when you have new data
     CSV_PATH = r"c:\Users\HP\legalizeme-bi\AI in Legal Practice_ Survey on Domain-Adapted LLMs and Legal Tech in Kenya  (Responses) - Form Responses 1.csv"
 
+    parser = argparse.ArgumentParser(description="Legal AI survey NLP analysis pipeline")
+    parser.add_argument('csv_path', nargs='?', default=CSV_PATH,
+                        help="Survey export to analyze (defaults to CSV_PATH)")
+    parser.add_argument('--waves', metavar='DIR_OR_GLOB',
+                        help="Analyze every export in a directory or glob, one worker process per wave")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes for --waves / --shards (default: one per CPU)")
+    parser.add_argument('--exclude-duplicates', action='store_true',
+                        help="Drop near-duplicate submissions before analysis")
+    parser.add_argument('--artifact-dir', default=None,
+                        help="Persist fitted vectorizers/models here and reuse them when inputs are unchanged")
+    parser.add_argument('--artifact-max-mb', type=int, default=512,
+                        help="Disk budget for --artifact-dir; least recently used artifacts are evicted")
+    parser.add_argument('--low-memory', action='store_true',
+                        help="Use float32 text matrices and clustering features")
+    parser.add_argument('--memory-budget-mb', type=float, default=None,
+                        help="Fit text/clustering models in chunks when their matrices would exceed this budget")
+    parser.add_argument('--backend', choices=['pandas', 'sqlite'], default='pandas',
+                        help="'sqlite' loads the export into an embedded database and runs counts/means as SQL")
+    parser.add_argument('--db-path', default=None,
+                        help="SQLite file for --backend sqlite (default: next to the export, named <export>.sqlite)")
+    parser.add_argument('--vectorizer', choices=['vocabulary', 'hashing'], default='vocabulary',
+                        help="'hashing' vectorizes topic-model text statelessly (n-grams, parallel shards)")
+    parser.add_argument('--ngram-max', type=int, default=2,
+                        help="Longest n-gram kept by --vectorizer hashing")
+    parser.add_argument('--hash-features', type=int, default=2 ** 18,
+                        help="Number of hashed columns for --vectorizer hashing")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Worker processes for shard vectorization")
+    parser.add_argument('--topic-counts', default=None,
+                        help="Comma-separated topic counts to sweep, e.g. 2,3,4,5,6 (best by coherence is used)")
+    parser.add_argument('--doc-topic-priors', default=None,
+                        help="Comma-separated LDA doc-topic priors (alpha) to include in the sweep")
+    parser.add_argument('--topic-word-priors', default=None,
+                        help="Comma-separated LDA topic-word priors (eta) to include in the sweep")
+    parser.add_argument('--top-k', type=int, default=None,
+                        help="Tally tools/tasks/features with a fixed-size top-k sketch instead of exact counts")
+    parser.add_argument('--shards', action='store_true',
+                        help="Aggregate row shards of csv_path (or the shard files in a directory/glob) in parallel")
+    parser.add_argument('--shard-rows', type=int, default=50000,
+                        help="Rows per shard for --shards")
+    parser.add_argument('--preview', type=int, default=None, metavar='SAMPLE_SIZE',
+                        help="Quick preview on a stratified sample of this many responses, with error bounds")
+    parser.add_argument('--issue-method', choices=['keywords', 'model'], default='keywords',
+                        help="Categorize issues with keyword rules or a classifier trained from them")
+    parser.add_argument('--issue-corrections', default=None, metavar='JSON',
+                        help="Hand-labelled issue responses that override the keyword labels when training")
+    parser.add_argument('--history', default=None, metavar='SQLITE_PATH',
+                        help="Also record every run's insights in this history store (see insights_history.py)")
+    parser.add_argument('--snapshot', default=None, metavar='JSON',
+                        help="Also save the insights as a JSON snapshot for report_renderer.py")
+    parser.add_argument('--sentiment-level', choices=['response', 'sentence'], default='response',
+                        help="Score whole responses, or each sentence / contrastive clause and average them")
+    parser.add_argument('--normalize-labels', action='store_true',
+                        help="Merge spelling variants of tools and options (e.g. 'Chat GPT' -> 'ChatGPT') before counting")
+    parser.add_argument('--alias-cache', default=None, metavar='JSON',
+                        help="Persist (and hand-edit) the learned label aliases in this file; implies --normalize-labels")
+    parser.add_argument('--windows', default='7,30,90', metavar='DAYS',
+                        help="Comma-separated rolling window lengths in days for the time-window stage")
+    parser.add_argument('--stages', default=None,
+                        help="Comma-separated stages to run, e.g. demographics,payment (dependencies are added)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and re-run affected stages whenever csv_path (file or drop directory) changes")
+    args = parser.parse_args(argv)
+
+    def number_list(value, cast=float):
+        return [cast(v) for v in value.split(',') if v.strip()] if value else None
+
+    topic_kwargs = dict(topic_counts=number_list(args.topic_counts, int),
+                        doc_topic_priors=number_list(args.doc_topic_priors) or (None,),
+                        topic_word_priors=number_list(args.topic_word_priors) or (None,))
+
+    pipeline_kwargs = dict(exclude_duplicates=args.exclude_duplicates,
+                           artifact_dir=args.artifact_dir, artifact_max_mb=args.artifact_max_mb,
+                           low_memory=args.low_memory, memory_budget_mb=args.memory_budget_mb,
+                           backend=args.backend, db_path=args.db_path,
+                           vectorizer=args.vectorizer, ngram_range=(1, args.ngram_max),
+                           hash_features=args.hash_features, n_jobs=args.jobs, top_k=args.top_k,
+                           preview_size=args.preview, issue_method=args.issue_method,
+                           issue_corrections=args.issue_corrections, history_path=args.history,
+                           snapshot_path=args.snapshot, sentiment_level=args.sentiment_level,
+                           normalize_labels=args.normalize_labels, alias_path=args.alias_cache,
+                           time_windows=number_list(args.windows, int), **topic_kwargs)
+
+    if args.waves:
+        # Each wave runs its own pipeline; these flags name a single run's file or mode
+        unsupported = [flag for flag, value in (('--db-path', args.db_path), ('--snapshot', args.snapshot),
+                                                ('--shards', args.shards), ('--watch', args.watch)) if value]
+        if unsupported:
+            parser.error(f"--waves cannot be combined with {', '.join(unsupported)}")
+        from survey_waves import run_waves
+        return run_waves(args.waves, max_workers=args.workers, stages=args.stages, **pipeline_kwargs)
+
+    if args.watch:
+        from watch_mode import SurveyWatcher
+        watcher = SurveyWatcher(args.csv_path, **pipeline_kwargs)
+        try:
+            watcher.watch()
+        except KeyboardInterrupt:
+            pass
+        return watcher.pipeline.insights if watcher.pipeline else None
+
     # Initialize and run pipeline
-    pipeline = LegalSurveyNLPPipeline(CSV_PATH)
-    insights = pipeline.run_full_pipeline()
+    pipeline = LegalSurveyNLPPipeline(args.csv_path, **pipeline_kwargs)
+    if args.shards:
+        return pipeline.run_sharded(shard_rows=args.shard_rows, max_workers=args.workers)
+    insights = pipeline.run_full_pipeline(stages=args.stages)
 
     return insights
 
@@ -0,0 +1,102 @@
+"""
+Near-Duplicate Detection for Survey Submissions
+MinHash signatures banded into an LSH index, so repeated or templated
+responses are found without comparing every pair of respondents.
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def shingle(text, k=5):
+    """Hash the character k-grams of a normalized text into a uint64 array"""
+    text = ' '.join(re.sub(r'[^\w\s]', ' ', str(text).lower()).split())
+    if not text:
+        return np.empty(0, dtype=np.uint64)
+    if len(text) <= k:
+        grams = {text}
+    else:
+        grams = {text[i:i + k] for i in range(len(text) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class MinHashLSH:
+    """
+    MinHash signatures with a banded LSH index.
+    With `bands` bands of `num_perm / bands` rows, two documents become candidates
+    roughly when their Jaccard similarity exceeds (1 / bands) ** (bands / num_perm).
+    """
+
+    def __init__(self, num_perm=128, bands=16, seed=42):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 31 - 1, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 2 ** 31 - 1, size=num_perm).astype(np.uint64)
+
+    def signature(self, shingles):
+        """MinHash signature of one shingle set (all permutations in one broadcast)"""
+        if len(shingles) == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashed = (shingles[:, None] * self._a + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return hashed.min(axis=0)
+
+    def signatures(self, texts, k=5):
+        """Signature matrix (n_docs x num_perm) for an iterable of texts"""
+        return np.vstack([self.signature(shingle(t, k)) for t in texts]) if len(texts) else \
+            np.empty((0, self.num_perm), dtype=np.uint64)
+
+    def band_buckets(self, signatures):
+        """Row positions sharing an LSH band bucket, one list per bucket with two or more rows"""
+        for band in range(self.bands):
+            buckets = {}
+            band_slice = signatures[:, band * self.rows:(band + 1) * self.rows]
+            for pos, row in enumerate(band_slice):
+                buckets.setdefault(row.tobytes(), []).append(pos)
+            yield from (members for members in buckets.values() if len(members) > 1)
+
+    def duplicate_groups(self, texts, threshold=0.8, k=5, max_comparisons=8):
+        """
+        Group near-duplicate texts.
+        Returns a list of groups (lists of row positions, first occurrence first),
+        only for groups with two or more members.
+
+        Texts with identical signatures are joined directly, and bucket members are only
+        verified against the max_comparisons members before them in the bucket, so a
+        bucket of m templated submissions costs O(m) comparisons rather than O(m^2).
+        """
+        signatures = self.signatures(texts, k)
+        if not len(texts):
+            return []
+        _, first, inverse = np.unique(signatures, axis=0, return_index=True, return_inverse=True)
+        # Identical signatures (e.g. mass-identical submissions) join their first occurrence
+        parent = first[inverse.ravel()].tolist()
+        distinct = np.sort(first)
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for members in self.band_buckets(signatures[distinct]):
+            members = distinct[members].tolist()
+            for i in range(1, len(members)):
+                pos = members[i]
+                for other in members[max(0, i - max_comparisons):i]:
+                    root_other, root_pos = find(other), find(pos)
+                    if root_other != root_pos and np.mean(signatures[other] == signatures[pos]) >= threshold:
+                        parent[max(root_other, root_pos)] = min(root_other, root_pos)
+
+        groups = {}
+        for pos in range(len(texts)):
+            groups.setdefault(find(pos), []).append(pos)
+        return [members for members in groups.values() if len(members) > 1]
@@ -0,0 +1,418 @@
+"""
+Report Rendering from Stored Insights
+Renders an insights snapshot (any run of the insights history store, or a JSON snapshot
+written with --snapshot) as plain text, Markdown or HTML without re-running a single
+analysis stage. The wording lives in the section templates below, which are parsed once
+at import into literal / field pieces; each output format only supplies the markup for
+headings, paragraphs and bullet lists.
+
+Usage:
+    python report_renderer.py insights_history.sqlite --format all --output survey_report
+    python report_renderer.py snapshot.json --format markdown --run-id 3
+"""
+
+import html
+import json
+import string
+
+import pandas as pd
+
+KENYA_LAW_FEATURE = 'Local law coverage (Kenya-specific)'
+
+
+# Snapshots -----------------------------------------------------------------
+
+def _json_default(obj):
+    # numpy scalars and anything else the stages store
+    return obj.item() if hasattr(obj, 'item') else str(obj)
+
+
+def save_snapshot(path, insights, dataset=None, n_responses=None, recorded_at=None):
+    """Write insights plus run metadata as a JSON snapshot the renderer can load"""
+    snapshot = {
+        'recorded_at': str(recorded_at or pd.Timestamp.now().isoformat(timespec='seconds')),
+        'dataset': dataset,
+        'n_responses': n_responses,
+        'insights': insights
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=1, default=_json_default)
+    return path
+
+
+def load_snapshot(path, run_id=None):
+    """
+    Snapshot dict (recorded_at, dataset, n_responses, insights) from a JSON file or from
+    an insights history SQLite file (the latest run unless run_id is given). A JSON file
+    holding a bare insights dict is accepted too.
+    """
+    if str(path).lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            raw = json.load(f)
+        return raw if 'insights' in raw else {'recorded_at': None, 'dataset': None, 'n_responses': None,
+                                              'insights': raw}
+    from insights_history import InsightsHistory
+    history = InsightsHistory(path)
+    try:
+        snapshot = history.snapshot(run_id)
+    finally:
+        history.close()
+    if snapshot is None:
+        raise ValueError(f"No recorded run {'' if run_id is None else run_id} in {path}")
+    return snapshot
+
+
+# Compiled templates --------------------------------------------------------
+
+class Template:
+    """A str.format template parsed once into (literal, field path, format spec) pieces"""
+
+    _formatter = string.Formatter()
+
+    def __init__(self, text):
+        self.text = text
+        self.pieces = [(literal, tuple(field.split('.')) if field else None, spec or '')
+                       for literal, field, spec, _ in self._formatter.parse(text)]
+
+    def render(self, context, escape):
+        """Filled-in text with values (and literals) escaped for the output format; KeyError if a value is missing"""
+        out = []
+        for literal, path, spec in self.pieces:
+            out.append(escape(literal))
+            if path is not None:
+                value = context
+                for key in path:
+                    value = value[key]
+                if isinstance(value, (list, tuple)):
+                    value = ', '.join(map(str, value))
+                out.append(escape(format(value, spec)))
+        return ''.join(out)
+
+
+class Paragraph:
+    def __init__(self, text):
+        self.template = Template(text)
+
+
+class Bullets:
+    """One bullet per template; bullets whose values are missing are left out"""
+
+    def __init__(self, *lines):
+        self.templates = [Template(line) for line in lines]
+
+
+class Each:
+    """
+    One bullet per entry of the dict (or list) at path. Templates see 'key', 'value' and,
+    for numeric values, 'share' of the given total (a context path) or of their sum.
+    """
+
+    def __init__(self, path, line, sort=False, limit=None, total=None):
+        self.path = tuple(path.split('.'))
+        self.template = Template(line)
+        self.sort = sort
+        self.limit = limit
+        self.total = tuple(total.split('.')) if total else None
+
+
+class Section:
+    def __init__(self, title, requires, *parts):
+        self.title = Template(title)
+        self.requires = [tuple(path.split('.')) for path in requires]
+        self.parts = parts
+
+
+def _lookup(context, path):
+    value = context
+    for key in path:
+        value = value[key]
+    return value
+
+
+def _has(context, path):
+    try:
+        value = _lookup(context, path)
+    except (KeyError, IndexError, TypeError):
+        return False
+    return bool(value) or value == 0
+
+
+def _each_items(part, context):
+    entries = _lookup(context, part.path)
+    items = list(entries.items()) if isinstance(entries, dict) else list(enumerate(entries, 1))
+    if part.sort:
+        items.sort(key=lambda kv: kv[1], reverse=True)
+    numeric = all(isinstance(v, (int, float)) for _, v in items)
+    total = None
+    if numeric:
+        total = _lookup(context, part.total) if part.total else sum(v for _, v in items)
+    for key, value in items[:part.limit]:
+        item = {**context, 'key': key, 'value': value}
+        if numeric and total:
+            item['share'] = value / total
+        yield item
+
+
+# Report wording ------------------------------------------------------------
+
+SECTIONS = [
+    Section("Headline statistics", ['insights'],
+            Bullets("Citation importance: {insights.trust_concerns.citation_importance.mean_score:.2f}/5 "
+                    "({insights.trust_concerns.citation_importance.priority} priority, "
+                    "CI {insights.trust_concerns.citation_importance.ci_low:.2f}-"
+                    "{insights.trust_concerns.citation_importance.ci_high:.2f})",
+                    "Trust in AI output without verification: {insights.trust_concerns.blind_trust.mean_score:.2f}/5",
+                    "Currently use AI tools for legal work: {stats.ai_users} of {n_responses} ({stats.ai_user_share:.0%})",
+                    "Want Kenya-specific legal coverage: {stats.local_law} of {n_responses} ({stats.local_law_share:.0%})",
+                    "Willing (or maybe willing) to pay for 5-10 saved hours a week: {stats.willing} of {n_responses} "
+                    "({stats.willing_share:.0%})",
+                    "Accuracy / hallucination issues reported: {stats.accuracy_issues} mentions")),
+    Section("Respondents", ['insights.demographics'],
+            Paragraph("Roles:"),
+            Each('insights.demographics.role_distribution', "{key}: {value} ({share:.0%})", sort=True),
+            Paragraph("Locations:"),
+            Each('insights.demographics.location_distribution', "{key}: {value} ({share:.0%})", sort=True),
+            Paragraph("Institution types:"),
+            Each('insights.demographics.institution_types', "{key}: {value} ({share:.0%})", sort=True)),
+    Section("Pain points", ['insights.pain_points'],
+            Bullets("Excessive time on research and drafting: "
+                    "{insights.pain_points.excessive_time_research.mean_score:.2f}/5 "
+                    "({insights.pain_points.excessive_time_research.severity} severity)",
+                    "Access to up-to-date legal resources is a major challenge: "
+                    "{insights.pain_points.resource_access_challenge.mean_score:.2f}/5 "
+                    "({insights.pain_points.resource_access_challenge.severity} severity)"),
+            Paragraph("Organization uses productivity analytics:"),
+            Each('insights.pain_points.analytics_adoption', "{key}: {value} ({share:.0%})", sort=True)),
+    Section("AI adoption", ['insights.ai_adoption'],
+            Each('insights.ai_adoption.current_usage', "Uses AI tools - {key}: {value} ({share:.0%})", sort=True),
+            Bullets("AI time savings: {insights.ai_adoption.time_savings.mean_score:.2f}/5 "
+                    "({insights.ai_adoption.time_savings.impact} impact)",
+                    "Counsel AI rating: {insights.ai_adoption.counsel_ai_rating.mean_rating:.2f}/5 "
+                    "({insights.ai_adoption.counsel_ai_rating.count} ratings)"),
+            Paragraph("Tools in use:"),
+            Each('insights.ai_adoption.specific_tools', "{key}: {value}", sort=True, limit=8)),
+    Section("Willingness to pay and feature priorities", ['insights.payment'],
+            Each('insights.payment.willingness_to_pay', "{key}: {value} ({share:.0%})", sort=True),
+            Paragraph("Most requested features:"),
+            Each('insights.features.top_features', "{key}: {value} ({share:.0%})", sort=True,
+                 total='n_responses')),
+    Section("Sentiment of free-text answers", ['insights.sentiment'],
+            Each('insights.sentiment', "{key}: {value.overall_sentiment} (compound {value.avg_compound:+.3f})")),
+    Section("Reported issues", ['insights.key_issues'],
+            Each('insights.key_issues.counts', "{key}: {value} mentions", sort=True)),
+    Section("Themes (LDA topics)", ['insights.lda_topics'],
+            Each('insights.lda_topics', "{key}: {value}")),
+    Section("Strongest associations between questions", ['insights.associations.strongest'],
+            Paragraph("{insights.associations.n_significant} of {insights.associations.n_tests} question pairs "
+                      "are associated at a {insights.associations.fdr:.0%} false discovery rate."),
+            Each('insights.associations.strongest', "{value.a} x {value.b}: Cramér's V = {value.cramers_v:.2f} "
+                                                    "(q = {value.q_value:.3g}, n = {value.n})")),
+    Section("Rolling windows (as of {insights.time_windows.as_of})", ['insights.time_windows'],
+            Each('insights.time_windows.windows', "Last {key}: {value.n_responses} responses, "
+                                                  "{value.wtp_yes_share:.0%} willing to pay")),
+    Section("Argument 1: Critical need for citations and provenance (RAG)",
+            ['insights.trust_concerns.citation_importance'],
+            Bullets("Citation importance score: {insights.trust_concerns.citation_importance.mean_score:.2f}/5",
+                    "Do not blindly trust AI output: {insights.research_metrics.distrust_count} of {n_responses}"),
+            Paragraph("Legal professionals demand verifiable sources. Retrieval-augmented generation grounds "
+                      "answers in actual cases, statutes and documents and cites them, so practitioners can "
+                      "check every claim.")),
+    Section("Argument 2: Domain adaptation for the Kenyan legal context", ['insights.features'],
+            Bullets("Respondents asking for Kenya-specific coverage: {stats.local_law} of {n_responses} "
+                    "({stats.local_law_share:.0%})"),
+            Paragraph("Generic LLMs are trained mostly on US, UK and EU law; Kenyan statutes, case law and "
+                      "procedure are underrepresented. A model adapted to a Kenyan legal corpus uses local "
+                      "terminology, cites Kenyan authorities and follows local procedure.")),
+    Section("Argument 3: Accuracy and hallucination problems", ['insights.key_issues'],
+            Bullets("Accuracy / hallucination issues: {stats.accuracy_issues} mentions",
+                    "Citation / reference problems: {stats.citation_issues} mentions"),
+            Each('insights.key_issues.examples.Accuracy/Hallucinations', "Example: \"{value}\""),
+            Paragraph("Retrieving the relevant legal texts before generating anchors answers to real sources "
+                      "and reduces hallucinated authorities.")),
+    Section("Argument 4: Value proposition and market demand", ['insights.pain_points', 'insights.payment'],
+            Bullets("Time burden score: {insights.pain_points.excessive_time_research.mean_score:.2f}/5",
+                    "Would pay for 5-10 saved hours a week: {stats.willing} of {n_responses} "
+                    "({stats.willing_share:.0%})",
+                    "AI time savings score: {insights.ai_adoption.time_savings.mean_score:.2f}/5")),
+    Section("Argument 5: Democratizing access to legal knowledge", ['insights.pain_points'],
+            Bullets("Resource access challenge score: "
+                    "{insights.pain_points.resource_access_challenge.mean_score:.2f}/5",
+                    "Report major challenges accessing legal resources: "
+                    "{insights.research_metrics.access_challenge_count} of {n_responses}"),
+            Paragraph("A searchable knowledge base of Kenyan legal materials gives every practitioner, "
+                      "including small firms and rural lawyers, the access that expensive databases and "
+                      "physical libraries do not.")),
+]
+
+
+def render_context(snapshot):
+    """Template namespace: the snapshot plus a few counts and shares derived from its insights"""
+    insights = snapshot['insights']
+    n = snapshot.get('n_responses') or insights.get('research_metrics', {}).get('n_responses')
+    stats = {}
+    wtp = insights.get('payment', {}).get('willingness_to_pay')
+    if wtp is not None:
+        stats['willing'] = wtp.get('Yes', 0) + wtp.get('Maybe, depending on price', 0)
+    usage = insights.get('ai_adoption', {}).get('current_usage')
+    if usage is not None:
+        stats['ai_users'] = usage.get('Yes', 0)
+    features = insights.get('features', {}).get('top_features')
+    if features is not None:
+        stats['local_law'] = features.get(KENYA_LAW_FEATURE, 0)
+    issues = insights.get('key_issues', {}).get('counts')
+    if issues is not None:
+        stats['accuracy_issues'] = issues.get('Accuracy/Hallucinations', 0)
+        stats['citation_issues'] = issues.get('Citation/References', 0)
+    if n:
+        for count, share in (('willing', 'willing_share'), ('ai_users', 'ai_user_share'),
+                             ('local_law', 'local_law_share')):
+            if count in stats:
+                stats[share] = stats[count] / n
+    return {**snapshot, 'n_responses': n, 'stats': stats}
+
+
+def _section_blocks(section, context, escape):
+    """(kind, text or items) blocks of one section, dropping lines whose values are missing"""
+    blocks = []
+    for part in section.parts:
+        if isinstance(part, Paragraph):
+            lines = [part.template]
+            contexts = [context]
+        elif isinstance(part, Bullets):
+            lines = part.templates
+            contexts = [context] * len(lines)
+        else:
+            if not _has(context, part.path):
+                continue
+            contexts = list(_each_items(part, context))
+            lines = [part.template] * len(contexts)
+        rendered = []
+        for template, values in zip(lines, contexts):
+            try:
+                rendered.append(template.render(values, escape))
+            except (KeyError, IndexError, TypeError, ValueError):
+                continue
+        if rendered:
+            blocks.append(('p' if isinstance(part, Paragraph) else 'ul', rendered))
+    return blocks
+
+
+# Output formats ------------------------------------------------------------
+
+class TextFormat:
+    extension = 'txt'
+    escape = staticmethod(str)
+
+    def document(self, title, meta, sections):
+        rule = '=' * 80
+        return '\n'.join([rule, title.upper(), rule, meta, ''] + sections)
+
+    def section(self, title, blocks):
+        lines = ['', title.upper(), '-' * len(title)]
+        for kind, items in blocks:
+            lines.extend(items if kind == 'p' else [f'  - {item}' for item in items])
+        return '\n'.join(lines)
+
+
+class MarkdownFormat:
+    extension = 'md'
+
+    @staticmethod
+    def escape(text):
+        return text.replace('*', r'\*').replace('_', r'\_')
+
+    def document(self, title, meta, sections):
+        return '\n'.join([f'# {title}', '', f'_{meta}_', ''] + sections) + '\n'
+
+    def section(self, title, blocks):
+        lines = [f'## {title}', '']
+        for kind, items in blocks:
+            lines.extend(items if kind == 'p' else [f'- {item}' for item in items])
+            lines.append('')
+        return '\n'.join(lines)
+
+
+class HtmlFormat:
+    extension = 'html'
+    escape = staticmethod(html.escape)
+
+    def document(self, title, meta, sections):
+        return ('<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+                f'<title>{title}</title>\n'
+                '<style>body{font-family:sans-serif;max-width:52em;margin:2em auto;line-height:1.5}'
+                'h2{border-bottom:1px solid #ccc}.meta{color:#666}</style>\n</head>\n<body>\n'
+                f'<h1>{title}</h1>\n<p class="meta">{meta}</p>\n' + '\n'.join(sections) + '\n</body>\n</html>\n')
+
+    def section(self, title, blocks):
+        parts = [f'<section>\n<h2>{title}</h2>']
+        for kind, items in blocks:
+            if kind == 'p':
+                parts.extend(f'<p>{item}</p>' for item in items)
+            else:
+                parts.append('<ul>\n' + '\n'.join(f'<li>{item}</li>' for item in items) + '\n</ul>')
+        return '\n'.join(parts) + '\n</section>'
+
+
+FORMATS = {'text': TextFormat(), 'markdown': MarkdownFormat(), 'html': HtmlFormat()}
+
+TITLE = Template("Legal AI Survey - Domain-Adapted LLMs for African Legal Practice")
+META = Template("Dataset: {dataset} | Responses: {n_responses} | Recorded: {recorded_at}")
+
+
+def render(snapshot, fmt='markdown'):
+    """The report of an insights snapshot in one output format ('text', 'markdown' or 'html')"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}' (expected one of: {', '.join(FORMATS)})")
+    output = FORMATS[fmt]
+    context = render_context(snapshot)
+    sections = []
+    for section in SECTIONS:
+        if not all(_has(context, path) for path in section.requires):
+            continue
+        blocks = _section_blocks(section, context, output.escape)
+        if blocks:
+            try:
+                title = section.title.render(context, output.escape)
+            except (KeyError, TypeError):
+                continue
+            sections.append(output.section(title, blocks))
+    return output.document(TITLE.render(context, output.escape),
+                           META.render({k: '-' if v is None else v for k, v in context.items()}, output.escape),
+                           sections)
+
+
+def render_files(snapshot, stem, formats=tuple(FORMATS)):
+    """Write stem.txt / stem.md / stem.html for the requested formats; returns the paths"""
+    paths = []
+    for fmt in formats:
+        path = f'{stem}.{FORMATS[fmt].extension}'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render(snapshot, fmt))
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    """Render a stored insights snapshot without re-running the pipeline"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render stored survey insights as text, Markdown or HTML")
+    parser.add_argument('snapshot', help="Insights history SQLite file (--history) or JSON snapshot (--snapshot)")
+    parser.add_argument('--run-id', type=int, default=None, help="Run of the history store (default: latest)")
+    parser.add_argument('--format', choices=list(FORMATS) + ['all'], default='all')
+    parser.add_argument('--output', default='survey_insights_report',
+                        help="Output path without extension ('-' prints a single format)")
+    args = parser.parse_args(argv)
+
+    snapshot = load_snapshot(args.snapshot, args.run_id)
+    formats = list(FORMATS) if args.format == 'all' else [args.format]
+    if args.output == '-':
+        print(render(snapshot, formats[0]))
+        return []
+    paths = render_files(snapshot, args.output, formats)
+    print("\n".join(paths))
+    return paths
+
+
+if __name__ == "__main__":
+    main()
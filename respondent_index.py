@@ -0,0 +1,82 @@
+"""
+Nearest-Neighbour Index over Respondents
+Keeps the standardized segmentation features of every respondent as one compact
+float32 array (with the respondent ids, feature names and the imputation and scaling
+parameters needed to place a new respondent in the same space) and a KD-tree or
+ball tree over it, so look-alike respondents are found without a full scan.
+"""
+
+import numpy as np
+
+# Above this many features a ball tree prunes better than a KD-tree
+KD_TREE_MAX_DIMS = 15
+
+
+class RespondentIndex:
+    """Standardized feature vectors of all respondents with a spatial tree for k-NN queries"""
+
+    def __init__(self, features, ids, feature_names, fill_values, mean, scale, leaf_size=40):
+        self.features = np.ascontiguousarray(features, dtype=np.float32)
+        self.ids = np.asarray(ids)
+        self.feature_names = list(feature_names)
+        self.fill_values = dict(fill_values)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.leaf_size = leaf_size
+        self._positions = None
+        self._build_tree()
+
+    @classmethod
+    def from_features(cls, feature_data, scaler, fill_values, chunk_rows=None):
+        """Index a feature DataFrame (one row per respondent) with a fitted StandardScaler"""
+        from chunked_models import iter_chunks
+
+        values = feature_data.to_numpy()
+        scaled = np.empty(values.shape, dtype=np.float32)
+        for start, stop in iter_chunks(len(values), chunk_rows or len(values) or 1):
+            scaled[start:stop] = scaler.transform(values[start:stop])
+        return cls(scaled, feature_data.index.to_numpy(), feature_data.columns, fill_values,
+                   scaler.mean_, scaler.scale_)
+
+    def _build_tree(self):
+        from sklearn.neighbors import BallTree, KDTree
+
+        tree_cls = KDTree if self.features.shape[1] <= KD_TREE_MAX_DIMS else BallTree
+        self.tree = tree_cls(self.features, leaf_size=self.leaf_size) if len(self.features) else None
+
+    def __getstate__(self):
+        # Persist only the arrays; the tree is rebuilt on load
+        state = self.__dict__.copy()
+        state['tree'] = None
+        state['_positions'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_tree()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position(self, respondent_id):
+        """Row of a respondent id in the index (KeyError if it is not indexed)"""
+        if self._positions is None:
+            self._positions = {rid: pos for pos, rid in enumerate(self.ids.tolist())}
+        return self._positions[respondent_id]
+
+    def transform(self, raw):
+        """Standardize raw feature vectors (n x features, in feature_names order)"""
+        return ((np.atleast_2d(np.asarray(raw, dtype=np.float64)) - self.mean) / self.scale).astype(np.float32)
+
+    def query(self, vectors, k=5):
+        """(distances, respondent ids) of the k nearest indexed respondents of standardized vectors"""
+        k = min(k, len(self))
+        distances, positions = self.tree.query(np.atleast_2d(vectors), k=k)
+        return distances, self.ids[positions]
+
+    def neighbours(self, respondent_id, k=5):
+        """(distances, ids) of the k respondents most similar to an indexed respondent, excluding itself"""
+        pos = self.position(respondent_id)
+        distances, ids = self.query(self.features[pos:pos + 1], k + 1)
+        keep = ids[0] != respondent_id
+        return distances[0][keep][:k], ids[0][keep][:k]
@@ -0,0 +1,228 @@
+"""
+Single-Respondent Scoring
+Compiles the fitted models of a pipeline run (segmentation scaler and centroids,
+topic vectorizers, LDA / LSA components, issue classifier weights) into plain arrays
+and dicts once, so one new submission is given a segment, topic mix, issue categories
+and sentiment without DataFrame construction or per-call scikit-learn validation.
+"""
+
+import math
+
+import numpy as np
+
+from issue_classifier import keyword_categories
+from survey_schema import ISSUE_CATEGORIES, Q8_USES_AI_COL, Q17_WTP_COL, TEXT_RESPONSE_COLUMNS, WTP_CODES
+
+
+def _is_missing(value):
+    return value is None or value != value or value == ''
+
+
+class TextFeatures:
+    """
+    One-document transform of a fitted CountVectorizer / TfidfVectorizer / HashedTextVectorizer
+    as (column ids, values), without building a sparse matrix
+    """
+
+    def __init__(self, vectorizer):
+        from hashed_text import HashedTextVectorizer
+
+        self.analyzer = vectorizer.build_analyzer()
+        if isinstance(vectorizer, HashedTextVectorizer):
+            self.column = self._hashed_column
+            self.n_features = vectorizer.n_features
+            self._columns = {}
+            self.binary = self.sublinear_tf = False
+            self.idf = vectorizer.idf_
+            self.norm = 'l2' if self.idf is not None else None
+        else:
+            self.column = vectorizer.vocabulary_.get
+            self.binary = vectorizer.binary
+            self.sublinear_tf = getattr(vectorizer, 'sublinear_tf', False)
+            self.norm = getattr(vectorizer, 'norm', None)
+            self.idf = vectorizer.idf_ if getattr(vectorizer, 'use_idf', False) else None
+        if self.idf is not None:
+            self.idf = np.asarray(self.idf, dtype=np.float64)
+
+    def _hashed_column(self, term):
+        column = self._columns.get(term)
+        if column is None:
+            from hashed_text import hashed_column
+            column = self._columns[term] = hashed_column(term, self.n_features)
+        return column
+
+    def transform(self, text):
+        counts = {}
+        for term in self.analyzer(text):
+            column = self.column(term)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+        ids = np.fromiter(counts, dtype=np.intp, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self.binary:
+            values[:] = 1.0
+        if self.sublinear_tf:
+            values = np.log(values) + 1.0
+        if self.idf is not None:
+            values *= self.idf[ids]
+        if self.norm == 'l2' and len(values):
+            values /= math.sqrt(values @ values)
+        elif self.norm == 'l1' and len(values):
+            values /= np.abs(values).sum()
+        return ids, values
+
+
+def lda_topic_mix(ids, counts, exp_topic_word, doc_topic_prior, max_iter=100, tol=1e-3):
+    """
+    Normalized topic distribution of one document: the variational E-step of
+    LatentDirichletAllocation.transform, restricted to the document's own terms
+    """
+    from scipy.special import psi
+
+    n_topics = exp_topic_word.shape[0]
+    if len(ids) == 0:
+        return np.full(n_topics, 1.0 / n_topics)
+    eps = np.finfo(exp_topic_word.dtype).eps
+    topic_word = exp_topic_word[:, ids]
+    doc_topic = np.ones(n_topics)
+    exp_doc_topic = np.exp(psi(doc_topic) - psi(doc_topic.sum()))
+    for _ in range(max_iter):
+        last = doc_topic
+        norm_phi = exp_doc_topic @ topic_word + eps
+        doc_topic = exp_doc_topic * (topic_word @ (counts / norm_phi)) + doc_topic_prior
+        exp_doc_topic = np.exp(psi(doc_topic) - psi(doc_topic.sum()))
+        if np.abs(last - doc_topic).mean() < tol:
+            break
+    return doc_topic / doc_topic.sum()
+
+
+class ResponseScorer:
+    """Fast path over a pipeline's fitted models for scoring one response at a time"""
+
+    def __init__(self, models, respondent_index=None, sia=None, preprocess=str):
+        self.preprocess = preprocess
+        self.sia = sia
+
+        self.segmentation = None
+        if 'segmentation' in models and respondent_index is not None:
+            scaler, kmeans = models['segmentation']['scaler'], models['segmentation']['model']
+            self.feature_names = respondent_index.feature_names
+            self.fill_values = respondent_index.fill_values
+            self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+            self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+            self.centroids = np.asarray(kmeans.cluster_centers_, dtype=np.float64)
+            self.segmentation = True
+
+        self.lda = None
+        if 'lda' in models:
+            lda = models['lda']['model']
+            self.lda = (TextFeatures(models['lda']['vectorizer']), np.asarray(lda.exp_dirichlet_component_),
+                        lda.doc_topic_prior_, lda.max_doc_update_iter, lda.mean_change_tol)
+
+        self.lsa = None
+        if 'lsa' in models:
+            self.lsa = (TextFeatures(models['lsa']['vectorizer']), np.asarray(models['lsa']['model'].components_))
+
+        self.classifier = None
+        if 'issue_classifier' in models:
+            classifier = models['issue_classifier']['model']
+            self.classifier = (TextFeatures(classifier.vectorizer), np.asarray(classifier.coef_),
+                               np.asarray(classifier.intercept_), classifier.categories,
+                               math.log(classifier.threshold / (1 - classifier.threshold)))
+
+    def features(self, row):
+        """Raw segmentation feature vector of a row, encoded and imputed as in user_segmentation"""
+        raw = np.empty(len(self.feature_names))
+        for i, name in enumerate(self.feature_names):
+            if name == 'uses_ai':
+                raw[i] = 1.0 if row.get(Q8_USES_AI_COL) == 'Yes' else 0.0
+            elif name == 'wtp':
+                raw[i] = WTP_CODES.get(row.get(Q17_WTP_COL), 1)
+            else:
+                value = row.get(name)
+                try:
+                    raw[i] = self.fill_values[name] if _is_missing(value) else float(value)
+                except (TypeError, ValueError):
+                    raw[i] = self.fill_values[name]
+        return raw
+
+    def segment(self, row):
+        """Cluster id of a row: its nearest KMeans centroid in the standardized space"""
+        scaled = (self.features(row) - self.mean) / self.scale
+        return int(((self.centroids - scaled) ** 2).sum(axis=1).argmin())
+
+    def issues(self, text):
+        """Issue categories of one cleaned response (classifier if one was trained, else keyword rules)"""
+        if self.classifier is None:
+            return keyword_categories(text, ISSUE_CATEGORIES)
+        features, coef, intercept, categories, cutoff = self.classifier
+        ids, values = features.transform(text)
+        scores = values @ coef[ids] + intercept
+        return [categories[j] for j in np.flatnonzero(scores > cutoff)]
+
+    def score(self, row):
+        """
+        Segment, topic mix, issue categories and sentiment of one respondent. row maps
+        survey column names to answers (a dict or a pandas Series).
+        """
+        result = {}
+        if self.segmentation:
+            result['cluster'] = self.segment(row)
+
+        texts = {label: self.preprocess(row.get(col)) for col, label in TEXT_RESPONSE_COLUMNS.items()}
+        # The topic models were fitted with every answer as its own document, so each
+        # answer is projected separately and the respondent's mix is their average
+        answers = [text for text in texts.values() if text]
+        if answers and self.lda is not None:
+            features, exp_topic_word, prior, max_iter, tol = self.lda
+            mixes = [lda_topic_mix(*features.transform(text), exp_topic_word, prior, max_iter, tol)
+                     for text in answers]
+            result['lda_topics'] = np.mean(mixes, axis=0).tolist()
+        if answers and self.lsa is not None:
+            features, components = self.lsa
+            mixes = [components[:, ids] @ values for ids, values in map(features.transform, answers)]
+            result['lsa_topics'] = np.mean(mixes, axis=0).tolist()
+
+        result['issues'] = self.issues(texts['issues_faced']) if texts['issues_faced'] else []
+        if self.sia is not None:
+            result['sentiment'] = {label: self.sia.polarity_scores(text)['compound']
+                                   for label, text in texts.items() if text}
+        return result
+
+
+def update_running_aggregates(insights, result):
+    """
+    Fold one scored response into the insights in place: segment sizes and issue counts
+    of the batch run are incremented, and 'live_scoring' keeps running means of the
+    scored responses' topic mixes (over those with free text) and sentiment.
+    """
+    live = insights.setdefault('live_scoring', {'n_scored': 0, 'n_with_text': 0, 'segments': {}, 'issues': {},
+                                                'avg_compound': {}, 'sentiment_counts': {}})
+    live['n_scored'] += 1
+    if 'lda_topics' in result or 'lsa_topics' in result:
+        live['n_with_text'] += 1
+
+    if 'cluster' in result:
+        cluster = result['cluster']
+        live['segments'][cluster] = live['segments'].get(cluster, 0) + 1
+        sizes = insights.get('user_segments', {}).get('cluster_sizes')
+        if sizes is not None:
+            sizes[cluster] = sizes.get(cluster, 0) + 1
+
+    counts = insights.get('key_issues', {}).get('counts')
+    for category in result['issues']:
+        live['issues'][category] = live['issues'].get(category, 0) + 1
+        if counts is not None:
+            counts[category] = counts.get(category, 0) + 1
+
+    for key in ('lda_topics', 'lsa_topics'):
+        if key in result:
+            mix = np.asarray(result[key])
+            mean = np.asarray(live.get(key, np.zeros_like(mix)))
+            live[key] = (mean + (mix - mean) / live['n_with_text']).tolist()
+
+    for label, compound in result.get('sentiment', {}).items():
+        n = live['sentiment_counts'][label] = live['sentiment_counts'].get(label, 0) + 1
+        mean = live['avg_compound'].get(label, 0.0)
+        live['avg_compound'][label] = mean + (compound - mean) / n
+    return live
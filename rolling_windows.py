@@ -0,0 +1,162 @@
+"""
+Rolling Time-Window Analytics
+Responses are bucketed by the calendar day of their submission timestamp into one
+mergeable SurveyAccumulator per day (Likert histograms, answer counts, option
+tallies). Rolling 7 / 30 / 90-day views merge the buckets inside each window, and a
+day whose responses did not change keeps its bucket, so adding a day of data
+rebuilds one bucket instead of rescanning every row.
+"""
+
+import hashlib
+import re
+
+import numpy as np
+import pandas as pd
+
+from survey_schema import LIKERT_COLUMNS, MULTI_SELECT_COLUMNS, Q17_WTP_COL, Q18_FEATURES_COL, TIMESTAMP_COL
+
+DEFAULT_WINDOWS = (7, 30, 90)
+
+# Columns the windowed metrics are computed from
+WINDOW_COLUMNS = list(LIKERT_COLUMNS) + [Q17_WTP_COL, Q18_FEATURES_COL]
+
+_TIMEZONE_SUFFIX = re.compile(r'\s*GMT[+-]?\d*(:\d\d)?\s*$')
+
+
+def submission_days(timestamps):
+    """
+    Calendar day of every Google Forms timestamp ('2025/09/01 7:00:00 AM GMT+3'), in the
+    form's own time zone; unparseable or missing timestamps become NaT
+    """
+    local = timestamps.astype('string').str.replace(_TIMEZONE_SUFFIX, '', regex=True)
+    parsed = pd.to_datetime(local, format='%Y/%m/%d %I:%M:%S %p', errors='coerce')
+    retry = parsed.isna() & local.notna()
+    if retry.any():
+        # Exports re-saved by a spreadsheet use other layouts
+        parsed[retry] = pd.to_datetime(local[retry], format='mixed', errors='coerce')
+    return parsed.dt.normalize()
+
+
+def _grouped_counts(days, values):
+    """{day: {value: count}} of a value column, values in order of first appearance per day"""
+    pairs = pd.DataFrame({'day': days, 'value': values}).dropna()
+    nested = {}
+    for (day, value), count in pairs.groupby(['day', 'value'], sort=False).size().items():
+        nested.setdefault(day, {})[value] = int(count)
+    return nested
+
+
+def day_accumulators(df, days, top_k=None):
+    """
+    One SurveyAccumulator (without sentiment) per day for the rows of df, days holding
+    each row's day. Built from grouped counts rather than day-by-day row scans; the
+    state equals SurveyAccumulator.from_frame of each day's rows.
+    """
+    from survey_shards import COUNTED_COLUMNS, SurveyAccumulator
+
+    days = pd.Series(np.asarray(days))
+    frame = df.reset_index(drop=True)
+    accumulators = {}
+    for day, n_rows in days.value_counts(sort=False).items():
+        acc = accumulators[day] = SurveyAccumulator(top_k)
+        acc.n_rows = int(n_rows)
+        acc.columns = set(frame.columns)
+
+    for col in COUNTED_COLUMNS:
+        if col in frame.columns:
+            for day, counts in _grouped_counts(days, frame[col]).items():
+                accumulators[day].counts[col].update(counts)
+    for col in LIKERT_COLUMNS:
+        if col in frame.columns:
+            for day, counts in _grouped_counts(days, frame[col].astype(float)).items():
+                accumulators[day].likert[col].update(counts)
+    for col in MULTI_SELECT_COLUMNS:
+        if col in frame.columns:
+            answers = frame[col].dropna().astype(str).str.split(',').explode().str.strip()
+            for day, counts in _grouped_counts(days[answers.index].to_numpy(), answers.to_numpy()).items():
+                accumulators[day].tallies[col].update(counts)
+    return accumulators
+
+
+class DailyBuckets:
+    """One SurveyAccumulator per submission day, with the content hash it was built from"""
+
+    def __init__(self, top_k=None):
+        self.top_k = top_k
+        self.buckets = {}       # day -> SurveyAccumulator
+        self.hashes = {}        # day -> hash of the rows the bucket holds
+        self.undated = 0        # rows without a usable timestamp
+
+    @staticmethod
+    def _days(df):
+        """(day of every row, positionally indexed; number of undated rows)"""
+        days = submission_days(df[TIMESTAMP_COL]).reset_index(drop=True)
+        return days, int(days.isna().sum())
+
+    def sync(self, df):
+        """
+        Make the buckets match a full export: only days whose rows were added, removed
+        or edited are re-accumulated. Returns the rebuilt days.
+        """
+        columns = [col for col in WINDOW_COLUMNS if col in df.columns]
+        row_hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+        days, self.undated = self._days(df)
+        positions = pd.Series(np.arange(len(df))).groupby(days).indices
+        digests = {day: hashlib.sha1(row_hashes[rows].tobytes()).hexdigest() for day, rows in positions.items()}
+        rebuilt = sorted(day for day, digest in digests.items() if self.hashes.get(day) != digest)
+        if rebuilt:
+            rows = np.sort(np.concatenate([positions[day] for day in rebuilt]))
+            self.buckets.update(day_accumulators(df[columns].iloc[rows], days.iloc[rows], self.top_k))
+            self.hashes.update((day, digests[day]) for day in rebuilt)
+        for day in set(self.buckets) - set(positions):
+            del self.buckets[day]
+            self.hashes.pop(day, None)      # add() already dropped it
+        return rebuilt
+
+    def add(self, df):
+        """Fold new rows (e.g. one more day of submissions) into their day buckets"""
+        columns = [col for col in WINDOW_COLUMNS if col in df.columns]
+        days, undated = self._days(df)
+        for day, partial in day_accumulators(df[columns], days, self.top_k).items():
+            self.buckets[day] = self.buckets[day].merge(partial) if day in self.buckets else partial
+            self.hashes.pop(day, None)      # no longer the hash of a whole export's day
+        self.undated += undated
+        return self
+
+    @property
+    def last_day(self):
+        return max(self.buckets) if self.buckets else None
+
+    def window(self, days, end=None):
+        """Merged accumulator of the days in (end - days, end]; end defaults to the last day"""
+        from survey_shards import SurveyAccumulator
+
+        end = self.last_day if end is None else pd.Timestamp(end).normalize()
+        merged = SurveyAccumulator(self.top_k)
+        if end is None:
+            return merged
+        start = end - pd.Timedelta(days=days)
+        for day in sorted(self.buckets):
+            if start < day <= end:
+                merged.merge(self.buckets[day])
+        return merged
+
+    def rolling(self, windows=DEFAULT_WINDOWS, end=None):
+        """{'7d': summary, '30d': ..., ...} for the windows ending at end"""
+        return {f'{days}d': window_summary(self.window(days, end)) for days in windows}
+
+
+def window_summary(acc):
+    """Responses, Likert means, willingness-to-pay answers and feature tallies of one window"""
+    summary = {'n_responses': acc.n_rows}
+    summary['likert_means'] = {label: acc.likert_mean(col) for col, label in LIKERT_COLUMNS.items()
+                               if col in acc.columns and acc.likert[col]}
+    if Q17_WTP_COL in acc.columns:
+        wtp = acc.value_counts(Q17_WTP_COL)
+        answered = sum(wtp.values())
+        summary['willingness_to_pay'] = wtp
+        summary['wtp_yes_share'] = wtp.get('Yes', 0) / answered if answered else float('nan')
+    if Q18_FEATURES_COL in acc.columns:
+        summary['top_features'] = dict(sorted(dict(acc.tallies[Q18_FEATURES_COL]).items(),
+                                              key=lambda kv: kv[1], reverse=True))
+    return summary
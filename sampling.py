@@ -0,0 +1,113 @@
+"""
+Stratified Reservoir Sampling for Preview Runs
+Draws a proportionally allocated stratified sample (by role, location and firm type)
+from a streamed export in one pass, and estimates the error bound of any mean or share
+computed on it with the stratified-sampling variance formula.
+"""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+MISSING = '(missing)'
+
+
+def stratum_labels(df, strata_columns):
+    """One 'a | b | c' stratum label per row (missing answers form their own stratum)"""
+    present = [col for col in strata_columns if col in df.columns]
+    if not present:
+        return pd.Series('all', index=df.index)
+    parts = df[present].astype(object).where(df[present].notna(), MISSING).astype(str)
+    return parts.agg(' | '.join, axis=1)
+
+
+class StratifiedReservoir:
+    """
+    Priority-sampling reservoir per stratum: every row gets a uniform random key and
+    each stratum keeps the `capacity` rows with the smallest keys, which is a uniform
+    sample without replacement however the export is chunked.
+    """
+
+    def __init__(self, strata_columns, capacity, seed=42):
+        self.strata_columns = list(strata_columns)
+        self.capacity = capacity
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.population = Counter()
+        self.rows = None
+        self.n_seen = 0
+
+    def add(self, chunk):
+        """Offer one chunk of rows to the reservoirs"""
+        chunk = chunk.copy()
+        chunk.index = pd.RangeIndex(self.n_seen, self.n_seen + len(chunk))
+        self.n_seen += len(chunk)
+        chunk['_stratum'] = stratum_labels(chunk, self.strata_columns)
+        chunk['_key'] = self.rng.random(len(chunk))
+        self.population.update(chunk['_stratum'].value_counts().to_dict())
+
+        combined = chunk if self.rows is None else pd.concat([self.rows, chunk])
+        self.rows = combined.sort_values('_key').groupby('_stratum', sort=False).head(self.capacity)
+        return self
+
+    def allocation(self, size):
+        """
+        Rows per stratum, proportional to stratum size, adding up to exactly min(size, rows
+        seen). Every stratum gets the whole part of its quota; the leftover rows go to strata
+        drawn systematically with probability equal to their fractional part, so each
+        stratum's expected allocation is exactly its quota even when most quotas are below
+        one row (many small strata). The draw is seeded, so repeated calls agree.
+        """
+        total = sum(self.population.values())
+        size = min(size, total)
+        strata = sorted(self.population)
+        quotas = np.array([size * self.population[stratum] / total for stratum in strata])
+        allocation = np.floor(quotas).astype(int)
+        remaining = size - int(allocation.sum())
+        if remaining > 0:
+            rng = np.random.default_rng(self.seed)
+            order = rng.permutation(len(strata))
+            bounds = np.cumsum((quotas - allocation)[order])
+            picked = np.searchsorted(bounds, rng.random() + np.arange(remaining), side='right')
+            allocation[order[np.minimum(picked, len(order) - 1)]] += 1
+        return dict(zip(strata, allocation.tolist()))
+
+    def sample(self, size):
+        """Proportionally allocated sample in export order, with its '_stratum' column"""
+        if self.rows is None:
+            return pd.DataFrame()
+        allocation = self.allocation(size)
+        ranked = self.rows.sort_values('_key')
+        rank = ranked.groupby('_stratum', sort=False).cumcount()
+        keep = rank < ranked['_stratum'].map(allocation)
+        return ranked[keep].drop(columns='_key').sort_index()
+
+
+def stratified_estimate(values, strata, population, confidence=0.95):
+    """
+    Stratified estimate of a mean (or a share, for 0/1 values) with its error bound.
+    `values` may contain NaN for non-response; `population` maps stratum -> rows in the
+    full export. Returns {'estimate', 'margin', 'n'} where the margin is the normal
+    half-width at the given confidence, with a finite-population correction per stratum.
+    """
+    from scipy import stats
+
+    frame = pd.DataFrame({'value': pd.to_numeric(values, errors='coerce'), 'stratum': strata}).dropna()
+    n = len(frame)
+    if n == 0:
+        return {'estimate': float('nan'), 'margin': float('nan'), 'n': 0}
+
+    grouped = frame.groupby('stratum')['value']
+    summary = pd.DataFrame({'n': grouped.size(), 'mean': grouped.mean(), 'var': grouped.var(ddof=1)})
+    # Strata with a single answer have no variance of their own: borrow the pooled one
+    pooled_var = frame['value'].var(ddof=1) if n > 1 else 0.0
+    summary['var'] = summary['var'].fillna(pooled_var)
+    summary['N'] = [max(population.get(stratum, 0), size) for stratum, size in summary['n'].items()]
+    weights = summary['N'] / summary['N'].sum()
+
+    estimate = float((weights * summary['mean']).sum())
+    fpc = 1 - summary['n'] / summary['N']
+    variance = float((weights ** 2 * fpc * summary['var'] / summary['n']).sum())
+    margin = float(stats.norm.ppf(0.5 + confidence / 2) * np.sqrt(variance))
+    return {'estimate': estimate, 'margin': margin, 'n': n}
@@ -0,0 +1,158 @@
+"""
+Segment Cube for Per-Role / Location / Firm Breakdowns
+Counts, sums and sums of squares for every Likert item, plus option counts for every
+single- and multi-choice question, aggregated in one grouped pass and rolled up to
+each demographic dimension and each pair of dimensions.
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from survey_schema import (
+    DEMOGRAPHIC_COLUMNS, LIKERT_COLUMNS, CATEGORICAL_COLUMNS, MULTI_SELECT_COLUMNS,
+    split_multi_select
+)
+
+MISSING = '(missing)'
+
+
+class SegmentCube:
+    """
+    Precomputed aggregation cube keyed by demographic segment.
+    Every segment lookup (mean, share, variance) is a dictionary access plus a few
+    arithmetic operations on already-summed columns.
+    """
+
+    def __init__(self, dimensions, features, cells):
+        self.dimensions = dimensions      # short names, e.g. ['role', 'location', 'firm_type']
+        self.features = features          # feature key -> column position in each cell vector
+        self.cells = cells                # dims tuple -> {values tuple -> summed vector}
+
+    @classmethod
+    def from_frame(cls, df, max_order=2):
+        """Build the cube from a survey DataFrame in a single grouped pass"""
+        dim_cols = [col for col in DEMOGRAPHIC_COLUMNS if col in df.columns]
+        dimensions = [DEMOGRAPHIC_COLUMNS[col] for col in dim_cols]
+
+        blocks = {'respondents': pd.Series(1.0, index=df.index)}
+        for col, label in LIKERT_COLUMNS.items():
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors='coerce')
+                answered = values.notna()
+                blocks[('likert', label, 'n')] = answered.astype(float)
+                blocks[('likert', label, 'sum')] = values.fillna(0.0)
+                blocks[('likert', label, 'sumsq')] = values.fillna(0.0) ** 2
+        for col, label in CATEGORICAL_COLUMNS.items():
+            if col in df.columns:
+                for option in df[col].dropna().unique():
+                    blocks[('option', label, str(option))] = (df[col] == option).astype(float)
+        for col, label in MULTI_SELECT_COLUMNS.items():
+            if col in df.columns:
+                indicators = df[col].apply(split_multi_select).explode().dropna()
+                if indicators.empty:
+                    continue
+                indicators = pd.crosstab(indicators.index, indicators).clip(upper=1)
+                indicators = indicators.reindex(df.index, fill_value=0)
+                for option in indicators.columns:
+                    blocks[('option', label, str(option))] = indicators[option].astype(float)
+
+        features = {key: pos for pos, key in enumerate(blocks)}
+        matrix = pd.DataFrame(np.column_stack(list(blocks.values())), index=df.index)
+        keys = df[dim_cols].astype(object).where(df[dim_cols].notna(), MISSING).astype(str)
+
+        # The single grouped pass: finest-grain cells over all dimensions at once
+        if dim_cols:
+            finest = matrix.groupby([keys[col] for col in dim_cols], sort=False).sum()
+            finest.index.names = dimensions
+        else:
+            finest = matrix.sum().to_frame().T
+
+        # Roll the finest cells up to the grand total, each dimension and each pair
+        cells = {(): {(): finest.to_numpy().sum(axis=0)}}
+        for order in range(1, min(max_order, len(dimensions)) + 1):
+            for dims in combinations(dimensions, order):
+                rolled = finest.groupby(level=list(dims), sort=False).sum()
+                cells[dims] = {
+                    (key if isinstance(key, tuple) else (key,)): row
+                    for key, row in zip(rolled.index, rolled.to_numpy())
+                }
+        return cls(dimensions, features, cells)
+
+    def _cell(self, filters):
+        unknown = set(filters) - set(self.dimensions)
+        if unknown:
+            raise KeyError(f"Unknown segment dimension(s): {', '.join(sorted(unknown))}")
+        dims = tuple(d for d in self.dimensions if d in filters)
+        if dims not in self.cells:
+            raise KeyError(f"Segments over {dims} are not precomputed")
+        return self.cells[dims].get(tuple(str(filters[d]) for d in dims))
+
+    def _value(self, cell, key):
+        pos = self.features.get(key)
+        if cell is None or pos is None:
+            return 0.0
+        return float(cell[pos])
+
+    def segments(self, dimension):
+        """Values observed for one demographic dimension"""
+        return [key[0] for key in self.cells.get((dimension,), {})]
+
+    def count(self, **filters):
+        """Respondents in a segment"""
+        return int(self._value(self._cell(filters), 'respondents'))
+
+    def n(self, item, **filters):
+        """Respondents in a segment who answered a Likert item"""
+        return int(self._value(self._cell(filters), ('likert', item, 'n')))
+
+    def mean(self, item, **filters):
+        """Mean of a Likert item within a segment (NaN if nobody answered)"""
+        cell = self._cell(filters)
+        n = self._value(cell, ('likert', item, 'n'))
+        return self._value(cell, ('likert', item, 'sum')) / n if n else float('nan')
+
+    def variance(self, item, ddof=1, **filters):
+        """Variance of a Likert item within a segment"""
+        cell = self._cell(filters)
+        n = self._value(cell, ('likert', item, 'n'))
+        if n <= ddof:
+            return float('nan')
+        total = self._value(cell, ('likert', item, 'sum'))
+        sumsq = self._value(cell, ('likert', item, 'sumsq'))
+        return max(sumsq - total * total / n, 0.0) / (n - ddof)
+
+    def option_count(self, question, option, **filters):
+        """Respondents in a segment who chose an option"""
+        return int(self._value(self._cell(filters), ('option', question, str(option))))
+
+    def share(self, question, option, **filters):
+        """Share of a segment's respondents who chose an option"""
+        cell = self._cell(filters)
+        respondents = self._value(cell, 'respondents')
+        return self._value(cell, ('option', question, str(option))) / respondents if respondents else float('nan')
+
+    def option_counts(self, question, **filters):
+        """All option counts of a single- or multi-choice question within a segment"""
+        cell = self._cell(filters)
+        return {
+            key[2]: int(self._value(cell, key))
+            for key in self.features
+            if isinstance(key, tuple) and key[0] == 'option' and key[1] == question and self._value(cell, key) > 0
+        }
+
+    def likert_items(self):
+        """Likert items held in the cube"""
+        return [key[1] for key in self.features if isinstance(key, tuple) and key[0] == 'likert' and key[2] == 'n']
+
+    def breakdown(self, dimension):
+        """Respondent counts and Likert means for every value of one dimension"""
+        table = {}
+        for segment in self.segments(dimension):
+            filters = {dimension: segment}
+            row = {'n': self.count(**filters)}
+            for item in self.likert_items():
+                row[item] = self.mean(item, **filters)
+            table[segment] = row
+        return table
@@ -0,0 +1,125 @@
+"""
+Sentence-Level Sentiment
+Splits free-text answers into sentences (and contrastive clauses such as "fast, but
+citations are wrong") once, keeps the segmentation as a flat sentence-id array with
+per-response offsets, scores every distinct sentence once and reduces the scores back
+to responses and issue categories with array operations.
+"""
+
+import re
+
+import numpy as np
+
+from issue_classifier import keyword_categories
+from survey_schema import ISSUE_CATEGORIES
+
+SCORE_FIELDS = ('compound', 'pos', 'neg', 'neu')
+
+_FALLBACK_SENTENCES = re.compile(r'(?<=[.!?])\s+')
+_CONTRAST = re.compile(r',?\s+\b(?:but|however|although|though|whereas|yet)\b\s+')
+
+_SPLITTER = None
+
+
+def sentence_splitter():
+    """
+    NLTK's Punkt sentence tokenizer if its model is available, else a punctuation regex.
+    Resolved once per process, so a missing model is downloaded (or given up on) only once.
+    """
+    global _SPLITTER
+    if _SPLITTER is None:
+        from legal_survey_nlp_pipeline import ensure_nltk_data
+        try:
+            from nltk.tokenize import sent_tokenize
+            ensure_nltk_data('tokenizers/punkt_tab', 'punkt_tab')
+            sent_tokenize("Probe one. Probe two.")
+            _SPLITTER = sent_tokenize
+        except (ImportError, LookupError):
+            _SPLITTER = _FALLBACK_SENTENCES.split
+    return _SPLITTER
+
+
+def split_response(text, split):
+    """Sentences of one cleaned response, with contrastive clauses split apart"""
+    clauses = []
+    for sentence in split(text):
+        clauses.extend(part.strip(' ,.') for part in _CONTRAST.split(sentence))
+    return [clause for clause in clauses if re.search(r'\w', clause)]
+
+
+class SentenceIndex:
+    """
+    Segmentation of a list of responses: the sentences of response i are
+    sentences[sentence_ids[offsets[i]:offsets[i + 1]]], each distinct sentence stored once.
+    """
+
+    def __init__(self, texts, split=None):
+        split = split or sentence_splitter()
+        ids = {}
+        memo = {}
+        sentence_ids = []
+        lengths = np.zeros(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            parts = memo.get(text)
+            if parts is None:
+                parts = memo[text] = [ids.setdefault(s, len(ids)) for s in split_response(text, split)]
+            sentence_ids.extend(parts)
+            lengths[i] = len(parts)
+        self.sentences = list(ids)
+        self.sentence_ids = np.asarray(sentence_ids, dtype=np.int32)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def occurrences(self):
+        """How many times each distinct sentence occurs across the responses"""
+        return np.bincount(self.sentence_ids, minlength=len(self.sentences))
+
+    def reduce(self, sentence_values, ufunc=np.add):
+        """
+        Reduce per-sentence values (n_sentences, ...) to per-response values with
+        ufunc.reduceat; responses without sentences get NaN.
+        """
+        values = np.asarray(sentence_values, dtype=float)[self.sentence_ids]
+        lengths = np.diff(self.offsets)
+        out = np.full((len(lengths),) + values.shape[1:], np.nan)
+        nonempty = lengths > 0
+        if nonempty.any():
+            # Empty responses have zero width, so consecutive non-empty starts bound each segment
+            out[nonempty] = ufunc.reduceat(values, self.offsets[:-1][nonempty], axis=0)
+        return out
+
+    def mean(self, sentence_values):
+        """Per-response mean of per-sentence values"""
+        lengths = np.diff(self.offsets).astype(float)
+        totals = self.reduce(sentence_values)
+        return totals / lengths.reshape((-1,) + (1,) * (totals.ndim - 1))
+
+
+def score_sentences(sentences, sia):
+    """(n_sentences x 4) array of VADER compound / pos / neg / neu scores"""
+    scores = np.empty((len(sentences), len(SCORE_FIELDS)))
+    for i, sentence in enumerate(sentences):
+        result = sia.polarity_scores(sentence)
+        scores[i] = [result[field] for field in SCORE_FIELDS]
+    return scores
+
+
+def category_sentiment(index, scores, categories=ISSUE_CATEGORIES):
+    """
+    Mean compound score of the sentences that mention each issue category, weighting
+    each distinct sentence by how often it occurs. Returns {category: {...}}.
+    """
+    names = list(categories)
+    mask = np.zeros((len(index.sentences), len(names)))
+    for i, sentence in enumerate(index.sentences):
+        for category in keyword_categories(sentence, categories):
+            mask[i, names.index(category)] = 1.0
+    weighted = mask * index.occurrences()[:, None]
+    counts = weighted.sum(axis=0)
+    compound = weighted.T @ scores[:, 0]
+    return {
+        name: {'avg_compound': float(compound[j] / counts[j]), 'sentences': int(counts[j])}
+        for j, name in enumerate(names) if counts[j]
+    }
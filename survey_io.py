@@ -0,0 +1,217 @@
+"""
+Survey Export Reader with Streaming Decompression
+Reads plain, gzip, bzip2, xz, zstd and zip exports straight into pandas: the
+compression is detected from the file's magic bytes and decompressed as a stream,
+so the raw CSV never touches disk. Multi-member archives (concatenated gzip /
+bzip2 / xz / zstd frames, or several CSV files in one zip) are read as one export:
+a compressed member that starts with the export's header line is parsed as its own
+CSV, any other member continues the previous one (a CSV split across members).
+"""
+
+import bz2
+import contextlib
+import io
+import lzma
+import zipfile
+import zlib
+from pathlib import Path
+
+import pandas as pd
+
+_MAGIC = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+    (b'PK\x03\x04', 'zip'),
+)
+
+COMPRESSION_SUFFIXES = ('.gz', '.bz2', '.xz', '.zst', '.zip')
+
+# Compressed bytes read from disk per decompression step
+_READ_SIZE = 1 << 16
+
+# Glob patterns of the exports discovered in a drop directory
+EXPORT_PATTERNS = ('*.csv',) + tuple(f'*.csv{suffix}' for suffix in COMPRESSION_SUFFIXES) + ('*.zip',)
+
+
+def detect_compression(path):
+    """'gzip', 'bz2', 'xz', 'zstd', 'zip' or None (plain text), from the file's magic bytes"""
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    for magic, name in _MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def export_stem(path):
+    """File name without its compression and .csv suffixes, e.g. 'wave1.csv.gz' -> 'wave1'"""
+    name = Path(path).name
+    for suffix in COMPRESSION_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    return name[:-len('.csv')] if name.endswith('.csv') else Path(name).stem
+
+
+def _zstd_decompressor():
+    """One-frame zstd decompressor (stdlib on Python 3.14+, else the zstandard package)"""
+    try:
+        from compression import zstd
+        return zstd.ZstdDecompressor()
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Reading .zst exports requires Python 3.14+ or the 'zstandard' package") from None
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+_DECOMPRESSORS = {
+    'gzip': lambda: zlib.decompressobj(16 + zlib.MAX_WBITS),
+    'bz2': bz2.BZ2Decompressor,
+    'xz': lzma.LZMADecompressor,
+    'zstd': _zstd_decompressor,
+}
+
+
+def _member_chunks(raw, new_decompressor):
+    """
+    Decompressed chunks of a file of concatenated members as (starts_member, bytes),
+    a fresh decompressor taking over from each member's unused trailing bytes
+    """
+    decompressor, data, first = None, b'', False
+    while True:
+        if not data:
+            data = raw.read(_READ_SIZE)
+            if not data:
+                break
+        if decompressor is None or decompressor.eof:
+            data = data.lstrip(b'\x00')    # padding after a member
+            if not data:
+                continue
+            decompressor, first = new_decompressor(), True
+        chunk = decompressor.decompress(data)
+        data = decompressor.unused_data if decompressor.eof else b''
+        if chunk:
+            yield first, chunk
+            first = False
+    if decompressor is not None and not decompressor.eof:
+        raise EOFError(f"Compressed export ended before the end of its last member: {raw.name}")
+
+
+# Marker between the exports of one multi-member file
+_NEW_EXPORT = object()
+
+
+def _export_chunks(member_chunks):
+    """
+    Byte chunks of the whole file with _NEW_EXPORT before every member that starts with
+    the first member's header line, i.e. a full export of its own
+    """
+    header, head, probe = None, b'', None
+    for starts_member, chunk in member_chunks:
+        if header is None:
+            head += chunk
+            if b'\n' in head:
+                header = head[:head.index(b'\n') + 1]
+                yield head
+            continue
+        if starts_member:
+            if probe:
+                yield probe     # a member shorter than the header line
+            probe = b''
+        if probe is not None:
+            probe += chunk
+            if len(probe) < len(header):
+                continue
+            if probe.startswith(header):
+                yield _NEW_EXPORT
+            chunk, probe = probe, None
+        yield chunk
+    if header is None and head:
+        yield head
+    if probe:
+        yield probe
+
+
+class _ExportStream(io.RawIOBase):
+    """Readable stream over the chunks of one export, ending at the next _NEW_EXPORT marker"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._chunk = memoryview(b'')
+        self._done = False
+        self.ended = False      # the source is exhausted (no further export follows)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not len(self._chunk):
+            if self._done:
+                return 0
+            chunk = next(self._chunks, None)
+            if chunk is None or chunk is _NEW_EXPORT:
+                self._done = True
+                self.ended = chunk is None
+                return 0
+            self._chunk = memoryview(chunk)
+        n = min(len(buffer), len(self._chunk))
+        buffer[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+
+def _exports(raw, compression):
+    """Decompressing streams, one per export in a file of concatenated members, read in order"""
+    chunks = _export_chunks(_member_chunks(raw, _DECOMPRESSORS[compression]))
+    while True:
+        stream = _ExportStream(chunks)
+        yield io.BufferedReader(stream)
+        while stream.read(_READ_SIZE):
+            pass    # the caller stopped early: skip to the next export
+        if stream.ended:
+            return
+
+
+@contextlib.contextmanager
+def open_export_members(path):
+    """
+    Yield the decompressing binary streams of the export's CSVs: one per zip member, or
+    one per export in concatenated gzip / bz2 / xz / zstd members. Read them in order.
+    """
+    compression = detect_compression(path)
+    with contextlib.ExitStack() as stack:
+        if compression == 'zip':
+            archive = stack.enter_context(zipfile.ZipFile(path))
+            names = [info.filename for info in archive.infolist() if not info.is_dir()]
+            csv_names = [name for name in names if name.lower().endswith('.csv')] or names
+            members = [stack.enter_context(archive.open(name)) for name in sorted(csv_names)]
+        elif compression is None:
+            members = [stack.enter_context(open(path, 'rb'))]
+        else:
+            members = _exports(stack.enter_context(open(path, 'rb')), compression)
+        yield members
+
+
+def _iter_chunks(path, chunksize, kwargs):
+    with open_export_members(path) as members:
+        for member in members:
+            yield from pd.read_csv(member, chunksize=chunksize, **kwargs)
+
+
+def read_survey_csv(path, chunksize=None, **kwargs):
+    """
+    pd.read_csv for plain or compressed exports. With chunksize, returns an iterator
+    of DataFrame chunks across all archive members; otherwise one DataFrame.
+    """
+    if detect_compression(path) is None:
+        return pd.read_csv(path, chunksize=chunksize, **kwargs)
+    if chunksize is not None:
+        return _iter_chunks(path, chunksize, kwargs)
+    with open_export_members(path) as members:
+        frames = [pd.read_csv(member, **kwargs) for member in members]
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
@@ -0,0 +1,104 @@
+"""
+Survey Schema for the Legal AI Survey Export
+Column names and question groupings shared by the pipeline and its helper modules
+"""
+
+# Submission time, as written by Google Forms ('2025/09/01 7:00:00 AM GMT+3')
+TIMESTAMP_COL = 'Timestamp'
+
+# Demographics
+ROLE_COL = '1. What is your current role?'
+EXPERIENCE_COL = '2. Years of experience in the legal field (if applicable): '
+LOCATION_COL = '3. Your location (County):  '
+FIRM_COL = '3.  Firm / Institution type:'
+
+# Free-text responses
+ISSUES_COL = '14. Any issues you faced (e.g., inaccuracies, hallucinations, speed issues) while using Counsel AI or other AI tools like ChatGPT etc?  '
+IMPROVEMENTS_COL = '19. What are the three most important improvements you want from legal technology?  '
+CONCERNS_COL = '20. Do you have any concerns about using AI tools in legal practice?'
+
+TEXT_RESPONSE_COLUMNS = {
+    ISSUES_COL: 'issues_faced',
+    IMPROVEMENTS_COL: 'desired_improvements',
+    CONCERNS_COL: 'concerns'
+}
+
+# Likert (1-5) items
+Q5_TIME_COL = '5. I spend excessive time on legal research and drafting.  '
+Q6_ACCESS_COL = '6. Access to up-to-date case law, statutes, document templates and other relevant research material is a major challenge in my work.  '
+Q12_TIME_SAVED_COL = '12. AI tools have saved me significant time on routine tasks (e.g., research, drafting, summarization).  '
+Q13_COUNSEL_AI_COL = '13. If you tried Counsel AI (LegalizeMe), how would you rate your experience? [LegalizeMe - Your Legal Assistant]'
+Q15_TRUST_COL = '15. I trust AI outputs without manual verification.  '
+Q16_CITATION_COL = '16. Accurate citation and provenance (knowing where the information came from) are essential for any legal AI tool.  '
+
+# Single-choice questions
+Q7_ANALYTICS_COL = '7. My organization uses analytics (time tracking, case management, reporting) to measure productivity.  '
+Q8_USES_AI_COL = '8. Do you currently use any AI tools (e.g., ChatGPT, Copilot, Claude, Gemini, Counsel AI, or others) to support legal tasks or decision-making? '
+Q10_FREQUENCY_COL = '10. How often do you use AI tools to support legal tasks or decision-making?'
+Q17_WTP_COL = '17. If a legal AI tool saved you at least 5–10 hours per week, would you be willing to pay for it?'
+
+# Ordinal codes of the willingness-to-pay answers (unanswered counts as 'Maybe')
+WTP_CODES = {'Yes': 2, 'Maybe, depending on price': 1, 'No': 0}
+
+# Multi-select (comma separated) questions
+Q9_TOOLS_COL = '9. If yes, please specify the tool(s) you use:'
+Q11_TASKS_COL = '11. What types of legal tasks do you use AI tools for?'
+Q18_FEATURES_COL = '18. Key features I would prioritize in a legal AI tool (choose up to 3):  '
+
+DEMOGRAPHIC_COLUMNS = {
+    ROLE_COL: 'role',
+    LOCATION_COL: 'location',
+    FIRM_COL: 'firm_type'
+}
+
+LIKERT_COLUMNS = {
+    Q5_TIME_COL: 'excessive_time_research',
+    Q6_ACCESS_COL: 'resource_access_challenge',
+    Q12_TIME_SAVED_COL: 'time_savings',
+    Q13_COUNSEL_AI_COL: 'counsel_ai_rating',
+    Q15_TRUST_COL: 'blind_trust',
+    Q16_CITATION_COL: 'citation_importance'
+}
+
+CATEGORICAL_COLUMNS = {
+    Q7_ANALYTICS_COL: 'analytics_adoption',
+    Q8_USES_AI_COL: 'current_usage',
+    Q10_FREQUENCY_COL: 'usage_frequency',
+    Q17_WTP_COL: 'willingness_to_pay'
+}
+
+MULTI_SELECT_COLUMNS = {
+    Q9_TOOLS_COL: 'specific_tools',
+    Q11_TASKS_COL: 'task_types',
+    Q18_FEATURES_COL: 'top_features'
+}
+
+# Canonical answer options / tool names per multi-select question. Labels that contain
+# commas are kept whole when answers are split (see label_normalizer)
+KNOWN_OPTIONS = {
+    Q9_TOOLS_COL: ['ChatGPT', 'Copilot', 'Claude', 'Gemini', 'Counsel AI', 'Grok', 'Perplexity', 'DeepSeek',
+                   'Meta AI'],
+    Q11_TASKS_COL: ['Legal research and case law retrieval', 'Document review or summarization',
+                    'Drafting contracts, memos, or pleadings', 'Other (please specify)'],
+    Q18_FEATURES_COL: ['Accurate citations', 'Local law coverage (Kenya-specific)',
+                       'Drafting templates (contracts, pleadings)', 'Document comparison / review',
+                       'MS Word integration', 'Offline / low-bandwidth mode']
+}
+
+# Keyword stems that put a free-text issue into each category
+ISSUE_CATEGORIES = {
+    'Accuracy/Hallucinations': ['inaccurac', 'hallucination', 'wrong', 'incorrect', 'error', 'mistake', 'false', 'unreliable'],
+    'Citation/References': ['citation', 'reference', 'source', 'provenance', 'cite', 'attribute'],
+    'Speed/Performance': ['speed', 'slow', 'performance', 'latency', 'fast'],
+    'Relevance': ['relevan', 'context', 'specific', 'jurisdiction', 'kenya', 'local'],
+    'Comprehensiveness': ['comprehensive', 'depth', 'detail', 'complete', 'thorough'],
+    'Trust/Reliability': ['trust', 'reliable', 'confidence', 'verify', 'fact check']
+}
+
+
+
+def split_multi_select(value):
+    """Split a comma-separated multi-select answer into its options"""
+    if value is None or value != value:  # NaN
+        return []
+    return [item.strip() for item in str(value).split(',') if item.strip()]
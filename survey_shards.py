@@ -0,0 +1,280 @@
+"""
+Shard-Parallel Map-Reduce Aggregation
+Each row shard of an export (or each shard file on a shared filesystem) is reduced on
+its own worker process to a mergeable SurveyAccumulator: answer counts, Likert value
+histograms, multi-select tallies, sentiment sums and issue-category counts. Merging the
+partial states in shard order reproduces the single-process counts and means exactly
+(sentiment averages up to floating-point rounding).
+"""
+
+import operator
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from legal_survey_nlp_pipeline import clean_text, ensure_nltk_data, likert_level, citation_priority
+from issue_classifier import keyword_categories
+from survey_io import read_survey_csv
+from survey_schema import (
+    TEXT_RESPONSE_COLUMNS, LIKERT_COLUMNS, CATEGORICAL_COLUMNS, MULTI_SELECT_COLUMNS, ISSUE_CATEGORIES,
+    ROLE_COL, EXPERIENCE_COL, LOCATION_COL, FIRM_COL, ISSUES_COL,
+    Q5_TIME_COL, Q6_ACCESS_COL, Q7_ANALYTICS_COL, Q8_USES_AI_COL, Q10_FREQUENCY_COL,
+    Q12_TIME_SAVED_COL, Q13_COUNSEL_AI_COL, Q15_TRUST_COL, Q16_CITATION_COL, Q17_WTP_COL
+)
+
+# Columns tallied answer-by-answer
+COUNTED_COLUMNS = [ROLE_COL, EXPERIENCE_COL, LOCATION_COL, FIRM_COL] + list(CATEGORICAL_COLUMNS)
+
+_COMPARISONS = {'>=': operator.ge, '<=': operator.le, '>': operator.gt, '<': operator.lt,
+                '==': operator.eq, '!=': operator.ne}
+
+# Per text column: responses, scored responses, then sums of compound / pos / neg / neu
+_SENTIMENT_FIELDS = ('compound', 'pos', 'neg', 'neu')
+
+_SIA = None
+
+
+def _sentiment_analyzer():
+    """VADER analyzer, created once per worker process"""
+    global _SIA
+    if _SIA is None:
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        ensure_nltk_data('sentiment/vader_lexicon.zip', 'vader_lexicon')
+        _SIA = SentimentIntensityAnalyzer()
+    return _SIA
+
+
+def _new_tally(top_k):
+    if top_k is None:
+        return Counter()
+    from heavy_hitters import SpaceSaving
+    return SpaceSaving(top_k)
+
+
+def _merge_tally(a, b):
+    if isinstance(a, Counter):
+        a.update(b)
+        return a
+    return a.merge(b)
+
+
+class SurveyAccumulator:
+    """Mergeable partial state of every aggregation stage for a set of rows"""
+
+    def __init__(self, top_k=None):
+        self.top_k = top_k
+        self.n_rows = 0
+        self.counts = {col: Counter() for col in COUNTED_COLUMNS}
+        self.likert = {col: Counter() for col in LIKERT_COLUMNS}
+        self.tallies = {col: _new_tally(top_k) for col in MULTI_SELECT_COLUMNS}
+        self.sentiment = {label: np.zeros(2 + len(_SENTIMENT_FIELDS)) for label in TEXT_RESPONSE_COLUMNS.values()}
+        self.n_issue_responses = 0
+        self.issue_counts = Counter({category: 0 for category in ISSUE_CATEGORIES})
+        self.issue_examples = {category: [] for category in ISSUE_CATEGORIES}
+        self.columns = set()
+
+    @classmethod
+    def from_frame(cls, df, top_k=None, sentiment=True):
+        """Map step: accumulate one shard's rows"""
+        acc = cls(top_k)
+        acc.n_rows = len(df)
+        acc.columns = set(df.columns)
+
+        for col in COUNTED_COLUMNS:
+            if col in df.columns:
+                acc.counts[col].update(df[col].dropna().tolist())
+        for col in LIKERT_COLUMNS:
+            if col in df.columns:
+                acc.likert[col].update(df[col].dropna().astype(float).tolist())
+        for col in MULTI_SELECT_COLUMNS:
+            if col in df.columns:
+                for answer in df[col].dropna():
+                    acc.tallies[col].update(t.strip() for t in str(answer).split(','))
+
+        if sentiment:
+            for col, label in TEXT_RESPONSE_COLUMNS.items():
+                if col not in df.columns:
+                    continue
+                state = acc.sentiment[label]
+                for response in df[col].dropna():
+                    state[0] += 1
+                    text = clean_text(response)
+                    if text:
+                        scores = _sentiment_analyzer().polarity_scores(text)
+                        state[1] += 1
+                        state[2:] += [scores[field] for field in _SENTIMENT_FIELDS]
+
+        if ISSUES_COL in df.columns:
+            issues = df[ISSUES_COL].dropna()
+            acc.n_issue_responses = len(issues)
+            for response in issues:
+                for category in keyword_categories(clean_text(str(response))):
+                    acc.issue_counts[category] += 1
+                    if len(acc.issue_examples[category]) < 2:
+                        acc.issue_examples[category].append(str(response)[:100] + '...')
+        return acc
+
+    def merge(self, other):
+        """Reduce step: fold another shard's state (from later rows) into this one"""
+        self.n_rows += other.n_rows
+        self.columns |= other.columns
+        for col in self.counts:
+            self.counts[col].update(other.counts[col])
+        for col in self.likert:
+            self.likert[col].update(other.likert[col])
+        for col in self.tallies:
+            self.tallies[col] = _merge_tally(self.tallies[col], other.tallies[col])
+        for label in self.sentiment:
+            self.sentiment[label] += other.sentiment[label]
+        self.n_issue_responses += other.n_issue_responses
+        self.issue_counts.update(other.issue_counts)
+        for category, examples in other.issue_examples.items():
+            self.issue_examples[category] = (self.issue_examples[category] + examples)[:2]
+        return self
+
+    # Exact statistics from the merged state ---------------------------
+
+    def value_counts(self, col):
+        """Answer counts, most common first (ties in order of first appearance)"""
+        return dict(self.counts[col].most_common())
+
+    def likert_mean(self, col):
+        hist = self.likert[col]
+        n = sum(hist.values())
+        return sum(value * count for value, count in hist.items()) / n if n else float('nan')
+
+    def likert_interval(self, col, confidence=0.95):
+        """Student-t interval for a Likert mean from its value histogram"""
+        from scipy import stats
+
+        hist = self.likert[col]
+        n = sum(hist.values())
+        if n < 2:
+            return float('nan'), float('nan')
+        mean = self.likert_mean(col)
+        variance = sum(count * (value - mean) ** 2 for value, count in hist.items()) / (n - 1)
+        margin = stats.t.ppf(0.5 + confidence / 2, n - 1) * np.sqrt(variance / n)
+        return mean - margin, mean + margin
+
+    def count_where(self, col, op, value):
+        compare = _COMPARISONS[op]
+        return sum(count for answer, count in self.likert[col].items() if compare(answer, value))
+
+    def _likert_entry(self, col, label_key, level, confidence):
+        mean = self.likert_mean(col)
+        low, high = self.likert_interval(col, confidence)
+        low_label, high_label = level(low), level(high)
+        return {
+            'mean_score': mean,
+            label_key: level(mean),
+            'ci_low': low,
+            'ci_high': high,
+            f'{label_key}_range': low_label if low_label == high_label else f"{low_label} to {high_label}"
+        }
+
+    def finalize(self, confidence=0.95):
+        """Insights in the same layout the single-process stages produce"""
+        has = self.columns.__contains__
+        insights = {}
+
+        demographics = {}
+        for col, key in ((ROLE_COL, 'role_distribution'), (EXPERIENCE_COL, 'experience_levels'),
+                         (LOCATION_COL, 'location_distribution'), (FIRM_COL, 'institution_types')):
+            if has(col):
+                demographics[key] = self.value_counts(col)
+        insights['demographics'] = demographics
+
+        pain_points = {}
+        if has(Q5_TIME_COL):
+            pain_points['excessive_time_research'] = self._likert_entry(Q5_TIME_COL, 'severity', likert_level, confidence)
+        if has(Q6_ACCESS_COL):
+            pain_points['resource_access_challenge'] = self._likert_entry(Q6_ACCESS_COL, 'severity', likert_level, confidence)
+        if has(Q7_ANALYTICS_COL):
+            pain_points['analytics_adoption'] = self.value_counts(Q7_ANALYTICS_COL)
+        insights['pain_points'] = pain_points
+
+        ai_adoption = {}
+        if has(Q8_USES_AI_COL):
+            ai_adoption['current_usage'] = self.value_counts(Q8_USES_AI_COL)
+        for col, key in MULTI_SELECT_COLUMNS.items():
+            if has(col) and key != 'top_features':
+                ai_adoption[key] = dict(self.tallies[col])
+        if has(Q10_FREQUENCY_COL):
+            ai_adoption['usage_frequency'] = self.value_counts(Q10_FREQUENCY_COL)
+        if has(Q12_TIME_SAVED_COL):
+            ai_adoption['time_savings'] = self._likert_entry(Q12_TIME_SAVED_COL, 'impact', likert_level, confidence)
+        ratings = self.likert[Q13_COUNSEL_AI_COL]
+        if has(Q13_COUNSEL_AI_COL) and ratings:
+            ai_adoption['counsel_ai_rating'] = {
+                'mean_rating': self.likert_mean(Q13_COUNSEL_AI_COL),
+                'count': sum(ratings.values()),
+                'distribution': dict(ratings.most_common())
+            }
+        insights['ai_adoption'] = ai_adoption
+
+        trust = {}
+        if has(Q15_TRUST_COL):
+            trust['blind_trust'] = self._likert_entry(Q15_TRUST_COL, 'level', likert_level, confidence)
+        if has(Q16_CITATION_COL):
+            trust['citation_importance'] = self._likert_entry(Q16_CITATION_COL, 'priority', citation_priority, confidence)
+        insights['trust_concerns'] = trust
+
+        insights['payment'] = {'willingness_to_pay': self.value_counts(Q17_WTP_COL)} if has(Q17_WTP_COL) else {}
+        features = [col for col, key in MULTI_SELECT_COLUMNS.items() if key == 'top_features' and has(col)]
+        insights['features'] = {'top_features': dict(self.tallies[features[0]])} if features else {}
+
+        sentiment = {}
+        for label, state in self.sentiment.items():
+            if state[1]:
+                compound, pos, neg, neu = state[2:] / state[1]
+                sentiment[label] = {
+                    'avg_compound': compound,
+                    'avg_positive': pos,
+                    'avg_negative': neg,
+                    'avg_neutral': neu,
+                    'overall_sentiment': 'Positive' if compound > 0.05 else 'Negative' if compound < -0.05 else 'Neutral'
+                }
+        insights['sentiment'] = sentiment
+
+        if has(ISSUES_COL):
+            insights['key_issues'] = {'counts': dict(self.issue_counts), 'examples': self.issue_examples}
+        return insights
+
+
+def _accumulate_frame(df, top_k, sentiment):
+    return SurveyAccumulator.from_frame(df, top_k=top_k, sentiment=sentiment)
+
+
+def _accumulate_file(path, top_k, sentiment):
+    return SurveyAccumulator.from_frame(read_survey_csv(path), top_k=top_k, sentiment=sentiment)
+
+
+def aggregate_shards(source, shard_rows=50000, max_workers=None, top_k=None, sentiment=True):
+    """
+    Map every shard to a SurveyAccumulator on a process pool and merge them in order.
+    `source` is a single export (streamed and split into shard_rows-row shards by this
+    process) or a directory / glob of shard files that each worker reads itself.
+    """
+    from survey_waves import discover_exports
+
+    max_workers = max_workers or os.cpu_count() or 1
+    total = SurveyAccumulator(top_k)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        if os.path.isfile(source):
+            # Keep at most two shards per worker in flight so memory stays bounded
+            pending = []
+            for chunk in read_survey_csv(source, chunksize=shard_rows):
+                pending.append(pool.submit(_accumulate_frame, chunk, top_k, sentiment))
+                if len(pending) >= 2 * max_workers:
+                    total.merge(pending.pop(0).result())
+            for future in pending:
+                total.merge(future.result())
+        else:
+            paths = discover_exports(source)
+            if not paths:
+                raise FileNotFoundError(f"No shard files found for: {source}")
+            for partial in pool.map(_accumulate_file, paths, [top_k] * len(paths), [sentiment] * len(paths)):
+                total.merge(partial)
+    return total
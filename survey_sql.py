@@ -0,0 +1,148 @@
+"""
+SQLite Backend for Survey Exports
+Loads an export into an embedded SQLite file in chunks (indexed on the demographic
+columns) so the counting and averaging stages run as SQL aggregations and only the
+columns a stage needs in Python are ever materialized as a DataFrame.
+"""
+
+import os
+import sqlite3
+
+import pandas as pd
+
+from survey_io import read_survey_csv
+from survey_schema import DEMOGRAPHIC_COLUMNS
+
+ROW_COL = '_row'              # 0-based row position in the export (the DataFrame index)
+EXCLUDED_COL = '_excluded'    # set for near-duplicate submissions dropped from the analysis
+
+_OPERATORS = {'>=', '<=', '>', '<', '=', '==', '!='}
+
+
+def quote_identifier(name):
+    """Quote a column or table name for SQL (survey headers contain spaces and punctuation)"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SurveyDatabase:
+    """One export loaded into a SQLite table, with the aggregations the pipeline pushes down"""
+
+    TABLE = 'responses'
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS _source (path TEXT, mtime_ns INTEGER, size INTEGER)")
+        self._columns = None
+
+    def close(self):
+        self.conn.close()
+
+    def _source_state(self, csv_path):
+        stat = os.stat(csv_path)
+        return os.path.abspath(csv_path), stat.st_mtime_ns, stat.st_size
+
+    def is_current(self, csv_path):
+        """True if the table already holds this exact export"""
+        stored = self.conn.execute("SELECT path, mtime_ns, size FROM _source").fetchone()
+        return stored == self._source_state(csv_path)
+
+    def load_csv(self, csv_path, chunksize=10000):
+        """
+        (Re)load the export chunk by chunk unless the table already holds it.
+        Returns True if the table was rebuilt.
+        """
+        if self.is_current(csv_path):
+            return False
+        table = quote_identifier(self.TABLE)
+        self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        offset = 0
+        for chunk in read_survey_csv(csv_path, chunksize=chunksize):
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk), name=ROW_COL)
+            chunk.to_sql(self.TABLE, self.conn, if_exists='append', index=True)
+            offset += len(chunk)
+        self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {quote_identifier(EXCLUDED_COL)} INTEGER DEFAULT 0")
+        self.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_row ON {table} ({quote_identifier(ROW_COL)})")
+        self._columns = None
+        for col, label in DEMOGRAPHIC_COLUMNS.items():
+            if col in self.columns():
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{label} ON {table} ({quote_identifier(col)})")
+        self.conn.execute("DELETE FROM _source")
+        self.conn.execute("INSERT INTO _source VALUES (?, ?, ?)", self._source_state(csv_path))
+        self.conn.commit()
+        return True
+
+    def columns(self):
+        """Survey columns in the table, in export order"""
+        if self._columns is None:
+            info = self.conn.execute(f"PRAGMA table_info({quote_identifier(self.TABLE)})").fetchall()
+            self._columns = [row[1] for row in info if row[1] not in (ROW_COL, EXCLUDED_COL)]
+        return self._columns
+
+    def _where(self, condition=None):
+        clauses = [f"NOT {quote_identifier(EXCLUDED_COL)}"]
+        if condition:
+            clauses.append(condition)
+        return " WHERE " + " AND ".join(clauses)
+
+    def row_count(self):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {quote_identifier(self.TABLE)}{self._where()}").fetchone()[0]
+
+    def fetch(self, columns=(), rows=None):
+        """
+        DataFrame (indexed by export row) holding only the given columns of the included
+        rows, or of just the given row numbers (looked up through the row index)
+        """
+        columns = [col for col in self.columns() if col in set(columns)]
+        select = ", ".join([quote_identifier(ROW_COL)] + [quote_identifier(col) for col in columns])
+        condition, params = None, ()
+        if rows is not None:
+            params = [int(row) for row in rows]
+            condition = f"{quote_identifier(ROW_COL)} IN ({', '.join('?' * len(params))})"
+        query = (f"SELECT {select} FROM {quote_identifier(self.TABLE)}{self._where(condition)} "
+                 f"ORDER BY {quote_identifier(ROW_COL)}")
+        df = pd.read_sql_query(query, self.conn, index_col=ROW_COL, params=params)
+        df.index.name = None
+        return df
+
+    def values(self, col):
+        """Non-missing values of one column, indexed by export row"""
+        quoted = quote_identifier(col)
+        query = (f"SELECT {quote_identifier(ROW_COL)}, {quoted} FROM {quote_identifier(self.TABLE)}"
+                 f"{self._where(f'{quoted} IS NOT NULL')} ORDER BY {quote_identifier(ROW_COL)}")
+        series = pd.read_sql_query(query, self.conn, index_col=ROW_COL)[col]
+        series.index.name = None
+        return series
+
+    def value_counts(self, col):
+        """Counts per answer, most common first (ties in order of first appearance, like pandas)"""
+        quoted = quote_identifier(col)
+        rows = self.conn.execute(
+            f"SELECT {quoted}, COUNT(*) AS n FROM {quote_identifier(self.TABLE)}{self._where(f'{quoted} IS NOT NULL')} "
+            f"GROUP BY {quoted} ORDER BY n DESC, MIN({quote_identifier(ROW_COL)})"
+        ).fetchall()
+        return pd.Series([n for _, n in rows], index=[value for value, _ in rows], name='count', dtype='int64')
+
+    def mean(self, col):
+        value = self.conn.execute(
+            f"SELECT AVG({quote_identifier(col)}) FROM {quote_identifier(self.TABLE)}{self._where()}"
+        ).fetchone()[0]
+        return float('nan') if value is None else value
+
+    def count_where(self, col, op, value):
+        """Rows whose column compares true against value, e.g. count_where(q5, '>=', 4)"""
+        if op not in _OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        op = '=' if op == '==' else op
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM {quote_identifier(self.TABLE)}{self._where(f'{quote_identifier(col)} {op} ?')}",
+            (value,)
+        ).fetchone()[0]
+
+    def set_excluded(self, rows):
+        """Exclude the given export rows (e.g. near-duplicates) from every later query"""
+        table, excluded = quote_identifier(self.TABLE), quote_identifier(EXCLUDED_COL)
+        self.conn.execute(f"UPDATE {table} SET {excluded} = 0")
+        self.conn.executemany(f"UPDATE {table} SET {excluded} = 1 WHERE {quote_identifier(ROW_COL)} = ?",
+                              [(int(row),) for row in rows])
+        self.conn.commit()
@@ -0,0 +1,180 @@
+"""
+Multi-Wave Survey Processing
+Runs every survey export (wave, country, ...) through the NLP pipeline on its own
+worker process and merges the per-wave insights into a comparative report.
+"""
+
+import contextlib
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from survey_io import EXPORT_PATTERNS, export_stem
+
+
+def discover_exports(source):
+    """Resolve a directory, glob pattern or single file into a sorted list of exports"""
+    source_path = Path(source)
+    if source_path.is_dir():
+        paths = []
+        for pattern in EXPORT_PATTERNS:
+            paths.extend(source_path.glob(pattern))
+        # 'w1.csv.zip' matches both '*.csv.zip' and '*.zip'
+        return sorted({str(p) for p in paths})
+    if source_path.is_file():
+        return [str(source_path)]
+    return sorted(glob.glob(str(source)))
+
+
+def wave_name(csv_path):
+    """Short label for a wave, taken from its file name"""
+    return export_stem(csv_path)
+
+
+def _run_wave(csv_path, output_dir, stages=None, pipeline_kwargs=None):
+    """Worker: run the full pipeline on one export, logging its console output to a file"""
+    from legal_survey_nlp_pipeline import LegalSurveyNLPPipeline
+
+    name = wave_name(csv_path)
+    report_path = os.path.join(output_dir, f'{name}_insights_report.txt')
+    log_path = os.path.join(output_dir, f'{name}_pipeline.log')
+
+    with open(log_path, 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        pipeline = LegalSurveyNLPPipeline(csv_path, **(pipeline_kwargs or {}))
+        insights = pipeline.run_full_pipeline(output_path=report_path, stages=stages)
+
+    return {
+        'wave': name,
+        'csv_path': csv_path,
+        'n_responses': pipeline.n_responses,
+        'report_path': report_path,
+        'insights': insights
+    }
+
+
+def flatten_metrics(insights, prefix=''):
+    """Flatten the numeric leaves of a nested insights dict into {'a.b.c': value}"""
+    metrics = {}
+    for key, value in insights.items():
+        path = f'{prefix}.{key}' if prefix else str(key)
+        if isinstance(value, dict):
+            metrics.update(flatten_metrics(value, path))
+        elif isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+            metrics[path] = float(value)
+    return metrics
+
+
+def compare_waves(wave_results):
+    """
+    Build a comparative table of every numeric metric across waves.
+    Returns a DataFrame (metric x wave) and a DataFrame of deltas between consecutive waves.
+    """
+    columns = {}
+    for result in wave_results:
+        metrics = flatten_metrics(result['insights'])
+        metrics['n_responses'] = float(result['n_responses'])
+        columns[result['wave']] = metrics
+
+    table = pd.DataFrame(columns)
+    table = table.sort_index()
+    deltas = table.diff(axis=1).iloc[:, 1:]
+    deltas.columns = [f'{prev} -> {curr}' for prev, curr in zip(table.columns[:-1], table.columns[1:])]
+    return table, deltas
+
+
+def save_comparative_report(wave_results, table, deltas, output_path):
+    """Write the cross-wave comparison as a text report"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write("=" * 80 + "\n")
+        f.write("COMPARATIVE MULTI-WAVE ANALYSIS REPORT\n")
+        f.write("Legal AI Survey - Domain-Adapted LLMs for African Legal Practice\n")
+        f.write("=" * 80 + "\n\n")
+
+        f.write(f"Analysis Date: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Waves: {len(wave_results)}\n")
+        for result in wave_results:
+            f.write(f"  - {result['wave']}: {result['n_responses']} responses ({result['csv_path']})\n")
+
+        f.write("\n" + "=" * 80 + "\n")
+        f.write("METRICS BY WAVE\n")
+        f.write("=" * 80 + "\n")
+        f.write(table.to_string(float_format=lambda v: f'{v:.3f}'))
+
+        if not deltas.empty:
+            f.write("\n\n" + "=" * 80 + "\n")
+            f.write("DELTAS BETWEEN WAVES\n")
+            f.write("=" * 80 + "\n")
+            f.write(deltas.dropna(how='all').to_string(float_format=lambda v: f'{v:+.3f}'))
+
+        f.write("\n\n" + "=" * 80 + "\n")
+        f.write("PER-WAVE INSIGHTS (JSON)\n")
+        f.write("=" * 80 + "\n")
+        f.write(json.dumps({r['wave']: r['insights'] for r in wave_results}, indent=2, default=str))
+
+    return output_path
+
+
+def run_waves(source, output_dir='wave_reports', max_workers=None, stages=None, **pipeline_kwargs):
+    """
+    Analyze every export matched by `source` in parallel and compare the waves.
+    pipeline_kwargs (e.g. exclude_duplicates, artifact_dir, backend) configure every wave's pipeline.
+    """
+    print("=" * 80)
+    print("MULTI-WAVE SURVEY ANALYSIS")
+    print("=" * 80)
+
+    exports = discover_exports(source)
+    if not exports:
+        print(f"\n No survey exports found for: {source}")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(exports))
+
+    print(f"\n Waves found: {len(exports)}")
+    print(f" Worker processes: {max_workers}")
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_wave, path, output_dir, stages, pipeline_kwargs) for path in exports]
+        wave_results = []
+        for path, future in zip(exports, futures):
+            try:
+                result = future.result()
+            except Exception as exc:
+                print(f"  - {wave_name(path)}: FAILED ({exc})")
+                continue
+            print(f"  - {result['wave']}: {result['n_responses']} responses -> {result['report_path']}")
+            wave_results.append(result)
+
+    if not wave_results:
+        return None
+
+    table, deltas = compare_waves(wave_results)
+    report_path = save_comparative_report(
+        wave_results, table, deltas, os.path.join(output_dir, 'comparative_wave_report.txt'))
+
+    print(f"\n Comparative report saved to: {report_path}")
+    return {
+        'waves': [r['wave'] for r in wave_results],
+        'metrics': table,
+        'deltas': deltas
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Analyze and compare multiple survey waves")
+    parser.add_argument('source', help="Directory or glob of survey exports")
+    parser.add_argument('--output-dir', default='wave_reports')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--exclude-duplicates', action='store_true')
+    args = parser.parse_args()
+
+    run_waves(args.source, output_dir=args.output_dir, max_workers=args.workers,
+              exclude_duplicates=args.exclude_duplicates)
@@ -0,0 +1,66 @@
+"""Shared fixtures: a small synthetic survey export with the real question columns"""
+
+import random
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# The pipeline modules are top-level scripts in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from survey_schema import (  # noqa: E402
+    CONCERNS_COL, EXPERIENCE_COL, FIRM_COL, IMPROVEMENTS_COL, ISSUES_COL, LOCATION_COL, Q5_TIME_COL,
+    Q6_ACCESS_COL, Q7_ANALYTICS_COL, Q8_USES_AI_COL, Q9_TOOLS_COL, Q10_FREQUENCY_COL, Q11_TASKS_COL,
+    Q12_TIME_SAVED_COL, Q13_COUNSEL_AI_COL, Q15_TRUST_COL, Q16_CITATION_COL, Q17_WTP_COL, Q18_FEATURES_COL,
+    ROLE_COL, TIMESTAMP_COL
+)
+
+ISSUES = ['The answers had wrong citations and hallucinations.', 'It was fast, but citations are wrong.',
+          'Responses were not specific to Kenya law context.', 'Slow performance and incomplete detail.',
+          'I could not trust it without verifying sources.', 'No issues so far, very helpful.']
+IMPROVEMENTS = ['Better case law search, faster drafting, and local statutes.', 'Accurate citations and summaries.',
+                'Affordable access to updated judgments.']
+CONCERNS = ['Data privacy and confidentiality of client information.', 'Hallucinated cases could mislead courts.',
+            'None, I think it is useful.']
+FEATURES = ['Accurate citations', 'Local law coverage (Kenya-specific)', 'Speed', 'Document drafting',
+            'Case summarization']
+
+
+def make_export(n_rows=60, seed=0):
+    """Survey export DataFrame shaped like the Google Forms CSV"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_rows):
+        rows.append({
+            TIMESTAMP_COL: (pd.Timestamp('2025-09-01') + pd.Timedelta(hours=7 * i)).strftime('%Y/%m/%d %I:%M:%S %p GMT+3'),
+            ROLE_COL: rng.choice(['Lawyer', 'Law Student', 'Researcher', 'Citizen']),
+            EXPERIENCE_COL: f'{rng.randint(0, 20)} years',
+            LOCATION_COL: rng.choice(['Nairobi', 'Mombasa', 'Kisumu']),
+            FIRM_COL: rng.choice(['Private firm', 'Government', 'University']),
+            Q5_TIME_COL: rng.randint(1, 5),
+            Q6_ACCESS_COL: rng.randint(1, 5),
+            Q7_ANALYTICS_COL: rng.choice(['Yes', 'No']),
+            Q8_USES_AI_COL: rng.choice(['Yes', 'No']),
+            Q9_TOOLS_COL: ', '.join(rng.sample(['ChatGPT', 'Gemini', 'Claude', 'Counsel AI', 'Copilot'], 2)),
+            Q10_FREQUENCY_COL: rng.choice(['Daily', 'Weekly', 'Rarely']),
+            Q11_TASKS_COL: ', '.join(rng.sample(['Research', 'Drafting', 'Summarization'], 2)),
+            Q12_TIME_SAVED_COL: rng.randint(1, 5),
+            Q13_COUNSEL_AI_COL: rng.choice([None, 3, 4, 5]),
+            ISSUES_COL: rng.choice(ISSUES),
+            Q15_TRUST_COL: rng.randint(1, 5),
+            Q16_CITATION_COL: rng.randint(3, 5),
+            Q17_WTP_COL: rng.choice(['Yes', 'Maybe, depending on price', 'No']),
+            Q18_FEATURES_COL: ', '.join(rng.sample(FEATURES, 3)),
+            IMPROVEMENTS_COL: rng.choice(IMPROVEMENTS),
+            CONCERNS_COL: rng.choice(CONCERNS),
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def survey_csv(tmp_path):
+    path = tmp_path / 'export.csv'
+    make_export().to_csv(path, index=False)
+    return path
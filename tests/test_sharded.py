@@ -0,0 +1,14 @@
+"""Smoke run of the shard-parallel (map-reduce) mode, which has no DataFrame loaded"""
+
+from legal_survey_nlp_pipeline import LegalSurveyNLPPipeline
+
+
+def test_run_sharded_completes_without_a_dataframe(survey_csv, tmp_path):
+    report = tmp_path / 'report.txt'
+    pipeline = LegalSurveyNLPPipeline(str(survey_csv))
+    insights = pipeline.run_sharded(output_path=str(report), shard_rows=25, max_workers=1)
+
+    assert pipeline.df is None
+    assert insights['research_metrics']['n_responses'] == 60
+    assert insights['research_arguments']
+    assert report.exists()
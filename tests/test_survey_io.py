@@ -0,0 +1,42 @@
+"""Reading compressed exports, including files of concatenated compressed members"""
+
+import gzip
+
+import pandas as pd
+import pytest
+from conftest import make_export
+
+from survey_io import read_survey_csv
+from survey_schema import Q5_TIME_COL
+
+
+@pytest.fixture
+def waves():
+    return make_export(30, seed=1), make_export(20, seed=2)
+
+
+def test_two_member_gzip_of_full_exports_reads_as_one_export(tmp_path, waves):
+    first, second = waves
+    path = tmp_path / 'export.csv.gz'
+    # Same as `gzip -c a.csv > export.csv.gz; gzip -c b.csv >> export.csv.gz`
+    path.write_bytes(gzip.compress(first.to_csv(index=False).encode()) +
+                     gzip.compress(second.to_csv(index=False).encode()))
+
+    df = read_survey_csv(path)
+
+    assert len(df) == 50
+    assert pd.api.types.is_integer_dtype(df[Q5_TIME_COL])
+    assert df[Q5_TIME_COL].tolist() == first[Q5_TIME_COL].tolist() + second[Q5_TIME_COL].tolist()
+    chunked = pd.concat(read_survey_csv(path, chunksize=7), ignore_index=True)
+    assert chunked.equals(df)
+
+
+def test_csv_split_across_gzip_members_continues_one_export(tmp_path, waves):
+    text = pd.concat(waves, ignore_index=True).to_csv(index=False).encode()
+    path = tmp_path / 'export.csv.gz'
+    path.write_bytes(gzip.compress(text[:4000]) + gzip.compress(text[4000:]))
+
+    df = read_survey_csv(path)
+
+    assert len(df) == 50
+    assert pd.api.types.is_integer_dtype(df[Q5_TIME_COL])
@@ -0,0 +1,101 @@
+"""
+Topic-Count Model Selection
+Fits a grid of topic counts (and LDA priors) in parallel against one shared
+document-term matrix, scores every candidate with UMass topic coherence and
+held-out perplexity, and picks the best configuration.
+"""
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+_SHARED = {}
+
+
+def umass_coherence(doc_term, components, top_n=10, absolute=False):
+    """
+    Mean UMass coherence of each topic's top_n words:
+    sum over ranked word pairs of log((D(w_i, w_j) + 1) / D(w_j)), where D counts documents.
+    """
+    presence = sparse.csc_matrix(doc_term, dtype=np.float64)
+    presence.data[:] = 1.0
+    doc_freq = np.asarray(presence.sum(axis=0)).ravel()
+    weights = np.abs(components) if absolute else components
+    scores = []
+    for topic in weights:
+        # Words that never occur have no document frequency to condition on
+        ranked = [i for i in np.argsort(topic)[::-1] if doc_freq[i] > 0][:top_n]
+        if len(ranked) < 2:
+            scores.append(np.nan)
+            continue
+        co_doc = (presence[:, ranked].T @ presence[:, ranked]).toarray()
+        i, j = np.triu_indices(len(ranked), k=1)
+        scores.append(np.log((co_doc[i, j] + 1.0) / doc_freq[ranked][i]).mean())
+    return float(np.nanmean(scores)) if scores else np.nan
+
+
+def _init_worker(doc_term, holdout):
+    """Receive the shared matrices once per worker process instead of once per candidate"""
+    _SHARED['doc_term'] = doc_term
+    _SHARED['holdout'] = holdout
+
+
+def _score_candidate(config):
+    """Fit one candidate on the shared matrix and score it (runs on a worker process)"""
+    doc_term, holdout = _SHARED['doc_term'], _SHARED['holdout']
+    method, n_topics, doc_topic_prior, topic_word_prior, random_state, max_iter = config
+    result = {'method': method, 'n_topics': n_topics}
+    if method == 'lda':
+        from sklearn.decomposition import LatentDirichletAllocation
+        model = LatentDirichletAllocation(n_components=n_topics, doc_topic_prior=doc_topic_prior,
+                                          topic_word_prior=topic_word_prior, random_state=random_state,
+                                          max_iter=max_iter)
+        model.fit(doc_term)
+        result.update(doc_topic_prior=doc_topic_prior, topic_word_prior=topic_word_prior,
+                      coherence=umass_coherence(doc_term, model.components_),
+                      perplexity=float(model.perplexity(holdout if holdout is not None else doc_term)))
+    else:
+        from sklearn.decomposition import TruncatedSVD
+        model = TruncatedSVD(n_components=n_topics, random_state=random_state).fit(doc_term)
+        result.update(coherence=umass_coherence(doc_term, model.components_, absolute=True),
+                      explained_variance=float(model.explained_variance_ratio_.sum()))
+    return result
+
+
+def sweep_topics(doc_term, topic_counts, method='lda', doc_topic_priors=(None,), topic_word_priors=(None,),
+                 n_jobs=1, random_state=42, max_iter=20, holdout_fraction=0.2):
+    """
+    Score every (topic count, priors) candidate, in parallel when n_jobs > 1.
+    LDA perplexity is measured on a held-out fraction of documents when there are
+    enough of them. Returns one result dict per candidate, in grid order.
+    """
+    doc_term = sparse.csr_matrix(doc_term)
+    max_topics = min(doc_term.shape) - 1 if method == 'lsa' else doc_term.shape[0]
+    topic_counts = [k for k in topic_counts if 1 <= k <= max_topics]
+    if method != 'lda':
+        doc_topic_priors, topic_word_priors = (None,), (None,)
+    configs = [(method, k, alpha, eta, random_state, max_iter)
+               for k, alpha, eta in itertools.product(topic_counts, doc_topic_priors, topic_word_priors)]
+
+    fit_rows, holdout = doc_term, None
+    if method == 'lda' and doc_term.shape[0] >= 20:
+        rng = np.random.default_rng(random_state)
+        held = rng.random(doc_term.shape[0]) < holdout_fraction
+        if held.any() and (~held).any():
+            fit_rows, holdout = doc_term[~held], doc_term[held]
+
+    if n_jobs == 1 or len(configs) <= 1:
+        _init_worker(fit_rows, holdout)
+        return [_score_candidate(config) for config in configs]
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(fit_rows, holdout)) as pool:
+        return list(pool.map(_score_candidate, configs))
+
+
+def select_best(results):
+    """Highest coherence wins; ties are broken by lower perplexity, then fewer topics"""
+    scored = [r for r in results if not np.isnan(r['coherence'])]
+    if not scored:
+        return None
+    return max(scored, key=lambda r: (round(r['coherence'], 6), -r.get('perplexity', 0.0), -r['n_topics']))
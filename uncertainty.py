@@ -0,0 +1,114 @@
+"""
+Uncertainty Engine for Likert Metrics
+Bootstrap (batched NumPy resampling) and exact confidence intervals for every
+Likert item, overall and per demographic segment.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Upper bound on resample-count cells (n_boot x n_rows) materialized at once
+_MAX_BATCH_CELLS = 5_000_000
+
+
+def resample_counts(n, n_boot, rng):
+    """
+    Bootstrap resamples as an (n_boot x n) matrix of draw counts.
+    Row b counts how often each observation appears in resample b, built from a
+    batched (n_boot x n) index matrix in one bincount.
+    """
+    indices = rng.integers(0, n, size=(n_boot, n))
+    offsets = (np.arange(n_boot) * n)[:, None]
+    return np.bincount((indices + offsets).ravel(), minlength=n_boot * n).reshape(n_boot, n).astype(np.float64)
+
+
+def bootstrap_means(values, n_boot=2000, confidence=0.95, seed=42):
+    """
+    Percentile bootstrap intervals for the column means of an (n x m) array with NaNs.
+    All columns share the same resampled respondents, so every item is resampled in
+    one matrix product per batch rather than one Python loop per resample.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n, m = values.shape
+    answered = ~np.isnan(values)
+    filled = np.where(answered, values, 0.0)
+    rng = np.random.default_rng(seed)
+
+    if n == 0:
+        empty = np.full(m, np.nan)
+        return empty, empty.copy(), empty.copy()
+
+    batch = max(1, min(n_boot, _MAX_BATCH_CELLS // n))
+    boot_means = []
+    for start in range(0, n_boot, batch):
+        counts = resample_counts(n, min(batch, n_boot - start), rng)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            boot_means.append((counts @ filled) / (counts @ answered))
+    boot_means = np.vstack(boot_means)
+
+    alpha = 1 - confidence
+    with np.errstate(invalid='ignore'):
+        means = filled.sum(axis=0) / answered.sum(axis=0)
+    with warnings.catch_warnings():
+        # Items nobody answered give all-NaN columns
+        warnings.simplefilter('ignore', RuntimeWarning)
+        low = np.nanpercentile(boot_means, 100 * alpha / 2, axis=0)
+        high = np.nanpercentile(boot_means, 100 * (1 - alpha / 2), axis=0)
+    return means, low, high
+
+
+def t_intervals(values, confidence=0.95):
+    """Exact Student-t intervals for the column means of an (n x m) array with NaNs"""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n = (~np.isnan(values)).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = np.nanmean(values, axis=0) if values.size else np.full(values.shape[1], np.nan)
+        sem = np.nanstd(values, axis=0, ddof=1) / np.sqrt(n)
+        margin = stats.t.ppf(0.5 + confidence / 2, np.maximum(n - 1, 1)) * sem
+    margin = np.where(n >= 2, margin, np.nan)
+    return means - margin, means + margin
+
+
+def likert_intervals(df, columns, segment_columns=None, n_boot=2000, confidence=0.95, seed=42):
+    """
+    Confidence intervals for every Likert item, overall and for every segment.
+    `columns` maps column name -> short label, `segment_columns` maps demographic
+    column -> dimension name. Returns {label: {'overall': ci, dimension: {segment: ci}}}.
+    """
+    present = [col for col in columns if col in df.columns]
+    labels = [columns[col] for col in present]
+    values = df[present].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+    def summarize(block):
+        means, boot_low, boot_high = bootstrap_means(block, n_boot=n_boot, confidence=confidence, seed=seed)
+        t_low, t_high = t_intervals(block, confidence=confidence)
+        n = (~np.isnan(block)).sum(axis=0)
+        return {
+            label: {
+                'n': int(n[i]),
+                'mean': float(means[i]),
+                'ci_low': float(boot_low[i]),
+                'ci_high': float(boot_high[i]),
+                't_ci_low': float(t_low[i]),
+                't_ci_high': float(t_high[i])
+            }
+            for i, label in enumerate(labels)
+        }
+
+    results = {label: {'overall': ci} for label, ci in summarize(values).items()}
+    for col, dimension in (segment_columns or {}).items():
+        if col not in df.columns:
+            continue
+        codes, segments = pd.factorize(df[col].astype(object).where(df[col].notna(), '(missing)'))
+        for code, segment in enumerate(segments):
+            for label, ci in summarize(values[codes == code]).items():
+                results[label].setdefault(dimension, {})[str(segment)] = ci
+    return results
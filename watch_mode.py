@@ -0,0 +1,117 @@
+"""
+Watch Mode for Survey Exports
+Monitors an export file (or a drop directory of exports), waits for writes to settle,
+diffs the new data against the last-processed snapshot and re-runs only the stages,
+report and charts whose input columns changed.
+
+Usage:
+    python watch_mode.py path/to/export.csv
+    python watch_mode.py path/to/drop_directory/
+"""
+
+import os
+import time
+from pathlib import Path
+
+from legal_survey_nlp_pipeline import LegalSurveyNLPPipeline
+from generate_visualizations import generate_visualizations, affected_charts, CHARTS
+from survey_waves import discover_exports
+
+
+class SurveyWatcher:
+    """Poll an export (or drop directory) and refresh the pipeline when it settles"""
+
+    def __init__(self, source, report_path='legal_ai_insights_report.txt', charts_dir='visualizations',
+                 poll_interval=1.0, debounce=2.0, **pipeline_kwargs):
+        self.source = source
+        self.report_path = report_path
+        self.charts_dir = charts_dir
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.pipeline_kwargs = pipeline_kwargs
+        self.pipeline = None
+        self._processed = None        # (path, mtime_ns, size) of the last processed export
+
+    def current_export(self):
+        """The watched file, or the newest export in the drop directory"""
+        if not os.path.isdir(self.source):
+            return self.source if os.path.exists(self.source) else None
+        exports = discover_exports(self.source)
+        return max(exports, key=os.path.getmtime) if exports else None
+
+    def _state(self, path):
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def _settled_state(self, path):
+        """Wait until the export stops changing for `debounce` seconds, then return its state"""
+        state = self._state(path)
+        quiet_since = time.monotonic()
+        while time.monotonic() - quiet_since < self.debounce:
+            time.sleep(min(self.poll_interval, self.debounce))
+            latest = self._state(path)
+            if latest != state:
+                state, quiet_since = latest, time.monotonic()
+        return state
+
+    def process(self, path):
+        """Run (first time) or incrementally refresh the pipeline on one export"""
+        started = time.perf_counter()
+        if self.pipeline is None:
+            self.pipeline = LegalSurveyNLPPipeline(path, **self.pipeline_kwargs)
+            self.pipeline.run_full_pipeline(output_path=self.report_path)
+            generate_visualizations(self.pipeline.df, self.charts_dir)
+            stages, charts = ['all'], list(CHARTS)
+        else:
+            self.pipeline.csv_path = path
+            stages = self.pipeline.refresh(output_path=None)
+            charts = affected_charts(self.pipeline.last_changed_columns)
+            if stages:
+                self.pipeline.save_insights_report(self.report_path)
+            if charts:
+                generate_visualizations(self.pipeline.df, self.charts_dir, charts=charts)
+
+        print("\n" + "=" * 80)
+        print(f"WATCH: processed {Path(path).name} in {time.perf_counter() - started:.1f}s")
+        print(f"  - Stages re-run: {', '.join(stages) if stages else 'none (no changes)'}")
+        print(f"  - Charts rewritten: {', '.join(charts) if charts else 'none'}")
+        print("=" * 80)
+        return stages, charts
+
+    def watch(self, max_iterations=None):
+        """Poll forever (or for max_iterations polls), processing each settled change"""
+        print(f"Watching {self.source} (poll {self.poll_interval}s, debounce {self.debounce}s). Ctrl+C to stop.")
+        iterations = 0
+        while max_iterations is None or iterations < max_iterations:
+            iterations += 1
+            path = self.current_export()
+            if path is not None:
+                try:
+                    changed = self._processed is None or self._state(path) != self._processed
+                    if changed:
+                        state = self._settled_state(path)
+                        self.process(path)
+                        self._processed = state
+                except FileNotFoundError:
+                    pass  # export replaced mid-write; pick it up on the next poll
+            time.sleep(self.poll_interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-run affected pipeline stages when a survey export changes")
+    parser.add_argument('source', help="Export file or drop directory to watch")
+    parser.add_argument('--report', default='legal_ai_insights_report.txt')
+    parser.add_argument('--charts-dir', default='visualizations')
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--debounce', type=float, default=2.0,
+                        help="Seconds the export must stay unchanged before it is processed")
+    args = parser.parse_args()
+
+    watcher = SurveyWatcher(args.source, report_path=args.report, charts_dir=args.charts_dir,
+                            poll_interval=args.poll_interval, debounce=args.debounce)
+    try:
+        watcher.watch()
+    except KeyboardInterrupt:
+        pass